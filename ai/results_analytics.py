@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""Winner/loser margin analytics over exported results, vectorized with NumPy.
+
+A cycle's ``results.json`` is loaded once into columnar arrays (constituency
+index, votes, percent, seat count) and every constituency's metrics come out
+of one sort and a few segment reductions:
+
+- ``lowest_winner_*`` / ``highest_loser_*``: the vote threshold to win and
+  the best losing result (winners are the top ``seat_count`` by votes);
+- ``gap_votes`` / ``gap_percent``: lowest winner minus highest loser;
+- ``lead_votes`` / ``lead_percent``: first place minus second place;
+- ``percent_spread``: highest minus lowest vote share.
+
+Constituencies without a known seat count or without a loser have no
+threshold or gap. Top-k queries use ``np.argpartition``, so only the k
+selected rows are sorted.
+
+With ``--staging-db`` the thresholds and gaps are read from the
+``election_result_constituency_summary`` table that the staging build
+materializes (winners by ``order_in_unit <= seat_count``, as exported) instead
+of being recomputed from ``results.json``; leads and spreads are not stored
+there.
+
+    python3 ai/results_analytics.py --cycle na15-2021 --top 5
+    python3 ai/results_analytics.py --metric lead_votes --json margins.json
+    python3 ai/results_analytics.py --staging-db data/staging.db --metric gap_percent
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    raise SystemExit("results_analytics.py needs NumPy: pip install -r requirements.txt")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ELECTIONS_DIR = os.path.join(ROOT, "public", "data", "elections")
+STAGING_DB = os.path.join(ROOT, "data", "staging.db")
+DEFAULT_CYCLE = "na15-2021"
+DEFAULT_TOP = 5
+
+METRICS = (
+    "gap_votes",
+    "gap_percent",
+    "lead_votes",
+    "lead_percent",
+    "percent_spread",
+    "lowest_winner_votes",
+    "highest_loser_votes",
+)
+
+# Metrics stored in election_result_constituency_summary.
+SUMMARY_METRICS = ("gap_votes", "gap_percent", "lowest_winner_votes", "highest_loser_votes")
+
+
+def read_records(cycle_dir: str, name: str) -> list[dict]:
+    with open(os.path.join(cycle_dir, name), "r", encoding="utf-8") as fh:
+        return json.load(fh)["records"]
+
+
+class ResultsTable:
+    """One cycle's results as columns, one row per result record.
+
+    ``group`` indexes the per-constituency lists (``constituency_ids``,
+    ``locality_names``, ``unit_numbers``) and ``seats`` (0 when unknown).
+    Missing votes or percents are NaN.
+    """
+
+    def __init__(self, cycle_id: str, records: list[dict], constituencies: list[dict], localities: list[dict]) -> None:
+        seats_by_id = {item["id"]: item["seat_count"] for item in constituencies}
+        locality_names = {item["id"]: item["name_vi"] for item in localities}
+        self.cycle_id = cycle_id
+        self.constituency_ids: list[str] = []
+        self.locality_names: list[str | None] = []
+        self.unit_numbers: list[int | None] = []
+        seats: list[int] = []
+        group_by_key: dict[str, int] = {}
+        group = []
+        for record in records:
+            locality_name = locality_names.get(record["locality_id"])
+            # Results that were not matched to a constituency fall back to a
+            # locality/unit key and have no seat count.
+            key = record["constituency_id"] or f"{locality_name}-{record['unit_number']}"
+            index = group_by_key.get(key)
+            if index is None:
+                index = group_by_key[key] = len(self.constituency_ids)
+                self.constituency_ids.append(key)
+                self.locality_names.append(locality_name)
+                self.unit_numbers.append(record["unit_number"])
+                seats.append(seats_by_id.get(record["constituency_id"]) or 0)
+            group.append(index)
+        self.group = np.array(group, dtype=np.int64)
+        self.seats = np.array(seats, dtype=np.int64)
+        self.votes = np.array(
+            [np.nan if record["votes"] is None else record["votes"] for record in records], dtype=np.float64
+        )
+        self.percent = np.array(
+            [np.nan if record["percent"] is None else record["percent"] for record in records],
+            dtype=np.float64,
+        )
+        self.names = [record["candidate_name_vi"] for record in records]
+        self.record_keys = sorted(records[0]) if records else []
+
+    @classmethod
+    def load(cls, cycle_id: str, elections_dir: str = ELECTIONS_DIR) -> "ResultsTable":
+        cycle_dir = os.path.join(elections_dir, cycle_id)
+        return cls(
+            cycle_id,
+            read_records(cycle_dir, "results.json"),
+            read_records(cycle_dir, "constituencies.json"),
+            read_records(cycle_dir, "localities.json"),
+        )
+
+
+def compute_metrics(table: ResultsTable) -> dict[str, np.ndarray]:
+    """Per-constituency metric columns, indexed like ``table.constituency_ids``.
+
+    Vote counts are floats so missing values can be NaN; ``*_row`` columns
+    hold the result row of the lowest winner and highest loser (-1 if none).
+    """
+    group_count = len(table.constituency_ids)
+    # Rows with votes, by constituency and then votes descending; lexsort is
+    # stable, so tied votes keep their results.json order.
+    rows = np.flatnonzero(~np.isnan(table.votes))
+    rows = rows[np.lexsort((-table.votes[rows], table.group[rows]))]
+    groups = table.group[rows]
+    votes = table.votes[rows]
+    percent = table.percent[rows]
+
+    counts = np.bincount(groups, minlength=group_count)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    seats = table.seats
+
+    def at(values: np.ndarray, positions: np.ndarray, valid: np.ndarray, missing=np.nan) -> np.ndarray:
+        picked = np.full(group_count, missing, dtype=values.dtype)
+        picked[valid] = values[positions[valid]]
+        return picked
+
+    has_threshold = (seats > 0) & (counts > seats)
+    lowest_winner = starts + seats - 1
+    highest_loser = starts + seats
+    has_runner_up = counts >= 2
+
+    lowest_winner_votes = at(votes, lowest_winner, has_threshold)
+    highest_loser_votes = at(votes, highest_loser, has_threshold)
+    lowest_winner_percent = at(percent, lowest_winner, has_threshold)
+    highest_loser_percent = at(percent, highest_loser, has_threshold)
+
+    spread = np.full(group_count, np.nan)
+    occupied = counts > 0
+    if rows.size:
+        # fmax/fmin skip NaN percents within a constituency.
+        segment_starts = starts[occupied]
+        spread[occupied] = np.fmax.reduceat(percent, segment_starts) - np.fmin.reduceat(
+            percent, segment_starts
+        )
+
+    return {
+        "candidates": counts,
+        "seats": seats,
+        "lowest_winner_row": at(rows, lowest_winner, has_threshold, missing=-1),
+        "highest_loser_row": at(rows, highest_loser, has_threshold, missing=-1),
+        "lowest_winner_votes": lowest_winner_votes,
+        "lowest_winner_percent": lowest_winner_percent,
+        "highest_loser_votes": highest_loser_votes,
+        "highest_loser_percent": highest_loser_percent,
+        "gap_votes": lowest_winner_votes - highest_loser_votes,
+        "gap_percent": lowest_winner_percent - highest_loser_percent,
+        "lead_votes": at(votes, starts, has_runner_up) - at(votes, starts + 1, has_runner_up),
+        "lead_percent": at(percent, starts, has_runner_up) - at(percent, starts + 1, has_runner_up),
+        "percent_spread": spread,
+    }
+
+
+def top_k(values: np.ndarray, k: int, largest: bool = True) -> np.ndarray:
+    """Indices of the ``k`` largest (or smallest) non-NaN values, best first."""
+    candidates = np.flatnonzero(~np.isnan(values))
+    if k <= 0 or candidates.size == 0:
+        return candidates[:0]
+    keys = -values[candidates] if largest else values[candidates]
+    if k < candidates.size:
+        selected = np.argpartition(keys, k - 1)[:k]
+        candidates, keys = candidates[selected], keys[selected]
+    return candidates[np.argsort(keys, kind="stable")]
+
+
+def number(value: float) -> int | float | None:
+    if np.isnan(value):
+        return None
+    return int(value) if float(value).is_integer() else round(float(value), 4)
+
+
+def constituency_record(table: ResultsTable, metrics: dict[str, np.ndarray], index: int) -> dict:
+    lowest_winner = int(metrics["lowest_winner_row"][index])
+    highest_loser = int(metrics["highest_loser_row"][index])
+    return {
+        "constituency_id": table.constituency_ids[index],
+        "locality_name": table.locality_names[index],
+        "unit_number": table.unit_numbers[index],
+        "seat_count": int(table.seats[index]) or None,
+        "candidates": int(metrics["candidates"][index]),
+        "lowest_winner_name": table.names[lowest_winner] if lowest_winner >= 0 else None,
+        "lowest_winner_votes": number(metrics["lowest_winner_votes"][index]),
+        "lowest_winner_percent": number(metrics["lowest_winner_percent"][index]),
+        "highest_loser_name": table.names[highest_loser] if highest_loser >= 0 else None,
+        "highest_loser_votes": number(metrics["highest_loser_votes"][index]),
+        "highest_loser_percent": number(metrics["highest_loser_percent"][index]),
+        "gap_votes": number(metrics["gap_votes"][index]),
+        "gap_percent": number(metrics["gap_percent"][index]),
+        "lead_votes": number(metrics["lead_votes"][index]),
+        "lead_percent": number(metrics["lead_percent"][index]),
+        "percent_spread": number(metrics["percent_spread"][index]),
+    }
+
+
+def analyze(cycle_id: str, metric: str = "gap_votes", top: int = DEFAULT_TOP, elections_dir: str = ELECTIONS_DIR) -> dict:
+    table = ResultsTable.load(cycle_id, elections_dir)
+    metrics = compute_metrics(table)
+    values = metrics[metric]
+    return {
+        "cycle_id": cycle_id,
+        "metric": metric,
+        "constituency_count": len(table.constituency_ids),
+        "result_count": int(table.group.size),
+        "sample_record_keys": table.record_keys,
+        "top": [constituency_record(table, metrics, i) for i in top_k(values, top, largest=True)],
+        "bottom": [constituency_record(table, metrics, i) for i in top_k(values, top, largest=False)],
+        "constituencies": [constituency_record(table, metrics, i) for i in range(len(table.constituency_ids))],
+    }
+
+
+def analyze_staging_db(
+    cycle_id: str, metric: str = "gap_votes", top: int = DEFAULT_TOP, db_path: str = STAGING_DB
+) -> dict:
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(
+            """
+            SELECT s.constituency_id, l.name AS locality_name, s.unit_number, s.seat_count,
+                   s.candidate_count AS candidates, s.total_votes,
+                   w.candidate_name AS lowest_winner_name, s.lowest_winner_votes,
+                   s.lowest_winner_percent,
+                   h.candidate_name AS highest_loser_name, s.highest_loser_votes,
+                   s.highest_loser_percent,
+                   s.margin_votes AS gap_votes, s.margin_percent AS gap_percent, s.margin_rank
+            FROM election_result_constituency_summary s
+            LEFT JOIN locality l ON l.id = s.locality_id
+            LEFT JOIN election_result_candidate w ON w.id = s.lowest_winner_result_id
+            LEFT JOIN election_result_candidate h ON h.id = s.highest_loser_result_id
+            WHERE s.cycle_id = ?
+            ORDER BY s.locality_id, s.unit_number
+            """,
+            (cycle_id,),
+        ).fetchall()
+    finally:
+        conn.close()
+
+    records = [dict(row) for row in rows]
+    values = np.array(
+        [np.nan if record[metric] is None else record[metric] for record in records], dtype=np.float64
+    )
+    return {
+        "cycle_id": cycle_id,
+        "metric": metric,
+        "constituency_count": len(records),
+        "result_count": sum(record["candidates"] for record in records),
+        "sample_record_keys": sorted(records[0]) if records else [],
+        "top": [records[i] for i in top_k(values, top, largest=True)],
+        "bottom": [records[i] for i in top_k(values, top, largest=False)],
+        "constituencies": records,
+    }
+
+
+def print_listing(analysis: dict, metric: str, top: int, header: bool = False) -> None:
+    """Print the top/bottom listing in the format of the old compute_results_gap.py.
+
+    Ranked by the default ``gap_votes`` that is the old output line for line;
+    another metric names its rankings after itself and adds its column.
+    """
+    if header:
+        print(f"{analysis['cycle_id']}: {analysis['constituency_count']} constituencies, "
+              f"{analysis['result_count']} results")
+    print("sample_record_keys", analysis["sample_record_keys"])
+    suffix = "gaps" if metric == "gap_votes" else metric
+    for label in ("top", "bottom"):
+        print(f"{label}_{top}_{suffix}")
+        for record in analysis[label]:
+            line = {key: record[key] for key in (
+                "constituency_id", "locality_name", "unit_number", "seat_count",
+                "lowest_winner_name", "lowest_winner_votes",
+                "highest_loser_name", "highest_loser_votes",
+            )}
+            line["gap"] = record["gap_votes"]
+            if metric != "gap_votes":
+                line[metric] = record[metric]
+            print(line)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Winner/loser margins per constituency from exported results.")
+    parser.add_argument("--cycle", nargs="+", default=[DEFAULT_CYCLE], help="Cycle IDs under public/data/elections/.")
+    parser.add_argument("--metric", choices=METRICS, default="gap_votes", help="Metric to rank by (default: gap_votes).")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help=f"Rows in each ranking (default: {DEFAULT_TOP}).")
+    parser.add_argument("--json", metavar="PATH", help="Write the full analysis as JSON ('-' for stdout).")
+    parser.add_argument(
+        "--staging-db",
+        metavar="PATH",
+        nargs="?",
+        const=STAGING_DB,
+        help="Read thresholds and gaps from the staging DB summary table (default path: data/staging.db).",
+    )
+    args = parser.parse_args(argv)
+    if args.staging_db and args.metric not in SUMMARY_METRICS:
+        parser.error(f"--staging-db supports --metric {', '.join(SUMMARY_METRICS)}")
+
+    if args.staging_db:
+        analyses = [analyze_staging_db(cycle_id, args.metric, args.top, args.staging_db) for cycle_id in args.cycle]
+    else:
+        analyses = [analyze(cycle_id, args.metric, args.top) for cycle_id in args.cycle]
+    if args.json:
+        payload = analyses[0] if len(analyses) == 1 else {"cycles": analyses}
+        text = json.dumps(payload, ensure_ascii=False, indent=2) + "\n"
+        if args.json == "-":
+            sys.stdout.write(text)
+            return
+        with open(args.json, "w", encoding="utf-8") as fh:
+            fh.write(text)
+
+    for analysis in analyses:
+        print_listing(analysis, args.metric, args.top, header=len(analyses) > 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,14 @@ type CandidatesIndexPayload = {
   records: CandidateIndexRecord[];
 };
 
+type CandidatesSearchIndex = {
+  cycle_id: string;
+  generated_at: string;
+  record_count: number;
+  tokens: Record<string, string>;
+  trigrams: Record<string, string>;
+};
+
 const basePath = process.env.NEXT_PUBLIC_BASE_PATH || "";
 
 const sortOptions = [
@@ -43,6 +51,69 @@ function foldTerm(value: string): string {
     .trim();
 }
 
+function searchHaystack(record: CandidateIndexRecord): string {
+  return [record.name_folded, record.locality_folded, record.constituency_folded]
+    .filter(Boolean)
+    .join(" ");
+}
+
+function decodePostings(encoded: string | undefined): number[] {
+  if (!encoded) {
+    return [];
+  }
+  let offset = 0;
+  return encoded.split(",").map((gap) => (offset += Number(gap)));
+}
+
+function intersectSorted(a: number[], b: number[]): number[] {
+  const result: number[] = [];
+  let i = 0;
+  let j = 0;
+  while (i < a.length && j < b.length) {
+    if (a[i] === b[j]) {
+      result.push(a[i]);
+      i += 1;
+      j += 1;
+    } else if (a[i] < b[j]) {
+      i += 1;
+    } else {
+      j += 1;
+    }
+  }
+  return result;
+}
+
+// Offsets of records that may contain `term`; callers still check the haystack.
+function candidateOffsets(index: CandidatesSearchIndex, term: string): number[] {
+  if (term.length < 3) {
+    const offsets = new Set<number>();
+    Object.entries(index.tokens).forEach(([token, encoded]) => {
+      if (token.includes(term)) {
+        decodePostings(encoded).forEach((offset) => offsets.add(offset));
+      }
+    });
+    return Array.from(offsets).sort((a, b) => a - b);
+  }
+  const grams = new Set<string>();
+  for (let i = 0; i + 3 <= term.length; i += 1) {
+    grams.add(term.slice(i, i + 3));
+  }
+  const postings = Array.from(grams)
+    .map((gram) => index.trigrams[gram])
+    .sort((a, b) => (a?.length ?? 0) - (b?.length ?? 0));
+  let result: number[] | null = null;
+  for (const encoded of postings) {
+    if (!encoded) {
+      return [];
+    }
+    result = result ? intersectSorted(result, decodePostings(encoded)) : decodePostings(encoded);
+    if (result.length === 0) {
+      break;
+    }
+  }
+  return result ?? [];
+}
+
 function highlightMatch(text: string | null, query: string) {
   if (!text) {
     return "—";
@@ -78,6 +149,7 @@ export default function CandidatesListClient({ cycle }: { cycle?: string }) {
         : "";
   const activeCycle = cycle || routeCycle;
   const [payload, setPayload] = useState<CandidatesIndexPayload | null>(null);
+  const [searchIndex, setSearchIndex] = useState<CandidatesSearchIndex | null>(null);
   const [loadError, setLoadError] = useState(false);
   const [query, setQuery] = useState("");
   const [debouncedQuery, setDebouncedQuery] = useState("");
@@ -110,11 +182,29 @@ export default function CandidatesListClient({ cycle }: { cycle?: string }) {
           setLoadError(true);
         }
       });
+    // The search index is optional; without it the filter falls back to a scan.
+    fetch(`${basePath}/data/elections/${activeCycle}/candidates_search_index.json`)
+      .then((res) => (res.ok ? res.json() : null))
+      .then((data: CandidatesSearchIndex | null) => {
+        if (active) {
+          setSearchIndex(data);
+        }
+      })
+      .catch(() => {
+        if (active) {
+          setSearchIndex(null);
+        }
+      });
     return () => {
       active = false;
     };
   }, [activeCycle]);
 
+  const haystacks = useMemo(
+    () => (payload ? payload.records.map(searchHaystack) : []),
+    [payload]
+  );
+
   useEffect(() => {
     const handle = window.setTimeout(() => {
       setDebouncedQuery(query);
@@ -132,17 +222,13 @@ export default function CandidatesListClient({ cycle }: { cycle?: string }) {
     if (!term) {
       return payload.records.slice();
     }
-    return payload.records.filter((record) => {
-      const haystack = [
-        record.name_folded,
-        record.locality_folded,
-        record.constituency_folded,
-      ]
-        .filter(Boolean)
-        .join(" ");
-      return haystack.includes(term);
-    });
-  }, [payload, debouncedQuery]);
+    if (searchIndex && searchIndex.record_count === payload.records.length) {
+      return candidateOffsets(searchIndex, term)
+        .filter((offset) => haystacks[offset]?.includes(term))
+        .map((offset) => payload.records[offset]);
+    }
+    return payload.records.filter((_, offset) => haystacks[offset].includes(term));
+  }, [payload, searchIndex, haystacks, debouncedQuery]);
 
   const filteredBySelect = useMemo(() => {
     return filtered.filter((record) => {
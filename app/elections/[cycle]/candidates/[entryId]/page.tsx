@@ -3,6 +3,7 @@ import path from "node:path";
 import Link from "next/link";
 import { notFound } from "next/navigation";
 import CycleNav from "../../CycleNav";
+import { cycleBaseDir, readCandidateDetail, readDetailLookup, readJson } from "@/lib/candidate-detail";
 
 type CandidateDetailPayload = {
   entry_id: string;
@@ -90,12 +91,11 @@ type ResultsRecord = {
   annotations: ResultsAnnotation[];
 };
 
-type ResultsPayload = {
+type CandidateResultsPayload = {
   cycle_id: string;
   generated_at: string;
   source: ResultsSource | null;
-  summary: Record<string, unknown> | null;
-  records: ResultsRecord[];
+  record: ResultsRecord | null;
 };
 
 const ATTRIBUTE_LABELS: Record<string, { en: string; vi: string }> = {
@@ -165,22 +165,13 @@ function groupSources(
   return Array.from(map.entries()).map(([title, items]) => ({ title, items }));
 }
 
-async function readJson<T>(filePath: string): Promise<T> {
-  const raw = await fs.readFile(filePath, "utf-8");
-  return JSON.parse(raw) as T;
-}
-
 export async function generateStaticParams() {
   const cycle = "na15-2021";
-  const detailDir = path.join(
-    process.cwd(),
-    "public",
-    "data",
-    "elections",
-    cycle,
-    "candidates_detail"
-  );
-  const files = await fs.readdir(detailDir);
+  const lookup = await readDetailLookup(cycle);
+  if (lookup) {
+    return Object.keys(lookup.records).map((entryId) => ({ cycle, entryId }));
+  }
+  const files = await fs.readdir(path.join(cycleBaseDir(cycle), "candidates_detail"));
   return files
     .filter((file) => file.endsWith(".json"))
     .map((file) => ({
@@ -287,40 +278,20 @@ export default async function CandidateDetailPage({
     notFound();
   }
 
-  const detailPath = path.join(
-    process.cwd(),
-    "public",
-    "data",
-    "elections",
-    cycle,
-    "candidates_detail",
-    `${entryId}.json`
-  );
-  const resultsPath = path.join(
-    process.cwd(),
-    "public",
-    "data",
-    "elections",
-    cycle,
-    "results.json"
-  );
+  const resultsPath = path.join(cycleBaseDir(cycle), "results_by_candidate", `${entryId}.json`);
 
-  try {
-    await fs.access(detailPath);
-  } catch {
+  const payload = await readCandidateDetail<CandidateDetailPayload>(cycle, entryId);
+  if (!payload) {
     notFound();
   }
-
-  const payload = await readJson<CandidateDetailPayload>(detailPath);
-  let resultsPayload: ResultsPayload | null = null;
+  let resultsPayload: CandidateResultsPayload | null = null;
   try {
     await fs.access(resultsPath);
-    resultsPayload = await readJson<ResultsPayload>(resultsPath);
+    resultsPayload = await readJson<CandidateResultsPayload>(resultsPath);
   } catch {
     resultsPayload = null;
   }
-  const resultsRecord =
-    resultsPayload?.records.find((record) => record.candidate_entry_id === entryId) ?? null;
+  const resultsRecord = resultsPayload?.record ?? null;
   const derivedStatus =
     resultsRecord?.status ??
     deriveResultStatus(resultsRecord?.order_in_unit ?? null, payload.constituency?.seat_count);
@@ -3,6 +3,7 @@ import path from "node:path";
 import { notFound } from "next/navigation";
 import Link from "next/link";
 import CycleNav from "../../CycleNav";
+import { cycleBaseDir, readCandidateDetail, readJson } from "@/lib/candidate-detail";
 
 type District = {
   name_vi: string;
@@ -29,38 +30,6 @@ type ConstituenciesPayload = {
   records: ConstituencyRecord[];
 };
 
-type LocalityPayload = {
-  cycle_id: string;
-  generated_at: string;
-  records: Array<{
-    id: string;
-    name_vi: string;
-    name_folded: string;
-    type: string;
-  }>;
-};
-
-type CandidateIndexRecord = {
-  entry_id: string;
-  person_id: string;
-  name_vi: string;
-  name_folded: string;
-  locality_id: string | null;
-  locality_vi: string | null;
-  locality_folded: string | null;
-  constituency_id: string | null;
-  constituency_vi: string | null;
-  constituency_folded: string | null;
-  unit_number: number | null;
-  list_order: number | null;
-};
-
-type CandidatesIndexPayload = {
-  cycle_id: string;
-  generated_at: string;
-  records: CandidateIndexRecord[];
-};
-
 type SourceRecord = {
   field: string;
   document_id: string;
@@ -72,18 +41,6 @@ type SourceRecord = {
   notes: string | null;
 };
 
-type ResultsSummary = {
-  total_seats: number | null;
-  total_candidates: number | null;
-  total_voters: number | null;
-  total_votes_cast: number | null;
-  turnout_percent: number | null;
-  valid_votes: number | null;
-  invalid_votes: number | null;
-  confirmed_winners: number | null;
-  unconfirmed_winners: number | null;
-};
-
 type ResultsRecord = {
   id: string;
   candidate_entry_id: string | null;
@@ -123,11 +80,13 @@ type ResultsSource = {
   notes: string | null;
 };
 
-type ResultsPayload = {
+type ConstituencyResultsPayload = {
   cycle_id: string;
   generated_at: string;
+  constituency: ConstituencyRecord;
+  locality: { id: string; name_vi: string; name_folded: string; type: string } | null;
+  candidate_entry_ids: string[];
   source: ResultsSource | null;
-  summary: ResultsSummary | null;
   records: ResultsRecord[];
 };
 
@@ -313,15 +272,6 @@ function formatAnnotationDetails(annotation: ResultsRecord["annotations"][number
   return parts.length > 0 ? parts.join(" · ") : "Source cited";
 }
 
-async function readJson<T>(filePath: string): Promise<T> {
-  const raw = await fs.readFile(filePath, "utf-8");
-  return JSON.parse(raw) as T;
-}
-
-function cycleBaseDir(cycle: string): string {
-  return path.join(process.cwd(), "public", "data", "elections", cycle);
-}
-
 export async function generateStaticParams() {
   const cycle = "na15-2021";
   const baseDir = cycleBaseDir(cycle);
@@ -344,61 +294,30 @@ export default async function ConstituencyDetailPage({
   }
 
   const baseDir = cycleBaseDir(cycle);
-  const constituenciesPath = path.join(baseDir, "constituencies.json");
-  const candidatesIndexPath = path.join(baseDir, "candidates_index.json");
-  const localitiesPath = path.join(baseDir, "localities.json");
-  const resultsPath = path.join(baseDir, "results.json");
+  const shardPath = path.join(baseDir, "results_by_constituency", `${constituencyId}.json`);
 
   try {
-    await Promise.all([
-      fs.access(constituenciesPath),
-      fs.access(candidatesIndexPath),
-      fs.access(localitiesPath),
-    ]);
+    await fs.access(shardPath);
   } catch {
     notFound();
   }
 
-  const [constituenciesPayload, candidatesIndex, localitiesPayload] = await Promise.all([
-    readJson<ConstituenciesPayload>(constituenciesPath),
-    readJson<CandidatesIndexPayload>(candidatesIndexPath),
-    readJson<LocalityPayload>(localitiesPath),
-  ]);
-  let resultsPayload: ResultsPayload | null = null;
-  try {
-    await fs.access(resultsPath);
-    resultsPayload = await readJson<ResultsPayload>(resultsPath);
-  } catch {
-    resultsPayload = null;
-  }
+  const resultsPayload = await readJson<ConstituencyResultsPayload>(shardPath);
+  const constituency = resultsPayload.constituency;
 
-  const constituency = constituenciesPayload.records.find((record) => record.id === constituencyId);
-  if (!constituency) {
-    notFound();
-  }
-
-  const entryRecords = candidatesIndex.records
-    .filter((record) => record.constituency_id === constituencyId)
-    .sort((a, b) => (a.list_order ?? 0) - (b.list_order ?? 0));
-
-  const candidateDetails = await Promise.all(
-    entryRecords.map(async (record) => {
-      const detailPath = path.join(baseDir, "candidates_detail", `${record.entry_id}.json`);
-      return readJson<CandidateDetailPayload>(detailPath);
-    })
-  );
+  const candidateDetails = (
+    await Promise.all(
+      resultsPayload.candidate_entry_ids.map((entryId) =>
+        readCandidateDetail<CandidateDetailPayload>(cycle, entryId)
+      )
+    )
+  ).filter((candidate): candidate is CandidateDetailPayload => candidate !== null);
   const candidateDetailMap = new Map(
     candidateDetails.map((candidate) => [candidate.entry_id, candidate])
   );
-  const resultsRecords = resultsPayload
-    ? resultsPayload.records
-        .filter((record) => record.constituency_id === constituencyId)
-        .sort((a, b) => (a.order_in_unit ?? 0) - (b.order_in_unit ?? 0))
-    : [];
-
-  const localityName =
-    localitiesPayload.records.find((record) => record.id === constituency.locality_id)
-      ?.name_vi ?? constituency.locality_id;
+  const resultsRecords = resultsPayload.records;
+
+  const localityName = resultsPayload.locality?.name_vi ?? constituency.locality_id;
   const descriptionText = constituency.description
     ? formatCommaList(constituency.description)
     : null;
@@ -1,156 +1,217 @@
+import fs from "node:fs/promises";
+import path from "node:path";
 import { notFound } from "next/navigation";
 import CycleNav from "../CycleNav";
 
 const SUPPORTED_CYCLES = ["na15-2021", "na16-2026"];
 
-const quickStats = {
-  "na15-2021": {
-    kpis: [
-      { label: "Total candidates", value: "868", sublabel: "Roster" },
-      { label: "Total winners", value: "500", sublabel: "Results (won)" },
-      { label: "Constituencies", value: "186" },
-      { label: "Localities", value: "63" },
-      { label: "Avg candidates/const.", value: "4.72" },
-      { label: "Avg age", value: "45.47 / 49.28", sublabel: "Candidates / winners" },
-    ],
-    seatDistributionFull: [
-      "30 seats: 1 (TP. Hồ Chí Minh)",
-      "29 seats: 1 (TP. Hà Nội)",
-      "14 seats: 1 (Tỉnh Thanh Hóa)",
-      "13 seats: 1 (Tỉnh Nghệ An)",
-      "12 seats: 2 (Tỉnh Bắc Kạn, Tỉnh Đồng Nai)",
-      "11 seats: 1",
-      "9 seats: 6",
-      "8 seats: 7",
-      "7 seats: 17",
-      "6 seats: 26",
-    ],
-    ageSummary: {
-      candidates: { average: "45.47", median: "45" },
-      winners: { average: "49.28", median: "50" },
-      oldestWinners: [
-        "Nguyễn Phú Trọng — 77 (TP. Hà Nội, unit 1)",
-        "Nguyễn Chu Hồi — 69 (TP. Hải Phòng, unit 2)",
-        "Trương Trọng Nghĩa — 68 (TP. Hồ Chí Minh, unit 8)",
-        "Võ Văn Kim (Vũ Trọng Kim) — 68 (Tỉnh Nam Định, unit 3)",
-        "Nguyễn Thiện Nhân — 67 (TP. Hồ Chí Minh, unit 6)",
-      ],
-      youngestWinners: [
-        "Quàng Thị Nguyệt — 23 (Tỉnh Điện Biên, unit 1)",
-        "Nàng Xô Vi — 25 (Tỉnh Kon Tum, unit 1)",
-        "Trần Thị Quỳnh — 28 (Tỉnh Nam Định, unit 3)",
-        "Hà Ánh Phượng — 29 (Tỉnh Phú Thọ, unit 1)",
-        "Phạm Thị Xuân — 29 (Tỉnh Thanh Hóa, unit 5)",
-      ],
-      oldestCandidates: [
-        "Nguyễn Phú Trọng — 77 (TP. Hà Nội, unit 1)",
-        "Lê Phương Hồng (Phối sư Ngọc Hồng Thanh) — 73 (Tỉnh Tây Ninh, unit 2)",
-        "Trần Đức Cường — 73 (TP. Hồ Chí Minh, unit 10)",
-        "Nguyễn Thị Yến (Ni sư Thích Nữ Tín Liên) — 70 (TP. Hồ Chí Minh, unit 7)",
-        "Nguyễn Chu Hồi — 69 (TP. Hải Phòng, unit 2)",
-      ],
-      youngestCandidates: [
-        "Quàng Thị Nguyệt — 23 (Tỉnh Điện Biên, unit 1)",
-        "Bùi Thị Tuyết Nhung — 23 (Tỉnh Phú Thọ, unit 1)",
-        "Vũ Tiến Vượng — 23 (TP. Hà Nội, unit 1)",
-        "Lý Thị An — 24 (Tỉnh Điện Biên, unit 1)",
-        "Nàng Xô Vi — 25 (Tỉnh Kon Tum, unit 1)",
-      ],
-    },
-    topVotes: [
-      "Ông Nguyễn Xuân Phúc — 622,984 (TP. Hồ Chí Minh, unit 10)",
-      "Ông Nguyễn Phú Trọng — 557,717 (TP. Hà Nội, unit 1)",
-      "Bà Nguyễn Thị Lệ — 550,676 (TP. Hồ Chí Minh, unit 10)",
-      "Ông Thái Thanh Quý — 529,035 (Tỉnh Nghệ An, unit 4)",
-      "Ông Đào Ngọc Dung — 522,538 (Tỉnh Thanh Hóa, unit 3)",
-    ],
-    bottomVotesWinners: [
-      "Ông Hoàng Văn Hữu — 63,511 (Tỉnh Bắc Kạn, unit 2)",
-      "Ông Hà Sỹ Huân — 63,593 (Tỉnh Bắc Kạn, unit 1)",
-      "Bà Nguyễn Thị Huế — 69,683 (Tỉnh Bắc Kạn, unit 2)",
-      "Bà Nguyễn Thị Thủy — 72,606 (Tỉnh Bắc Kạn, unit 1)",
-      "Bà Hồ Thị Kim Ngân — 74,093 (Tỉnh Bắc Kạn, unit 1)",
-    ],
-    topPercent: [
-      "Ông Vương Đình Huệ — 99.89% (TP. Hải Phòng, unit 3)",
-      "Ông Phạm Minh Chính — 98.74% (TP. Cần Thơ, unit 1)",
-      "Bà Nguyễn Thị Thu Hà — 98.38% (Tỉnh Ninh Bình, unit 1)",
-      "Ông Tô Lâm — 98.36% (Tỉnh Hưng Yên, unit 1)",
-      "Ông Lương Văn Cường (Lương Cường) — 97.72% (Tỉnh Thanh Hóa, unit 2)",
-    ],
-    bottomPercentWinners: [
-      "Bà Trần Khánh Thu — 50.02% (Tỉnh Thái Bình, unit 1)",
-      "Ông Đỗ Ngọc Thịnh — 50.13% (Tỉnh Khánh Hòa, unit 2)",
-      "Bà Phạm Thị Minh Huệ — 51.53% (Tỉnh Sóc Trăng, unit 1)",
-      "Ông Dương Bình Phú — 51.90% (Tỉnh Phú Yên, unit 1)",
-      "Ông Hoàng Văn Hữu — 52.99% (Tỉnh Bắc Kạn, unit 2)",
-    ],
-    gapVotesLargest: [
-      "TP. Hải Phòng, unit 3 — 450,906",
-      "Tỉnh Thanh Hóa, unit 1 — 437,735",
-      "TP. Hải Phòng, unit 1 — 433,400",
-      "Tỉnh Thanh Hóa, unit 2 — 430,469",
-      "Tỉnh Thanh Hóa, unit 4 — 390,733",
-    ],
-    gapVotesSmallest: [
-      "Tỉnh Bắc Kạn, unit 2 — 197",
-      "Tỉnh Trà Vinh, unit 2 — 1,221",
-      "TP. Hồ Chí Minh, unit 8 — 1,510",
-      "Tỉnh Phú Yên, unit 1 — 2,172",
-      "Tỉnh Phú Yên, unit 2 — 3,720",
-    ],
-    gapPercentLargest: [
-      "TP. Hải Phòng, unit 3 — 90.19 pp",
-      "Tỉnh Hà Tĩnh, unit 2 — 87.24 pp",
-      "Tỉnh Hà Tĩnh, unit 3 — 86.74 pp",
-      "Tỉnh Ninh Bình, unit 2 — 86.23 pp",
-      "Tỉnh Hưng Yên, unit 1 — 83.14 pp",
-    ],
-    gapPercentSmallest: [
-      "Tỉnh Bắc Kạn, unit 2 — 0.16 pp",
-      "TP. Hồ Chí Minh, unit 8 — 0.27 pp",
-      "Tỉnh Trà Vinh, unit 2 — 0.28 pp",
-      "Tỉnh Phú Yên, unit 1 — 0.59 pp",
-      "Tỉnh Phú Yên, unit 2 — 1.06 pp",
-    ],
-    localitiesMostCandidates: [
-      "TP. Hồ Chí Minh 50",
-      "TP. Hà Nội 49",
-      "Tỉnh Thanh Hóa 24",
-      "Tỉnh Nghệ An 23",
-      "Tỉnh Đồng Nai 20",
-    ],
-    localitiesFewestCandidates:
-      "10 each (26 localities): TP. Đà Nẵng; Tỉnh Bà Rịa - Vũng Tàu; Tỉnh Bình Phước; Tỉnh Bạc Liêu; Tỉnh Bắc Kạn; Tỉnh Cao Bằng; Tỉnh Hà Giang; Tỉnh Hà Nam; Tỉnh Hòa Bình; Tỉnh Hậu Giang; Tỉnh Kon Tum; Tỉnh Lai Châu; Tỉnh Lào Cai; Tỉnh Lạng Sơn; Tỉnh Ninh Bình; Tỉnh Ninh Thuận; Tỉnh Phú Yên; Tỉnh Quang Bình; Tỉnh Quảng Trị; Tỉnh Trà Vinh; Tỉnh Tây Ninh; Tỉnh Vĩnh Long; Tỉnh Vĩnh Phúc; Tỉnh Yên Bái; Tỉnh Điện Biên; Tỉnh Đắk Nông.",
-    localitiesFewestSeats:
-      "6 seats each (26 localities). Example bottom 5: TP. Đà Nẵng; Tỉnh Bà Rịa - Vũng Tàu; Tỉnh Bạc Liêu; Tỉnh Bình Phước; Tỉnh Cao Bằng.",
-    demographics: {
-      gender: "Nam 475; Nữ 393.",
-      ethnicitySplit: "Kinh 683 (78.69%); non-Kinh 185 (21.31%).",
-      ethnicityCounts:
-        "Kinh 683; Tày 32; Thái 19; Mường 17; Mông 11; Khmer 9; Hoa 7; Nùng 7; Dao 5; Ê-đê 5; Chăm 4; Cơ - ho 4; HMông 4; Sán Dìu 4; Jrai 3; Lào 3; Bahnar 2; Châu Mạ 2; Cơ tu 2; Hre 2; Khơ-mú 2; M`nông 2; Mnông 2; Ra-Glay 2; Thổ 2; Vân Kiều 2; Bana 1; Banar 1; Brâu 1; Cao Lan 1; Cao Lan (Sán Chay) 1; Chơ ro 1; Chơ-ro 1; Co 1; Cơ-tu 1; Gia Rai 1; Giáy 1; Hà Nhì 1; Ka dong 1; Khơme 1; Kor 1; La Chí 1; Lự 1; Mạ 1; Mảng 1; Ngái 1; Pa Cô 1; Pà Thẻn 1; Ra-Glai 1; Stiêng 1; Sán Chay 1; Sán Chay (Cao Lan) 1; S’tiêng 1; Triêng 1; Tà-ôi 1; Xơ Đăng 1; Xơ-đăng (Ca Dong) 1.",
-      religion:
-        "Không 845 (97.35%); Phật giáo 10 (1.15%); Công giáo 4 (0.46%); Bà la môn 2 (0.23%); Thiên chúa giáo 1 (0.12%); Phật giáo, Thượng tọa 1 (0.12%); Phật 1 (0.12%); Cao Đài 1 (0.12%); Bà ni 1 (0.12%); Balamôn 1 (0.12%); (empty) 1 (0.12%).",
-    },
-    education: {
-      general:
-        "12/12 762 (87.79%); 10/10 88 (10.14%); 12/12 bổ túc 14 (1.61%); 09/12 1 (0.12%); 11/12 1 (0.12%); 12/12 Bổ túc 1 (0.12%); 9/12 1 (0.12%).",
-      political:
-        "Cao cấp 587 (67.63%); Trung cấp 111 (12.79%); - 66 (7.60%); Cử nhân 55 (6.34%); Sơ cấp 35 (4.03%); Không 9 (1.04%); Cử nhân, Cao cấp 2 (0.23%); Cử nhân chính trị 1 (0.12%); Thạc sĩ 1 (0.12%); Đang học Trung cấp 1 (0.12%).",
-      academicMentions: "Tiến sĩ 169; Giáo sư 43; Phó giáo sư 27.",
-      academicFolded:
-        "Thạc sĩ 385; Cử nhân 266; Tiến sĩ 125; Phó Giáo sư, Tiến sĩ 27; Giáo sư, Tiến sĩ 15; Kỹ sư 15; Bác sĩ 7; Bác sĩ chuyên khoa cấp I 3; Bác sĩ chuyên khoa I 3; Bác sĩ chuyên khoa II 3; Kỹ sư, cử nhân 3; Bác sĩ chuyên khoa cấp II 1; Cao đẳng 1; Cử nhân, Kỹ sư 1; Giáo sư kinh tế, Tiến sĩ 1; Kiến trúc sư 1; Tiến sĩ, Bác sĩ chuyên khoa II 1.",
-      academicMissing: "10 candidates without `education_academic_rank`.",
-    },
-    irregularities: {
-      notConfirmed:
-        "Trần Văn Nam (Trần Quốc Tuấn), Tỉnh Bình Dương, unit 1 — status not_confirmed; notes “Per VTV report”.",
-      constituencyMismatch:
-        "Bà Châu Quỳnh Dao (Kiên Giang unit 3 → unit 1); Ông Nguyễn Văn Hùng (Kon Tum unit 2 → unit 1); Ông Phạm Đình Thanh (Kon Tum unit 2 → unit 1); Bà Trần Thị Thu Phước (Kon Tum unit 1 → unit 2); Ông Tô Văn Tám (Kon Tum unit 1 → unit 2); Bà Nguyễn Thị Tuyết Nga (Quang Bình unit 2 → unit 1); Bà Đoàn Thị Thanh Tâm (Quang Bình unit 2 → unit 1); Ông Nguyễn Tiến Nam (Quang Bình unit 2 → unit 1); Ông Phạm Trọng Tiến (Quang Bình unit 2 → unit 1); Ông Trần Quang Minh (Quang Bình unit 2 → unit 1); Bà Nguyễn Minh Tâm (Quang Bình unit 1 → unit 2); Bà Nguyễn Thị Kim Sinh (Quang Bình unit 1 → unit 2); Bà Nguyễn Thị Lệ Quyên (Quang Bình unit 1 → unit 2); Ông Nguyễn Mạnh Cường (Quang Bình unit 1 → unit 2); Ông Vũ Đại Thắng (Quang Bình unit 1 → unit 2).",
-    },
-  },
+type ValueCount = { value: string | null; count: number; percent: number | null };
+
+type AgeRecord = {
+  entry_id: string;
+  name_vi: string;
+  dob: string;
+  age: number;
+  locality_vi: string;
+  unit_number: number;
+};
+
+type AgeGroup = {
+  count: number;
+  average: number | null;
+  median: number | null;
+  oldest: AgeRecord[];
+  youngest: AgeRecord[];
+};
+
+type ResultItem = {
+  result_id: string;
+  candidate_entry_id: string | null;
+  name_vi: string;
+  locality_vi: string | null;
+  unit_number: number | null;
+  votes: number | null;
+  percent: number | null;
 };
 
+type Margin = {
+  constituency_id: string;
+  locality_vi: string | null;
+  unit_number: number | null;
+  lowest_winner: ResultItem;
+  highest_loser: ResultItem;
+  votes_gap: number;
+  percent_gap: number;
+};
+
+type QuickStatsPayload = {
+  cycle_id: string;
+  generated_at: string;
+  cycle: { id: string; name: string; year: number };
+  age_reference_date: string | null;
+  totals: {
+    candidates: number;
+    winners: number;
+    result_records: number;
+    constituencies: number;
+    localities: number;
+    seats: number;
+    candidates_per_constituency: number | null;
+  };
+  localities: Array<{
+    locality_id: string;
+    name_vi: string;
+    constituencies: number;
+    seats: number;
+    candidates: number;
+  }>;
+  seat_distribution: Array<{ seats: number; localities: string[] }>;
+  age: { candidates: AgeGroup; winners: AgeGroup };
+  demographics: {
+    gender: ValueCount[];
+    ethnicity: ValueCount[];
+    ethnicity_split: {
+      kinh: { count: number; percent: number | null };
+      non_kinh: { count: number; percent: number | null };
+    };
+    religion: ValueCount[];
+  };
+  education: {
+    general: ValueCount[];
+    professional: ValueCount[];
+    political: ValueCount[];
+    academic_rank: ValueCount[];
+    academic_mentions: Array<{ label: string; count: number }>;
+    academic_missing: number;
+  };
+  incumbency: {
+    na_delegates: number;
+    first_time: number;
+    unknown: number;
+    winners_na_delegates: number;
+    previous_terms: Array<{ term: string; count: number }>;
+  };
+  turnout: {
+    total_voters: number | null;
+    total_votes_cast: number | null;
+    turnout_percent: number | null;
+    valid_votes: number | null;
+    invalid_votes: number | null;
+  } | null;
+  votes: {
+    top_votes: ResultItem[];
+    bottom_votes_winners: ResultItem[];
+    top_percent: ResultItem[];
+    bottom_percent_winners: ResultItem[];
+  };
+  margins: {
+    votes_largest: Margin[];
+    votes_smallest: Margin[];
+    percent_largest: Margin[];
+    percent_smallest: Margin[];
+  };
+  irregularities: {
+    not_confirmed: Array<{
+      name_vi: string;
+      locality_vi: string | null;
+      unit_number: number | null;
+      status: string;
+      notes: string | null;
+    }>;
+    constituency_mismatch: Array<{
+      name_vi: string;
+      locality_vi: string | null;
+      list_unit_number: number | null;
+      results_unit_number: number | null;
+    }>;
+  };
+};
+
+// Seat buckets covering this many of the largest localities list them by name.
+const NAMED_SEAT_LOCALITIES = 5;
+
+async function readQuickStats(cycle: string): Promise<QuickStatsPayload | null> {
+  const filePath = path.join(
+    process.cwd(),
+    "public",
+    "data",
+    "elections",
+    cycle,
+    "quick_stats.json"
+  );
+  try {
+    const raw = await fs.readFile(filePath, "utf-8");
+    return JSON.parse(raw) as QuickStatsPayload;
+  } catch {
+    return null;
+  }
+}
+
+function formatNumber(value: number | null | undefined): string {
+  if (value === null || value === undefined) {
+    return "—";
+  }
+  return value.toLocaleString("en-US");
+}
+
+function formatFixed(value: number | null | undefined): string {
+  if (value === null || value === undefined) {
+    return "—";
+  }
+  return value.toFixed(2);
+}
+
+function formatUnit(locality: string | null, unit: number | null): string {
+  return `${locality ?? "Unknown locality"}, unit ${unit ?? "—"}`;
+}
+
+function formatCounts(items: ValueCount[], withPercent = true): string {
+  const parts = items.map((item) => {
+    const label = item.value ?? "(empty)";
+    return withPercent
+      ? `${label} ${item.count} (${formatFixed(item.percent)}%)`
+      : `${label} ${item.count}`;
+  });
+  return `${parts.join("; ")}.`;
+}
+
+function formatAge(record: AgeRecord): string {
+  return `${record.name_vi} — ${record.age} (${formatUnit(record.locality_vi, record.unit_number)})`;
+}
+
+function formatVotes(item: ResultItem): string {
+  return `${item.name_vi} — ${formatNumber(item.votes)} (${formatUnit(item.locality_vi, item.unit_number)})`;
+}
+
+function formatShare(item: ResultItem): string {
+  return `${item.name_vi} — ${formatFixed(item.percent)}% (${formatUnit(item.locality_vi, item.unit_number)})`;
+}
+
+function seatDistribution(stats: QuickStatsPayload): string[] {
+  let named = 0;
+  return stats.seat_distribution.map((bucket) => {
+    const label = `${bucket.seats} seats: ${bucket.localities.length}`;
+    const showNames = named < NAMED_SEAT_LOCALITIES;
+    named += bucket.localities.length;
+    return showNames ? `${label} (${bucket.localities.join(", ")})` : label;
+  });
+}
+
+function localitiesFewest(
+  stats: QuickStatsPayload,
+  field: "candidates" | "seats"
+): { value: number; names: string[] } | null {
+  if (!stats.localities.length) {
+    return null;
+  }
+  const value = Math.min(...stats.localities.map((locality) => locality[field]));
+  const names = stats.localities
+    .filter((locality) => locality[field] === value)
+    .map((locality) => locality.name_vi)
+    .sort((a, b) => a.localeCompare(b, "vi"));
+  return { value, names };
+}
+
 function StatList({ items }: { items: string[] }) {
   return (
     <ol className="space-y-2 text-sm text-[var(--ink)]">
@@ -178,7 +239,7 @@ export default async function QuickStatsPage({
     notFound();
   }
 
-  const stats = quickStats[cycle as keyof typeof quickStats];
+  const stats = await readQuickStats(cycle);
 
   if (!stats) {
     return (
@@ -199,6 +260,42 @@ export default async function QuickStatsPage({
     );
   }
 
+  const kpis = [
+    { label: "Total candidates", value: formatNumber(stats.totals.candidates), sublabel: "Roster" },
+    { label: "Total winners", value: formatNumber(stats.totals.winners), sublabel: "Results (won)" },
+    { label: "Constituencies", value: formatNumber(stats.totals.constituencies) },
+    { label: "Localities", value: formatNumber(stats.totals.localities) },
+    { label: "Avg candidates/const.", value: formatFixed(stats.totals.candidates_per_constituency) },
+    {
+      label: "Avg age",
+      value: `${formatFixed(stats.age.candidates.average)} / ${formatFixed(stats.age.winners.average)}`,
+      sublabel: "Candidates / winners",
+    },
+    {
+      label: "Turnout",
+      value: stats.turnout ? `${formatFixed(stats.turnout.turnout_percent)}%` : "—",
+      sublabel: stats.turnout
+        ? `${formatNumber(stats.turnout.total_votes_cast)} of ${formatNumber(stats.turnout.total_voters)} voters`
+        : undefined,
+    },
+    {
+      label: "Previous NA delegates",
+      value: `${formatNumber(stats.incumbency.na_delegates)} / ${formatNumber(stats.incumbency.winners_na_delegates)}`,
+      sublabel: "Candidates / winners",
+    },
+  ];
+  const mostCandidates = [...stats.localities]
+    .sort((a, b) => b.candidates - a.candidates || a.name_vi.localeCompare(b.name_vi, "vi"))
+    .slice(0, 5)
+    .map((locality) => `${locality.name_vi} ${locality.candidates}`);
+  const fewestCandidates = localitiesFewest(stats, "candidates");
+  const fewestSeats = localitiesFewest(stats, "seats");
+  const formatMargin = (margin: Margin, field: "votes_gap" | "percent_gap") =>
+    `${formatUnit(margin.locality_vi, margin.unit_number)} — ${
+      field === "votes_gap" ? formatNumber(margin.votes_gap) : `${formatFixed(margin.percent_gap)} pp`
+    }`;
+  const { kinh, non_kinh: nonKinh } = stats.demographics.ethnicity_split;
+
   return (
     <div className="grid gap-8 stagger">
       <CycleNav cycle={cycle} />
@@ -208,17 +305,17 @@ export default async function QuickStatsPage({
           Quick stats
         </p>
         <h1 className="mt-3 text-3xl font-semibold text-[var(--ink)]">
-          NA15 (2021) quick stats
+          {stats.cycle.name} ({stats.cycle.year}) quick stats
         </h1>
         <p className="mt-3 max-w-3xl text-sm text-[var(--ink-muted)]">
           Snapshot of verified, source-linked metrics from local data. Values are
-          hard-coded from the curated quick stats list.
+          computed from the staging database on every data build.
         </p>
         <p className="mt-2 text-xs text-[var(--ink-muted)]">
           All figures are descriptive and non-evaluative.
         </p>
         <div className="mt-6 grid gap-4 sm:grid-cols-2 lg:grid-cols-3">
-          {stats.kpis.map((kpi) => (
+          {kpis.map((kpi) => (
             <div
               key={kpi.label}
               className="rounded-2xl border-2 border-[var(--border)] bg-[var(--surface)] p-5"
@@ -250,7 +347,7 @@ export default async function QuickStatsPage({
               Seat distribution
             </p>
             <div className="mt-2">
-              <StatList items={stats.seatDistributionFull} />
+              <StatList items={seatDistribution(stats)} />
             </div>
           </div>
         </div>
@@ -261,18 +358,18 @@ export default async function QuickStatsPage({
               <p className="text-xs uppercase tracking-[0.2em] text-[var(--ink-muted)]">
                 Candidates
               </p>
-              <p className="mt-2 font-semibold">Avg {stats.ageSummary.candidates.average}</p>
+              <p className="mt-2 font-semibold">Avg {formatFixed(stats.age.candidates.average)}</p>
               <p className="text-xs text-[var(--ink-muted)]">
-                Median {stats.ageSummary.candidates.median}
+                Median {formatNumber(stats.age.candidates.median)}
               </p>
             </div>
             <div className="rounded-2xl border-2 border-[var(--border)] bg-[var(--surface-muted)] p-4">
               <p className="text-xs uppercase tracking-[0.2em] text-[var(--ink-muted)]">
                 Winners
               </p>
-              <p className="mt-2 font-semibold">Avg {stats.ageSummary.winners.average}</p>
+              <p className="mt-2 font-semibold">Avg {formatFixed(stats.age.winners.average)}</p>
               <p className="text-xs text-[var(--ink-muted)]">
-                Median {stats.ageSummary.winners.median}
+                Median {formatNumber(stats.age.winners.median)}
               </p>
             </div>
           </div>
@@ -285,7 +382,7 @@ export default async function QuickStatsPage({
             Oldest candidates
           </h2>
           <div className="mt-4">
-            <StatList items={stats.ageSummary.oldestCandidates} />
+            <StatList items={stats.age.candidates.oldest.map(formatAge)} />
           </div>
         </div>
         <div className="rounded-2xl border-2 border-[var(--border)] bg-[var(--surface)] p-6">
@@ -293,7 +390,7 @@ export default async function QuickStatsPage({
             Youngest candidates
           </h2>
           <div className="mt-4">
-            <StatList items={stats.ageSummary.youngestCandidates} />
+            <StatList items={stats.age.candidates.youngest.map(formatAge)} />
           </div>
         </div>
       </section>
@@ -304,7 +401,7 @@ export default async function QuickStatsPage({
             Oldest winners
           </h2>
           <div className="mt-4">
-            <StatList items={stats.ageSummary.oldestWinners} />
+            <StatList items={stats.age.winners.oldest.map(formatAge)} />
           </div>
         </div>
         <div className="rounded-2xl border-2 border-[var(--border)] bg-[var(--surface)] p-6">
@@ -312,7 +409,7 @@ export default async function QuickStatsPage({
             Youngest winners
           </h2>
           <div className="mt-4">
-            <StatList items={stats.ageSummary.youngestWinners} />
+            <StatList items={stats.age.winners.youngest.map(formatAge)} />
           </div>
         </div>
       </section>
@@ -324,7 +421,7 @@ export default async function QuickStatsPage({
             Highest vote counts in results.
           </p>
           <div className="mt-4">
-            <StatList items={stats.topVotes} />
+            <StatList items={stats.votes.top_votes.map(formatVotes)} />
           </div>
         </div>
         <div className="rounded-2xl border-2 border-[var(--border)] bg-[var(--surface)] p-6">
@@ -333,7 +430,7 @@ export default async function QuickStatsPage({
             Highest vote share in results.
           </p>
           <div className="mt-4">
-            <StatList items={stats.topPercent} />
+            <StatList items={stats.votes.top_percent.map(formatShare)} />
           </div>
         </div>
       </section>
@@ -347,13 +444,13 @@ export default async function QuickStatsPage({
             Bottom 5 by vote count (status: won).
           </p>
           <div className="mt-4">
-            <StatList items={stats.bottomVotesWinners} />
+            <StatList items={stats.votes.bottom_votes_winners.map(formatVotes)} />
           </div>
           <p className="mt-6 text-xs text-[var(--ink-muted)]">
             Bottom 5 by vote percentage (status: won).
           </p>
           <div className="mt-3">
-            <StatList items={stats.bottomPercentWinners} />
+            <StatList items={stats.votes.bottom_percent_winners.map(formatShare)} />
           </div>
         </div>
         <div className="rounded-2xl border-2 border-[var(--border)] bg-[var(--surface)] p-6">
@@ -364,7 +461,7 @@ export default async function QuickStatsPage({
                 Largest gaps (votes)
               </p>
               <div className="mt-3">
-                <StatList items={stats.gapVotesLargest} />
+                <StatList items={stats.margins.votes_largest.map((margin) => formatMargin(margin, "votes_gap"))} />
               </div>
             </div>
             <div>
@@ -372,7 +469,7 @@ export default async function QuickStatsPage({
                 Smallest gaps (votes)
               </p>
               <div className="mt-3">
-                <StatList items={stats.gapVotesSmallest} />
+                <StatList items={stats.margins.votes_smallest.map((margin) => formatMargin(margin, "votes_gap"))} />
               </div>
             </div>
             <div>
@@ -380,7 +477,7 @@ export default async function QuickStatsPage({
                 Largest gaps (percent)
               </p>
               <div className="mt-3">
-                <StatList items={stats.gapPercentLargest} />
+                <StatList items={stats.margins.percent_largest.map((margin) => formatMargin(margin, "percent_gap"))} />
               </div>
             </div>
             <div>
@@ -388,7 +485,7 @@ export default async function QuickStatsPage({
                 Smallest gaps (percent)
               </p>
               <div className="mt-3">
-                <StatList items={stats.gapPercentSmallest} />
+                <StatList items={stats.margins.percent_smallest.map((margin) => formatMargin(margin, "percent_gap"))} />
               </div>
             </div>
           </div>
@@ -401,7 +498,7 @@ export default async function QuickStatsPage({
             Localities with most candidates
           </h2>
           <div className="mt-4">
-            <StatList items={stats.localitiesMostCandidates} />
+            <StatList items={mostCandidates} />
           </div>
         </div>
         <div className="rounded-2xl border-2 border-[var(--border)] bg-[var(--surface)] p-6">
@@ -409,7 +506,9 @@ export default async function QuickStatsPage({
             Localities with fewest candidates
           </h2>
           <p className="mt-3 text-sm text-[var(--ink)]">
-            {stats.localitiesFewestCandidates}
+            {fewestCandidates
+              ? `${fewestCandidates.value} each (${fewestCandidates.names.length} localities): ${fewestCandidates.names.join("; ")}.`
+              : "—"}
           </p>
         </div>
       </section>
@@ -419,30 +518,32 @@ export default async function QuickStatsPage({
           <h2 className="text-lg font-semibold text-[var(--ink)]">
             Localities with fewest seats
           </h2>
-          <p className="mt-3 text-sm text-[var(--ink)]">{stats.localitiesFewestSeats}</p>
+          <p className="mt-3 text-sm text-[var(--ink)]">{fewestSeats
+              ? `${fewestSeats.value} seats each (${fewestSeats.names.length} localities): ${fewestSeats.names.join("; ")}.`
+              : "—"}</p>
         </div>
       </section>
 
       <section className="grid gap-6 lg:grid-cols-3">
         <div className="rounded-2xl border-2 border-[var(--border)] bg-[var(--surface)] p-6">
           <h2 className="text-lg font-semibold text-[var(--ink)]">Gender</h2>
-          <p className="mt-3 text-sm text-[var(--ink)]">{stats.demographics.gender}</p>
+          <p className="mt-3 text-sm text-[var(--ink)]">{formatCounts(stats.demographics.gender, false)}</p>
         </div>
         <div className="rounded-2xl border-2 border-[var(--border)] bg-[var(--surface)] p-6">
           <h2 className="text-lg font-semibold text-[var(--ink)]">Ethnicity</h2>
           <p className="mt-3 text-sm text-[var(--ink)]">
-            {stats.demographics.ethnicitySplit}
+            {`Kinh ${kinh.count} (${formatFixed(kinh.percent)}%); non-Kinh ${nonKinh.count} (${formatFixed(nonKinh.percent)}%).`}
           </p>
           <details className="mt-4 text-xs text-[var(--ink-muted)]">
             <summary className="cursor-pointer">Full ethnicity list</summary>
             <p className="mt-2 text-sm text-[var(--ink)]">
-              {stats.demographics.ethnicityCounts}
+              {formatCounts(stats.demographics.ethnicity, false)}
             </p>
           </details>
         </div>
         <div className="rounded-2xl border-2 border-[var(--border)] bg-[var(--surface)] p-6">
           <h2 className="text-lg font-semibold text-[var(--ink)]">Religion</h2>
-          <p className="mt-3 text-sm text-[var(--ink)]">{stats.demographics.religion}</p>
+          <p className="mt-3 text-sm text-[var(--ink)]">{formatCounts(stats.demographics.religion)}</p>
           <p className="mt-2 text-xs text-[var(--ink-muted)]">
             Note: raw values include minor spelling variants and one empty entry.
           </p>
@@ -452,24 +553,28 @@ export default async function QuickStatsPage({
       <section className="grid gap-6 lg:grid-cols-3">
         <div className="rounded-2xl border-2 border-[var(--border)] bg-[var(--surface)] p-6">
           <h2 className="text-lg font-semibold text-[var(--ink)]">General education</h2>
-          <p className="mt-3 text-sm text-[var(--ink)]">{stats.education.general}</p>
+          <p className="mt-3 text-sm text-[var(--ink)]">{formatCounts(stats.education.general)}</p>
         </div>
         <div className="rounded-2xl border-2 border-[var(--border)] bg-[var(--surface)] p-6">
           <h2 className="text-lg font-semibold text-[var(--ink)]">Political theory</h2>
-          <p className="mt-3 text-sm text-[var(--ink)]">{stats.education.political}</p>
+          <p className="mt-3 text-sm text-[var(--ink)]">{formatCounts(stats.education.political)}</p>
         </div>
         <div className="rounded-2xl border-2 border-[var(--border)] bg-[var(--surface)] p-6">
           <h2 className="text-lg font-semibold text-[var(--ink)]">Academic rank</h2>
           <p className="mt-3 text-sm text-[var(--ink)]">
-            Mentions: {stats.education.academicMentions}
+            Mentions:{" "}
+            {stats.education.academic_mentions
+              .map((mention) => `${mention.label} ${mention.count}`)
+              .join("; ")}
+            .
           </p>
           <p className="mt-2 text-xs text-[var(--ink-muted)]">
-            {stats.education.academicMissing}
+            {stats.education.academic_missing} candidates without `education_academic_rank`.
           </p>
           <details className="mt-4 text-xs text-[var(--ink-muted)]">
             <summary className="cursor-pointer">Grouped counts</summary>
             <p className="mt-2 text-sm text-[var(--ink)]">
-              {stats.education.academicFolded}
+              {formatCounts(stats.education.academic_rank, false)}
             </p>
           </details>
         </div>
@@ -477,11 +582,29 @@ export default async function QuickStatsPage({
 
       <section className="rounded-2xl border-2 border-[var(--border)] bg-[var(--surface)] p-6">
         <h2 className="text-lg font-semibold text-[var(--ink)]">Irregularities</h2>
-        <p className="mt-3 text-sm text-[var(--ink)]">{stats.irregularities.notConfirmed}</p>
+        <p className="mt-3 text-sm text-[var(--ink)]">{stats.irregularities.not_confirmed.length
+            ? stats.irregularities.not_confirmed
+                .map(
+                  (item) =>
+                    `${item.name_vi}, ${formatUnit(item.locality_vi, item.unit_number)} — status ${item.status}${
+                      item.notes ? `; notes “${item.notes}”` : ""
+                    }.`
+                )
+                .join(" ")
+            : "No unconfirmed winners recorded."}
+        </p>
         <details className="mt-4 text-xs text-[var(--ink-muted)]">
-          <summary className="cursor-pointer">Constituency mismatches (15)</summary>
+          <summary className="cursor-pointer">Constituency mismatches ({stats.irregularities.constituency_mismatch.length})</summary>
           <p className="mt-2 text-sm text-[var(--ink)]">
-            {stats.irregularities.constituencyMismatch}
+            {stats.irregularities.constituency_mismatch
+              .map(
+                (item) =>
+                  `${item.name_vi} (${item.locality_vi ?? "Unknown locality"} unit ${
+                    item.list_unit_number ?? "—"
+                  } → unit ${item.results_unit_number ?? "—"})`
+              )
+              .join("; ")}
+            .
           </p>
         </details>
       </section>
@@ -492,7 +615,11 @@ export default async function QuickStatsPage({
             Methodology & data notes
           </summary>
           <div className="mt-3 space-y-2 text-sm text-[var(--ink)]">
-            <p>Sources: local data exports (`staging.db` and `results.json`).</p>
+            <p>
+              Sources: `quick_stats.json`, computed by `export-json.py` from `staging.db`
+              (generated {stats.generated_at}).
+            </p>
+            <p>Ages are in whole years as of election day ({stats.age_reference_date ?? "unknown"}).</p>
             <p>
               Winner/loser gaps are calculated as the lowest winning candidate minus the
               highest losing candidate in each constituency.
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""Benchmarks the streaming CEMA bulletin parser against the regex parser.
+
+Builds a synthetic bulletin from the committed NA15 district results,
+repeated ``--scale`` times (province numbers keep counting up), and parses it
+two ways:
+
+- reference: the original whole-document ``re.findall`` over ``<p>`` tags,
+  ``strip_tags`` per paragraph, then the list-based district parser;
+- streaming: ``cema_stream`` fed the encoded page in ``--chunk-size`` byte
+  chunks, as it would arrive from the network.
+
+Paragraphs, records and skipped lines must be identical; at scale 1 the
+records must also equal ``results/cema-district-results.json``. Prints the
+best wall time over ``--repeat`` runs and the peak traced memory of a run
+that keeps only the records, and exits 1 on any mismatch.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import html as html_lib
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(BENCH_DIR))
+RESULTS_DIR = os.path.join(REPO_ROOT, "data", "na15-2021", "results")
+RESULTS_JSON = os.path.join(RESULTS_DIR, "cema-district-results.json")
+sys.path.insert(0, RESULTS_DIR)
+
+from cema_stream import DistrictResultsParser, iter_paragraphs  # noqa: E402
+
+DEFAULT_SCALE = 100
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+PAGE_HEAD = """<!DOCTYPE html>
+<html lang="vi"><head><meta charset="utf-8">
+<title>Công bố danh sách 499 người trúng cử đại biểu Quốc hội khóa XV</title>
+<script>var pages = "<p>not a paragraph</p>";</script>
+</head><body>
+<div class="header"><h1>Công bố danh sách 499 người trúng cử đại biểu Quốc hội khóa XV</h1>
+<span class="date">11/06/2021</span></div>
+<div class="content">
+<p style="text-align: justify;">Chiều 10/6, tại Nhà Quốc hội, Hội đồng Bầu cử quốc gia tổ chức họp báo công bố Nghị quyết về kết quả bầu cử và danh sách những người trúng cử đại biểu Quốc hội khóa XV.</p>
+<p><strong>I. KẾT QUẢ BẦU CỬ CHUNG</strong></p>
+<p>- Tổng số đại biểu Quốc hội được bầu: 500</p>
+<p>- Tổng số cử tri trong cả nước: 69.523.133</p>
+<p>&nbsp;</p>
+<pre>1) Ông Trước Tỉnh được 1 phiếu</p>
+<p><strong>II. KẾT QUẢ BẦU CỬ ĐẠI BIỂU QUỐC HỘI Ở CÁC TỈNH, THÀNH PHỐ TRỰC THUỘC TRUNG ƯƠNG</strong></p>
+<p>1) Ông Chưa Có Tỉnh được 2 phiếu</p>
+"""
+
+PAGE_TAIL = """<p><strong>III. DANH SÁCH NHỮNG NGƯỜI TRÚNG CỬ</strong></p>
+<p>Hội đồng Bầu cử quốc gia công bố danh sách người trúng cử.</p>
+<p>1) Ông Sau Mục Ba được 3 phiếu</p>
+</div>
+<div class="footer"><p class="author">CEMA</p><svg><path d="M0 0"/></svg></div>
+</body></html>
+"""
+
+
+def candidate_line(record: dict) -> str:
+    text = f"{record['order']})&nbsp;{html_lib.escape(record['candidate_name'], quote=False)}"
+    if record["votes_raw"] is not None:
+        text += f" được {record['votes_raw']} phiếu"
+    if record["percent_raw"] is not None:
+        text += f", đạt tỷ lệ {record['percent_raw']}% số phiếu hợp lệ"
+    return text + "."
+
+
+def synthetic_bulletin(records: list[dict], scale: int) -> str:
+    """The committed records rendered as bulletin HTML, ``scale`` times over."""
+    parts = [PAGE_HEAD]
+    provinces = list(dict.fromkeys(record["province"] for record in records))
+    for copy in range(scale):
+        province = unit = None
+        for record in records:
+            if record["province"] != province:
+                province = record["province"]
+                unit = None
+                number = copy * len(provinces) + provinces.index(province) + 1
+                parts.append(f'<p style="text-align: justify;"><strong>{number} - {province}</strong></p>\n')
+            if record["unit_number"] != unit:
+                unit = record["unit_number"]
+                parts.append(
+                    f"<p>Đơn vị bầu cử Số {unit}: "
+                    f"<span>{html_lib.escape(record['unit_description'] or '', quote=False)}</span></p>\n"
+                    "<p><em>Số phiếu bầu cho mỗi người ứng cử:</em></p>\n"
+                )
+            parts.append(f"<P>{candidate_line(record)}</P>\n")
+    parts.append(PAGE_TAIL)
+    return "".join(parts)
+
+
+# The regex parser that cema_stream replaced, kept as the parity reference.
+# Its section-end pattern had doubled backslashes and never matched; it is
+# fixed here as in cema_stream, so the line after "III." above is not a record.
+def reference_strip_tags(text: str) -> str:
+    text = re.sub(r"<[^>]+>", " ", text)
+    text = html_lib.unescape(text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+def reference_paragraphs(html: str) -> list[str]:
+    paragraphs_html = re.findall(r"<p[^>]*>(.*?)</p>", html, re.S | re.I)
+    paragraphs = [reference_strip_tags(p) for p in paragraphs_html]
+    return [p for p in paragraphs if p]
+
+
+def reference_district_results(paragraphs: list[str]) -> dict:
+    header_index = None
+    for i, line in enumerate(paragraphs):
+        if "II." in line and "KẾT QUẢ" in line and "TỈNH" in line:
+            header_index = i
+            break
+
+    records = []
+    current_province = None
+    current_unit_number = None
+    current_unit_description = None
+    skipped = []
+
+    if header_index is None:
+        return {
+            "records": records,
+            "skipped": ["Missing II. section header"],
+        }
+
+    for line in paragraphs[header_index + 1 :]:
+        if re.match(r"^[IVXL]+\.\s", line):
+            break
+
+        province_match = re.match(r"^(\d+)\s*-\s*(.+)$", line)
+        if province_match:
+            current_province = province_match.group(2).strip()
+            current_unit_number = None
+            current_unit_description = None
+            continue
+
+        unit_match = re.match(
+            r"^Đơn vị bầu cử\s*Số\s*(\d+)\s*:\s*(.*)$",
+            line,
+            re.IGNORECASE,
+        )
+        if unit_match:
+            current_unit_number = int(unit_match.group(1))
+            current_unit_description = unit_match.group(2).strip()
+            continue
+
+        if line.startswith("Số phiếu bầu cho mỗi người ứng cử"):
+            continue
+
+        candidate_match = re.match(r"^(\d+)\)\s+(.*)$", line)
+        if candidate_match and current_province and current_unit_number is not None:
+            order = int(candidate_match.group(1))
+            remainder = candidate_match.group(2).strip()
+            name = remainder
+            votes = None
+            percent = None
+            votes_raw = None
+            percent_raw = None
+
+            name_match = re.match(r"^(.*?)\s+được\s+([\d\.]+)\s+phiếu", remainder, re.I)
+            if name_match:
+                name = name_match.group(1).strip()
+                votes_raw = name_match.group(2)
+                votes = int(votes_raw.replace(".", "")) if votes_raw else None
+
+            percent_match = re.search(r"tỷ\s+lệ\s+([\d,]+)%", remainder, re.I)
+            if percent_match:
+                percent_raw = percent_match.group(1)
+                try:
+                    percent = float(percent_raw.replace(",", "."))
+                except ValueError:
+                    percent = None
+
+            records.append(
+                {
+                    "province": current_province,
+                    "unit_number": current_unit_number,
+                    "unit_description": current_unit_description,
+                    "order": order,
+                    "candidate_name": name,
+                    "votes": votes,
+                    "votes_raw": votes_raw,
+                    "percent": percent,
+                    "percent_raw": percent_raw,
+                }
+            )
+            continue
+
+        if candidate_match and not current_province:
+            skipped.append(line)
+            continue
+
+    return {
+        "records": records,
+        "skipped": skipped,
+    }
+
+
+def run_reference(page: bytes) -> tuple[list[str], dict]:
+    paragraphs = reference_paragraphs(page.decode("utf-8", errors="replace"))
+    return paragraphs, reference_district_results(paragraphs)
+
+
+def run_streaming(page: bytes, chunk_size: int, keep_paragraphs: bool = True) -> tuple[list[str], dict]:
+    chunks = (page[offset : offset + chunk_size] for offset in range(0, len(page), chunk_size))
+    paragraphs: list[str] = []
+    source = iter_paragraphs(chunks)
+    if keep_paragraphs:
+        source = (paragraphs.append(paragraph) or paragraph for paragraph in source)
+    parser = DistrictResultsParser()
+    records = []
+    for paragraph in source:
+        record = parser.feed(paragraph)
+        if record is not None:
+            records.append(record)
+    parser.close()
+    return paragraphs, {"records": records, "skipped": parser.skipped}
+
+
+def best_time(repeat: int, func, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def peak_memory(func, *args) -> int:
+    gc.collect()
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the streaming CEMA bulletin parser.")
+    parser.add_argument("--scale", type=int, default=DEFAULT_SCALE, help=f"Copies of NA15 (default: {DEFAULT_SCALE}).")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Bytes per streamed chunk (default: {DEFAULT_CHUNK_SIZE}).",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per parser; the best is shown.")
+    args = parser.parse_args()
+
+    with open(RESULTS_JSON, "r", encoding="utf-8") as fh:
+        records = json.load(fh)["records"]
+    page = synthetic_bulletin(records, args.scale).encode("utf-8")
+    print(f"x{args.scale}: {len(page) / (1 << 20):.1f} MiB, {len(records) * args.scale} candidate lines")
+
+    streamed = run_streaming(page, args.chunk_size)
+    reference = run_reference(page)
+    # Memory counts what a caller keeping only the records holds: the
+    # reference needs the decoded page and every paragraph at once.
+    for label, func, func_args in (
+        ("streaming", run_streaming, (page, args.chunk_size, False)),
+        ("reference", run_reference, (page,)),
+    ):
+        seconds = best_time(args.repeat, func, *func_args)
+        peak = peak_memory(func, *func_args)
+        print(f"  {label}: {seconds:.3f}s (best of {args.repeat}), peak {peak / (1 << 20):.1f} MiB traced")
+
+    problems = []
+    if streamed[0] != reference[0]:
+        problems.append("paragraphs differ")
+    if streamed[1]["records"] != reference[1]["records"]:
+        problems.append("records differ")
+    if streamed[1]["skipped"] != reference[1]["skipped"]:
+        problems.append("skipped lines differ")
+    if args.scale == 1 and streamed[1]["records"] != records:
+        problems.append("records differ from cema-district-results.json")
+    if problems:
+        print("MISMATCH: " + ", ".join(problems))
+        sys.exit(1)
+    print(
+        f"  identical: {len(streamed[0])} paragraphs, {len(streamed[1]['records'])} records, "
+        f"{len(streamed[1]['skipped'])} skipped"
+    )
+
+
+if __name__ == "__main__":
+    main()
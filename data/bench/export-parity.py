@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Checks that both export engines write identical files.
+
+Exports the same staging database with ``--engine python`` and ``--engine
+sql`` into two throwaway sandboxes, once per export mode, and compares every
+file with ``generated_at`` values left out. Compressed sizes in the export
+manifest are skipped too, since they depend on ``generated_at``. Uses the
+repo's data/staging.db unless ``--scale`` asks for synthetic data.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from synthetic_data import generate
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(BENCH_DIR))
+PIPELINE_DIR = os.path.join(REPO_ROOT, "data", "na15-2021")
+EXPORT_SCRIPT = "data/na15-2021/export-json.py"
+ENGINES = ("python", "sql")
+
+MODES = [
+    [],
+    ["--compact"],
+    ["--schema-version", "2"],
+    ["--bundle-details", "constituency"],
+]
+
+GENERATED_AT_RE = re.compile(rb'"generated_at": ?"[^"]*"')
+
+
+def prepare_sandbox(root: str, staging_db: str | None = None) -> None:
+    target = os.path.join(root, "data", "na15-2021")
+    os.makedirs(target, exist_ok=True)
+    for name in os.listdir(PIPELINE_DIR):
+        if name.endswith(".py"):
+            shutil.copy(os.path.join(PIPELINE_DIR, name), target)
+    if staging_db:
+        shutil.copy(staging_db, os.path.join(root, "data", "staging.db"))
+
+
+def comparable(path: str) -> bytes:
+    with open(path, "rb") as fh:
+        data = fh.read()
+    if os.path.basename(path) == "export_manifest.json":
+        manifest = json.loads(data)
+        manifest.pop("totals", None)
+        for entry in manifest["files"]:
+            entry.pop("gz", None)
+            entry.pop("br", None)
+        return json.dumps(manifest, sort_keys=True).encode("utf-8")
+    if path.endswith((".gz", ".br")):
+        return b""
+    return GENERATED_AT_RE.sub(b'"generated_at":""', data)
+
+
+def output_files(root: str) -> dict[str, str]:
+    output_root = os.path.join(root, "public", "data")
+    files = {}
+    for dirpath, _, filenames in os.walk(output_root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            files[os.path.relpath(path, output_root)] = path
+    return files
+
+
+def compare(left: str, right: str) -> list[str]:
+    left_files = output_files(left)
+    right_files = output_files(right)
+    problems = [f"only in {ENGINES[0]}: {name}" for name in sorted(left_files.keys() - right_files.keys())]
+    problems += [f"only in {ENGINES[1]}: {name}" for name in sorted(right_files.keys() - left_files.keys())]
+    for name in sorted(left_files.keys() & right_files.keys()):
+        if comparable(left_files[name]) != comparable(right_files[name]):
+            problems.append(f"differs: {name}")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare export output of the python and sql engines.")
+    parser.add_argument("--scale", type=int, help="Use synthetic data at this scale instead of data/staging.db.")
+    parser.add_argument("--seed", type=int, default=2021)
+    parser.add_argument("--keep", action="store_true", help="Keep sandbox directories for inspection.")
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix="export-parity-")
+    try:
+        staging_db = os.path.join(REPO_ROOT, "data", "staging.db")
+        if args.scale:
+            source = os.path.join(work, "source")
+            counts = generate(source, args.scale, args.seed)
+            prepare_sandbox(source)
+            subprocess.run(
+                [sys.executable, "data/na15-2021/build-staging-db.py"],
+                cwd=source,
+                check=True,
+                capture_output=True,
+            )
+            staging_db = os.path.join(source, "data", "staging.db")
+            print(f"x{args.scale}: {counts['candidates']} candidates, {counts['results']} results")
+
+        failed = False
+        for mode in MODES:
+            roots = []
+            for engine in ENGINES:
+                root = os.path.join(work, engine)
+                shutil.rmtree(root, ignore_errors=True)
+                prepare_sandbox(root, staging_db)
+                subprocess.run(
+                    [sys.executable, EXPORT_SCRIPT, "--engine", engine, *mode],
+                    cwd=root,
+                    check=True,
+                    capture_output=True,
+                )
+                roots.append(root)
+            problems = compare(*roots)
+            label = " ".join(mode) or "default"
+            if problems:
+                failed = True
+                print(f"{label}: {len(problems)} mismatches")
+                for problem in problems[:20]:
+                    print(f"  {problem}")
+            else:
+                print(f"{label}: {len(output_files(roots[0]))} files identical")
+    finally:
+        if args.keep:
+            print(f"Kept sandboxes in {work}")
+        else:
+            shutil.rmtree(work, ignore_errors=True)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
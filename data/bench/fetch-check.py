@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Checks the research fetch cache and source registry against a local server.
+
+A stand-in ``http.server`` on 127.0.0.1 plays the Wayback Machine:
+
+- ``/page`` serves a body with an ETag and answers ``304`` to a matching
+  ``If-None-Match``;
+- ``/flaky/<id>`` answers ``503`` (``Retry-After: 0``) a set number of times
+  before ``200``;
+- ``/slow/<id>`` holds each request briefly and records how many were in
+  flight per ``Host`` header;
+- anything else is ``404``.
+
+``http_cache.FetchCache`` is run in each mode (cache, offline, revalidate,
+refresh), through the ``304`` path and through retries with backoff, and
+``source_fetcher.SourceRegistry`` is run on slow sources over two host names
+plus one missing page, to check the per-host limit and that a failed source
+only fails its own report. Every cache lives in a temporary directory.
+Prints one line per check and exits 1 on any failure.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(BENCH_DIR))
+RESULTS_DIR = os.path.join(REPO_ROOT, "data", "na15-2021", "results")
+sys.path.insert(0, RESULTS_DIR)
+
+from http_cache import CacheMiss, FetchCache  # noqa: E402
+from source_fetcher import SourceRegistry  # noqa: E402
+
+SLOW_SECONDS = 0.2
+
+
+class StandInState:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.page_body = b"<p>first</p>"
+        self.page_etag = '"v1"'
+        self.flaky_failures: dict[str, int] = {}
+        self.requests: dict[str, int] = {}
+        self.conditional: list[str | None] = []
+        self.in_flight: dict[str, int] = {}
+        self.max_in_flight: dict[str, int] = {}
+
+    def count(self, path: str) -> None:
+        with self.lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    state: StandInState
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def send_body(self, status: int, body: bytes, headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        state = self.state
+        state.count(self.path)
+        if self.path == "/page":
+            with state.lock:
+                body, etag = state.page_body, state.page_etag
+                state.conditional.append(self.headers.get("If-None-Match"))
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_body(200, body, {"ETag": etag})
+        elif self.path.startswith("/flaky/"):
+            with state.lock:
+                remaining = state.flaky_failures.get(self.path, 0)
+                state.flaky_failures[self.path] = remaining - 1
+            if remaining > 0:
+                self.send_body(503, b"busy", {"Retry-After": "0"})
+            else:
+                self.send_body(200, b"<p>recovered</p>")
+        elif self.path.startswith("/slow/"):
+            host = self.headers.get("Host", "").split(":")[0]
+            with state.lock:
+                state.in_flight[host] = state.in_flight.get(host, 0) + 1
+                state.max_in_flight[host] = max(state.max_in_flight.get(host, 0), state.in_flight[host])
+            time.sleep(SLOW_SECONDS)
+            with state.lock:
+                state.in_flight[host] -= 1
+            self.send_body(200, f"<p>{self.path}</p>".encode("utf-8"))
+        else:
+            self.send_body(404, b"missing")
+
+
+class Checks:
+    def __init__(self) -> None:
+        self.failures = 0
+
+    def expect(self, label: str, condition: bool, detail: str = "") -> None:
+        print(f"  {'ok' if condition else 'FAIL'}: {label}{f' ({detail})' if detail and not condition else ''}")
+        if not condition:
+            self.failures += 1
+
+
+def check_modes(base: str, state: StandInState, cache_dir: str, checks: Checks) -> None:
+    url = f"{base}/page"
+
+    print("cache mode")
+    cache = FetchCache(cache_dir, "cache", backoff=0)
+    first = cache.fetch_response(url)
+    second = cache.fetch_response(url)
+    checks.expect("miss is fetched", first.outcome == "fetched" and first.requests == 1, first.outcome)
+    checks.expect("second read is a hit without a request", second.outcome == "hit" and second.requests == 0)
+    checks.expect("server saw one request", state.requests.get("/page") == 1, str(state.requests.get("/page")))
+    checks.expect("hit returns the stored body", second.body == b"<p>first</p>")
+
+    print("offline mode")
+    offline = FetchCache(cache_dir, "offline")
+    checks.expect("cached URL is served", offline.fetch_response(url).outcome == "hit")
+    try:
+        offline.fetch_response(f"{base}/never-fetched")
+        missed = False
+    except CacheMiss:
+        missed = True
+    checks.expect("miss raises CacheMiss", missed)
+    checks.expect("no request is sent", "/never-fetched" not in state.requests)
+
+    print("revalidate mode")
+    revalidate = FetchCache(cache_dir, "revalidate", backoff=0)
+    response = revalidate.fetch_response(url)
+    checks.expect("sends If-None-Match", state.conditional[-1] == '"v1"', str(state.conditional[-1]))
+    checks.expect("304 keeps the cached body", response.outcome == "not_modified" and response.body == b"<p>first</p>")
+    with state.lock:
+        state.page_body, state.page_etag = b"<p>second</p>", '"v2"'
+    response = revalidate.fetch_response(url)
+    checks.expect("changed page is fetched", response.outcome == "fetched" and response.body == b"<p>second</p>")
+    checks.expect("cache now holds the new body", FetchCache(cache_dir, "offline").fetch(url) == b"<p>second</p>")
+
+    print("refresh mode")
+    before = state.requests["/page"]
+    response = FetchCache(cache_dir, "refresh", backoff=0).fetch_response(url)
+    checks.expect("cached URL is fetched again", response.outcome == "fetched" and state.requests["/page"] == before + 1)
+    checks.expect("refresh sends no validators", state.conditional[-1] is None, str(state.conditional[-1]))
+
+
+def check_retries(base: str, state: StandInState, cache_dir: str, checks: Checks) -> None:
+    print("retries")
+    state.flaky_failures["/flaky/a"] = 2
+    cache = FetchCache(cache_dir, "cache", retries=3, backoff=0.01)
+    response = cache.fetch_response(f"{base}/flaky/a")
+    checks.expect("503s are retried until 200", response.outcome == "fetched" and response.body == b"<p>recovered</p>")
+    checks.expect("three attempts were made", response.requests == 3 and state.requests["/flaky/a"] == 3,
+                  str(response.requests))
+
+    state.flaky_failures["/flaky/b"] = 10
+    try:
+        FetchCache(cache_dir, "cache", retries=2, backoff=0.01).fetch_response(f"{base}/flaky/b")
+        status = None
+    except HTTPError as exc:
+        status = exc.code
+    checks.expect("gives up with the last error", status == 503, str(status))
+    checks.expect("retries plus one attempts", state.requests["/flaky/b"] == 3, str(state.requests["/flaky/b"]))
+
+    try:
+        FetchCache(cache_dir, "cache", retries=3, backoff=0.01).fetch_response(f"{base}/gone")
+        status = None
+    except HTTPError as exc:
+        status = exc.code
+    checks.expect("404 is not retried", status == 404 and state.requests["/gone"] == 1)
+
+
+def check_registry(port: int, state: StandInState, cache_dir: str, per_host: int, checks: Checks) -> None:
+    print(f"source registry (per host {per_host})")
+    registry = SourceRegistry()
+    hosts = ("127.0.0.1", "localhost")
+    for host in hosts:
+        for index in range(per_host * 3):
+            registry.register(f"{host}-{index}", f"http://{host}:{port}/slow/{host}-{index}", lambda html: {"html": html})
+    registry.register("missing", f"http://127.0.0.1:{port}/missing-page", lambda html: {"html": html})
+    reports = registry.run(FetchCache(cache_dir, "cache", backoff=0), workers=len(registry), per_host=per_host)
+
+    checks.expect("reports keep registration order", [r.source.id for r in reports] == [s.id for s in registry])
+    for host in hosts:
+        peak = state.max_in_flight.get(host, 0)
+        checks.expect(f"{host} peaked at {per_host} requests in flight", peak == per_host, str(peak))
+    failed = [report for report in reports if report.error]
+    checks.expect(
+        "only the missing source failed, with its HTTP error",
+        [report.source.id for report in failed] == ["missing"] and "404" in failed[0].error,
+        ", ".join(f"{report.source.id}: {report.error}" for report in failed),
+    )
+    checks.expect(
+        "the other sources were extracted",
+        all(report.result and report.outcome == "fetched" for report in reports if not report.error),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check the fetch cache and source registry against a local server.")
+    parser.add_argument("--per-host", type=int, default=2, help="Per-host limit to check the registry with (default: 2).")
+    args = parser.parse_args()
+
+    state = StandInState()
+    handler = type("Handler", (StandInHandler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    checks = Checks()
+    try:
+        with tempfile.TemporaryDirectory(prefix="fetch-check-") as work:
+            base = f"http://127.0.0.1:{port}"
+            check_modes(base, state, os.path.join(work, "modes"), checks)
+            check_retries(base, state, os.path.join(work, "retries"), checks)
+            check_registry(port, state, os.path.join(work, "registry"), args.per_host, checks)
+    finally:
+        server.shutdown()
+        server.server_close()
+    if checks.failures:
+        print(f"{checks.failures} checks failed")
+        sys.exit(1)
+    print("all checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Times the data pipeline end to end on synthetic inputs at several scales.
+
+Each scale runs in a throwaway sandbox that mirrors the repo layout, so the
+real data/ and public/data/ trees are never touched. The build, QA and
+export scripts are timed on their own for the default cycle, then
+``run-pipeline.py`` (the ``data:build`` entry point) is timed for every
+cycle, on disk and with ``--in-memory``. ``--cycles N`` generates N cycles
+per sandbox. Results are written to
+data/bench/results/<timestamp>-<commit>.json and compared with the most
+recent earlier run at the same scale and cycle count.
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from synthetic_data import generate
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(BENCH_DIR))
+PIPELINE_DIR = os.path.join(REPO_ROOT, "data", "na15-2021")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+# (step name, script path relative to the sandbox root, arguments)
+STEPS = [
+    ("build", "data/na15-2021/build-staging-db.py", []),
+    ("qa", "data/na15-2021/qa-checks.py", []),
+    ("export", "data/na15-2021/export-json.py", []),
+    ("pipeline", "data/na15-2021/run-pipeline.py", []),
+    ("pipeline_in_memory", "data/na15-2021/run-pipeline.py", ["--in-memory"]),
+    ("results_gap", "ai/results_analytics.py", []),
+]
+# results_analytics.py needs NumPy (requirements.txt); without it the step is skipped.
+if importlib.util.find_spec("numpy") is None:
+    STEPS = [step for step in STEPS if step[0] != "results_gap"]
+
+
+def git_output(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def prepare_sandbox(root: str) -> None:
+    """Copy the pipeline scripts into a sandbox that already holds synthetic inputs."""
+    target = os.path.join(root, "data", "na15-2021")
+    for path in glob.glob(os.path.join(PIPELINE_DIR, "*.py")):
+        shutil.copy(path, target)
+    os.makedirs(os.path.join(root, "ai"), exist_ok=True)
+    shutil.copy(os.path.join(REPO_ROOT, "ai", "results_analytics.py"), os.path.join(root, "ai"))
+
+
+def run_step(root: str, script: str, args: list[str], env: dict) -> float:
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, script, *args], cwd=root, env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"{script} exited with {proc.returncode}:\n{proc.stdout}\n{proc.stderr}"
+        )
+    return elapsed
+
+
+def output_stats(root: str) -> dict:
+    files = 0
+    total = 0
+    for dirpath, _, filenames in os.walk(os.path.join(root, "public", "data")):
+        for filename in filenames:
+            files += 1
+            total += os.path.getsize(os.path.join(dirpath, filename))
+    return {
+        "output_files": files,
+        "output_bytes": total,
+        "staging_db_bytes": os.path.getsize(os.path.join(root, "data", "staging.db")),
+    }
+
+
+def table_rows(root: str) -> dict:
+    conn = sqlite3.connect(os.path.join(root, "data", "staging.db"))
+    try:
+        tables = [
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name"
+            ).fetchall()
+        ]
+        return {table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables}
+    finally:
+        conn.close()
+
+
+def sandbox_cycle_ids(root: str) -> list[str]:
+    with open(os.path.join(root, "data", "cycles.json"), "r", encoding="utf-8") as fh:
+        return [cycle["id"] for cycle in json.load(fh)["cycles"]]
+
+
+def bench_scale(scale: int, cycles: int, repeat: int, seed: int, profile: bool, keep: bool) -> dict:
+    root = tempfile.mkdtemp(prefix=f"bench-x{scale}-c{cycles}-")
+    try:
+        counts = generate(root, scale, seed, cycles)
+        prepare_sandbox(root)
+        # The analysis reads every cycle that the pipeline steps exported.
+        extra_args = {"results_gap": ["--cycle", *sandbox_cycle_ids(root)]}
+        env = dict(os.environ)
+        env.pop("PIPELINE_PROFILE", None)
+        timings: dict[str, list[float]] = {name: [] for name, _, _ in STEPS}
+        for attempt in range(repeat):
+            if profile and attempt == repeat - 1:
+                env["PIPELINE_PROFILE"] = os.path.join(root, "profile.json")
+            for name, script, args in STEPS:
+                timings[name].append(run_step(root, script, [*args, *extra_args.get(name, [])], env))
+
+        run = {
+            **counts,
+            "steps": {
+                name: {"best_seconds": round(min(values), 4), "runs": [round(v, 4) for v in values]}
+                for name, values in timings.items()
+            },
+            "total_best_seconds": round(sum(min(values) for values in timings.values()), 4),
+            **output_stats(root),
+            "table_rows": table_rows(root),
+        }
+        if profile:
+            with open(os.path.join(root, "profile.json"), "r", encoding="utf-8") as fh:
+                run["profile"] = json.load(fh)
+        return run
+    finally:
+        if keep:
+            print(f"Kept sandbox for x{scale}, {cycles} cycles: {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+def latest_result(exclude: str | None = None) -> str | None:
+    paths = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))
+    paths = [path for path in paths if path != exclude]
+    return paths[-1] if paths else None
+
+
+def print_comparison(current: dict, previous: dict, previous_path: str) -> None:
+    print(f"Compared with {os.path.relpath(previous_path, REPO_ROOT)} ({previous.get('commit') or 'unknown'})")
+    previous_runs = {(run["scale"], run.get("cycles", 1)): run for run in previous.get("runs", [])}
+    for run in current["runs"]:
+        before = previous_runs.get((run["scale"], run["cycles"]))
+        if not before:
+            continue
+        for name in [step[0] for step in STEPS] + ["total"]:
+            if name == "total":
+                # Totals only compare when both runs timed the same steps.
+                if set(before.get("steps", {})) != set(run["steps"]):
+                    continue
+                now, then = run["total_best_seconds"], before.get("total_best_seconds")
+            else:
+                now = run["steps"][name]["best_seconds"]
+                then = before.get("steps", {}).get(name, {}).get("best_seconds")
+            if not then:
+                continue
+            change = (now - then) / then * 100
+            label = f"x{run['scale']}" + (f"/{run['cycles']}c" if run["cycles"] > 1 else "")
+            print(f"  {label:<8} {name:<18} {then:8.3f}s -> {now:8.3f}s ({change:+.1f}%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark build, QA, export and analysis on synthetic data.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10], help="Scale factors to run (e.g. 1 10 100).")
+    parser.add_argument("--cycles", type=int, default=1, help="Election cycles per sandbox, NA15 first (default: 1).")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per scale; the best time is reported.")
+    parser.add_argument("--seed", type=int, default=2021)
+    parser.add_argument("--profile", action="store_true", help="Embed a PIPELINE_PROFILE report from the last run.")
+    parser.add_argument("--keep", action="store_true", help="Keep sandbox directories for inspection.")
+    parser.add_argument("--compare", help="Result file to compare against (default: most recent run).")
+    parser.add_argument("--no-save", action="store_true", help="Print results without writing a result file.")
+    args = parser.parse_args()
+    if args.cycles < 1:
+        parser.error("--cycles must be at least 1")
+
+    commit = git_output("rev-parse", "--short", "HEAD")
+    result = {
+        "commit": commit or None,
+        "dirty": bool(git_output("status", "--porcelain", "--untracked-files=no")),
+        "recorded_at": datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "runs": [],
+    }
+    for scale in args.scales:
+        run = bench_scale(scale, args.cycles, args.repeat, args.seed, args.profile, args.keep)
+        result["runs"].append(run)
+        steps = ", ".join(f"{name} {info['best_seconds']:.3f}s" for name, info in run["steps"].items())
+        label = f"x{scale}" + (f", {run['cycles']} cycles" if run["cycles"] > 1 else "")
+        print(f"{label}: {run['candidates']} candidates, {run['results']} results -> {steps}")
+
+    output_path = None
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = result["recorded_at"].replace(":", "").replace("-", "")
+        output_path = os.path.join(RESULTS_DIR, f"{stamp}-{commit or 'nogit'}.json")
+        with open(output_path, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, ensure_ascii=False, indent=2)
+            fh.write("\n")
+        print(f"Wrote {os.path.relpath(output_path, REPO_ROOT)}")
+
+    previous_path = args.compare or latest_result(exclude=output_path)
+    if previous_path:
+        with open(previous_path, "r", encoding="utf-8") as fh:
+            print_comparison(result, json.load(fh), previous_path)
+
+
+if __name__ == "__main__":
+    main()
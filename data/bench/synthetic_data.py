@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""Generates synthetic NA-style inputs at a configurable scale for benchmarks.
+
+The output tree mirrors the repo layout the pipeline scripts expect:
+
+    <root>/data/na15-2021/candidates-list/*.csv
+    <root>/data/na15-2021/congressional-units-parsed.csv
+    <root>/data/na15-2021/results/cema-district-results.json
+    <root>/data/na15-2021/results/research.json
+    <root>/data/manual/timelines.json
+    <root>/data/cycles.json
+
+Scale 1 approximates NA15-2021 (63 localities, 184 constituencies, ~800
+candidates). Larger scales multiply the constituencies per locality.
+``--cycles N`` adds N - 1 synthetic cycles after NA15 (``na16-2026``,
+``na17-2031``, ...), each in its own data directory with the same layout
+and its own candidates and results, and lists them all in ``cycles.json``.
+Names are drawn from small Vietnamese pools so that duplicate names,
+diacritic-only differences and honorific/alias variants occur naturally.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import random
+import shutil
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SOURCE_DATA_DIR = os.path.join(REPO_ROOT, "data", "na15-2021")
+SOURCE_UNITS_CSV = os.path.join(SOURCE_DATA_DIR, "congressional-units-parsed.csv")
+SOURCE_RESEARCH_JSON = os.path.join(SOURCE_DATA_DIR, "results", "research.json")
+SOURCE_TIMELINES_JSON = os.path.join(REPO_ROOT, "data", "manual", "timelines.json")
+SOURCE_CYCLES_JSON = os.path.join(REPO_ROOT, "data", "cycles.json")
+
+CANDIDATE_COLUMNS = [
+    "unit_context",
+    "province_or_city",
+    "unit_number",
+    "unit_description",
+    "STT",
+    "Họ và tên",
+    "Ngày tháng năm sinh",
+    "Giới tính",
+    "Quốc tịch",
+    "Dân tộc",
+    "Tôn giáo",
+    "Quê quán",
+    "Nơi ở hiện nay",
+    "Trình độ học vấn - Giáo dục phổ thông",
+    "Trình độ học vấn - Chuyên môn, nghiệp vụ",
+    "Trình độ học vấn - Học hàm, học vị",
+    "Trình độ học vấn - Lý luận chính trị",
+    "Trình độ học vấn - Ngoại ngữ",
+    "Nghề nghiệp, chức vụ",
+    "Nơi công tác",
+    "Ngày vào Đảng",
+    "Là đại biểu QH",
+    "Là đại biểu HĐND",
+]
+
+UNIT_COLUMNS = [
+    "congressional_unit_id",
+    "associated_province",
+    "province_congressional_unit_number",
+    "representatives_count",
+    "districts",
+]
+
+SURNAMES = ["Nguyễn", "Trần", "Lê", "Phạm", "Hoàng", "Huỳnh", "Phan", "Vũ", "Võ", "Đặng", "Bùi", "Đỗ"]
+MIDDLE_NAMES = ["Văn", "Thị", "Hữu", "Đức", "Thanh", "Minh", "Quốc", "Ngọc", "Xuân", "Thu"]
+GIVEN_NAMES = [
+    "An", "Anh", "Bình", "Châu", "Cường", "Dũng", "Giang", "Hà", "Hải", "Hạnh", "Hiếu",
+    "Hoa", "Hùng", "Hương", "Khánh", "Lan", "Linh", "Long", "Mai", "Nam", "Nga", "Phong",
+    "Phương", "Quân", "Sơn", "Tâm", "Thảo", "Thắng", "Trang", "Trung", "Tuấn", "Yến",
+]
+DISTRICT_KINDS = ["Quận", "Huyện", "Thị xã", "Thành phố"]
+DISTRICT_NAMES = [
+    "Ba Đình", "Đống Đa", "Hải Châu", "Ninh Kiều", "Long Biên", "Thủ Đức", "Sơn Trà",
+    "Cẩm Lệ", "Đông Anh", "Gia Lâm", "Bình Thạnh", "Phú Nhuận", "Hòa Vang", "Vĩnh Yên",
+]
+WEIGHTED_FIELDS = {
+    "Dân tộc": [("Kinh", 79), ("Tày", 4), ("Thái", 3), ("Mường", 2), ("Mông", 2), ("Khmer", 1)],
+    "Tôn giáo": [("Không", 97), ("Phật giáo", 2), ("Công giáo", 1)],
+    "Trình độ học vấn - Học hàm, học vị": [
+        ("Thạc sĩ", 44),
+        ("Cử nhân", 31),
+        ("Tiến sĩ", 15),
+        ("Phó Giáo sư, Tiến sĩ", 3),
+        ("Kỹ sư", 2),
+        ("Giáo sư, Tiến sĩ", 1),
+    ],
+    "Trình độ học vấn - Lý luận chính trị": [("Cao cấp", 70), ("Trung cấp", 20), ("Sơ cấp", 10)],
+    "Trình độ học vấn - Ngoại ngữ": [("Tiếng Anh B1", 50), ("Tiếng Anh C", 30), ("Tiếng Pháp B", 20)],
+    "Là đại biểu QH": [("Không", 75), ("XIV", 16), ("XIII, XIV", 5), ("XII, XIII, XIV", 1)],
+    "Là đại biểu HĐND": [("Không", 70), ("Tỉnh khóa XV", 30)],
+}
+
+
+def weighted_choice(rng: random.Random, options: list[tuple[str, int]]) -> str:
+    values, weights = zip(*options)
+    return rng.choices(values, weights=weights, k=1)[0]
+
+
+def vn_number(value: int) -> str:
+    return f"{value:,}".replace(",", ".")
+
+
+def read_source_units() -> list[dict]:
+    with open(SOURCE_UNITS_CSV, "r", encoding="utf-8") as fh:
+        return list(csv.DictReader(fh))
+
+
+def province_display(raw: str) -> str:
+    if raw.startswith("TP. "):
+        return "Thành phố " + raw[len("TP. "):]
+    return raw
+
+
+def province_short(raw: str) -> str:
+    """Spelling used in candidate CSVs: 'Thành phố X' for cities, bare name otherwise."""
+    if raw.startswith("TP. "):
+        return province_display(raw)
+    return raw.replace("Tỉnh ", "", 1)
+
+
+def random_name(rng: random.Random) -> str:
+    return f"{rng.choice(SURNAMES)} {rng.choice(MIDDLE_NAMES)} {rng.choice(GIVEN_NAMES)}"
+
+
+def bulletin_name(rng: random.Random, name: str, gender: str, unit_names: list[str]) -> str:
+    """Name as printed in a results bulletin, with occasional variants."""
+    honorific = "Ông" if gender == "Nam" else "Bà"
+    roll = rng.random()
+    short_name = name.split(" ", 1)[1]
+    if roll < 0.02 and sum(other.endswith(short_name) for other in unit_names) == 1:
+        # Surname omitted: resolves through the suffix tier.
+        name = short_name
+    elif roll < 0.04:
+        name = f"{name} ({rng.choice(GIVEN_NAMES)})"
+    return f"{honorific} {name}"
+
+
+def cycle_configs(count: int) -> list[dict]:
+    """The NA15 cycle from data/cycles.json followed by ``count - 1`` synthetic ones."""
+    with open(SOURCE_CYCLES_JSON, "r", encoding="utf-8") as fh:
+        base = json.load(fh)["cycles"][0]
+    configs = [base]
+    for index in range(1, count):
+        number = 15 + index
+        year = base["year"] + 5 * index
+        cycle_id = f"na{number}-{year}"
+        configs.append(
+            {
+                **base,
+                "id": cycle_id,
+                "name": f"National Assembly {number} (synthetic)",
+                "year": year,
+                "data_dir": cycle_id,
+            }
+        )
+    return configs
+
+
+def generate(root: str, scale: int = 1, seed: int = 2021, cycles: int = 1) -> dict:
+    """Write a synthetic input tree under ``root`` and return row counts."""
+    manual_dir = os.path.join(root, "data", "manual")
+    os.makedirs(manual_dir, exist_ok=True)
+    configs = cycle_configs(cycles)
+
+    counts = {"scale": scale, "seed": seed, "cycles": len(configs)}
+    for index, config in enumerate(configs):
+        # The first cycle keeps the single-cycle seed, so its inputs do not
+        # depend on how many cycles are generated.
+        rng = random.Random(seed + index)
+        cycle_counts = generate_cycle(os.path.join(root, "data", config["data_dir"]), config["id"], scale, rng)
+        for key, value in cycle_counts.items():
+            counts[key] = value if key == "localities" else counts.get(key, 0) + value
+
+    shutil.copyfile(SOURCE_TIMELINES_JSON, os.path.join(manual_dir, "timelines.json"))
+    with open(os.path.join(root, "data", "cycles.json"), "w", encoding="utf-8") as fh:
+        json.dump({"cycles": configs}, fh, ensure_ascii=False, indent=2)
+        fh.write("\n")
+    return counts
+
+
+def generate_cycle(data_dir: str, cycle_id: str, scale: int, rng: random.Random) -> dict:
+    """Write one cycle's inputs under ``data_dir`` and return its row counts."""
+    list_dir = os.path.join(data_dir, "candidates-list")
+    results_dir = os.path.join(data_dir, "results")
+    for path in (list_dir, results_dir):
+        os.makedirs(path, exist_ok=True)
+
+    source_units = read_source_units()
+    units_per_province: dict[str, int] = {}
+    for row in source_units:
+        province = row["associated_province"]
+        units_per_province[province] = units_per_province.get(province, 0) + 1
+
+    unit_rows = []
+    candidate_rows = []
+    result_records = []
+    unit_id = 0
+    for province, base_units in units_per_province.items():
+        display = province_display(province)
+        for unit_number in range(1, base_units * scale + 1):
+            unit_id += 1
+            seats = rng.choice([2, 3, 3, 3])
+            candidate_count = seats + rng.choice([1, 2, 2])
+            districts = [
+                f"{rng.choice(DISTRICT_KINDS)} {rng.choice(DISTRICT_NAMES)} {unit_number}-{i}"
+                for i in range(rng.randint(2, 5))
+            ]
+            unit_rows.append(
+                {
+                    "congressional_unit_id": unit_id,
+                    "associated_province": province,
+                    "province_congressional_unit_number": unit_number,
+                    "representatives_count": seats,
+                    "districts": ",".join(districts),
+                }
+            )
+
+            description = (
+                f"Gồm các đơn vị: {', '.join(districts)}. "
+                f"Số đại biểu Quốc hội được bầu: {seats} người. "
+                f"Số người ứng cử: {candidate_count} người."
+            )
+            context = f"UBBC Tỉnh/Thành phố: {display} Đơn vị bầu cử Số {unit_number}: {description}"
+            voters = rng.randint(150_000, 900_000)
+            # Names are unique within a unit but repeat freely across units.
+            names: list[str] = []
+            while len(names) < candidate_count:
+                name = random_name(rng)
+                if name not in names:
+                    names.append(name)
+            votes = [rng.randint(voters // 4, voters) for _ in names]
+            genders = {}
+
+            for stt, name in enumerate(names, start=1):
+                gender = "Nữ" if " Thị " in name else rng.choice(["Nam", "Nữ"])
+                genders[name] = gender
+                row = {
+                    "unit_context": context,
+                    "province_or_city": province_short(province),
+                    "unit_number": unit_number,
+                    "unit_description": description,
+                    "STT": stt,
+                    "Họ và tên": name,
+                    "Ngày tháng năm sinh": f"{rng.randint(1, 28):02d}/{rng.randint(1, 12)}/{rng.randint(1955, 1995)}",
+                    "Giới tính": gender,
+                    "Quốc tịch": "Việt Nam",
+                    "Quê quán": f"Xã {rng.choice(DISTRICT_NAMES)}, huyện {rng.choice(DISTRICT_NAMES)}, {display}",
+                    "Nơi ở hiện nay": f"Số {rng.randint(1, 400)}, phố {rng.choice(GIVEN_NAMES)}, {display}",
+                    "Trình độ học vấn - Giáo dục phổ thông": "12/12",
+                    "Trình độ học vấn - Chuyên môn, nghiệp vụ": "Đại học chuyên ngành luật",
+                    "Nghề nghiệp, chức vụ": f"Phó Giám đốc Sở {rng.choice(DISTRICT_NAMES)}",
+                    "Nơi công tác": f"Ủy ban nhân dân {display}",
+                    "Ngày vào Đảng": f"{rng.randint(1, 28)}/{rng.randint(1, 12)}/{rng.randint(1980, 2015)}",
+                }
+                for column, options in WEIGHTED_FIELDS.items():
+                    row[column] = weighted_choice(rng, options)
+                candidate_rows.append(row)
+
+            # Bulletin lists candidates by votes, so its order is the ranking.
+            ranked = sorted(zip(names, votes), key=lambda item: item[1], reverse=True)
+            for order, (name, vote_count) in enumerate(ranked, start=1):
+                percent = round(vote_count * 100 / voters, 2)
+                percent_raw = f"{percent:.2f}".replace(".", ",")
+                result_records.append(
+                    {
+                        "province": display.upper(),
+                        "unit_number": unit_number,
+                        "unit_description": f"Gồm các đơn vị: {', '.join(districts)}.",
+                        "order": order,
+                        "candidate_name": bulletin_name(rng, name, genders[name], names),
+                        "votes": vote_count,
+                        "votes_raw": vn_number(vote_count),
+                        "percent": float(percent_raw.replace(",", ".")),
+                        "percent_raw": percent_raw,
+                    }
+                )
+
+    with open(os.path.join(data_dir, "congressional-units-parsed.csv"), "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=UNIT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(unit_rows)
+
+    # Split the list into files of roughly 100 candidates, like the official DOCX batches.
+    chunk = 100
+    for index in range(0, len(candidate_rows), chunk):
+        batch = candidate_rows[index : index + chunk]
+        filename = f"{index // chunk + 1}.{index + 1}-{index + len(batch)}.csv"
+        with open(os.path.join(list_dir, filename), "w", newline="", encoding="utf-8") as fh:
+            writer = csv.DictWriter(fh, fieldnames=CANDIDATE_COLUMNS)
+            writer.writeheader()
+            writer.writerows(batch)
+
+    with open(os.path.join(results_dir, "cema-district-results.json"), "w", encoding="utf-8") as fh:
+        json.dump(
+            {
+                "cycle_id": cycle_id,
+                "source_id": "synthetic",
+                "source_url": None,
+                "extracted_at": None,
+                "records": result_records,
+                "skipped": [],
+            },
+            fh,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+    shutil.copyfile(SOURCE_RESEARCH_JSON, os.path.join(results_dir, "research.json"))
+
+    return {
+        "localities": len(units_per_province),
+        "constituencies": len(unit_rows),
+        "candidates": len(candidate_rows),
+        "results": len(result_records),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic pipeline inputs.")
+    parser.add_argument("root", help="Output root; data/<cycle>/... is created beneath it.")
+    parser.add_argument("--scale", type=int, default=1, help="Constituency multiplier (1 = NA15 size).")
+    parser.add_argument("--seed", type=int, default=2021)
+    parser.add_argument("--cycles", type=int, default=1, help="Cycles to generate, NA15 first (default: 1).")
+    args = parser.parse_args()
+    if args.cycles < 1:
+        parser.error("--cycles must be at least 1")
+
+    counts = generate(args.root, args.scale, args.seed, args.cycles)
+    print(json.dumps(counts, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
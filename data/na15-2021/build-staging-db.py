@@ -1,4 +1,6 @@
 #!/usr/bin/env python3
+import bisect
+import argparse
 import csv
 import json
 import glob
@@ -6,32 +8,73 @@ import hashlib
 import os
 import re
 import sqlite3
+import sys
 import unicodedata
 
+from docx_candidates import DocxRowCache, diff_rows, extract_candidate_lists
+from pipeline_profiler import PipelineProfiler
+
 
 DATA_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT = os.path.dirname(DATA_DIR)
 DB_PATH = os.path.join(ROOT, "staging.db")
 MANUAL_TIMELINES_PATH = os.path.join(ROOT, "manual", "timelines.json")
-
-ELECTION_CYCLE_ID = "na15-2021"
-ELECTION_CYCLE_NAME = "15th National Assembly"
-ELECTION_CYCLE_YEAR = 2021
-ELECTION_CYCLE_TYPE = "national_assembly"
-DOCUMENT_FETCHED_DATE = "2026-01-02"
-RESULTS_FETCHED_DATE = "2026-01-09"
-DOC_URL_CANDIDATE_LIST = "https://images.hcmcpv.org.vn/Uploads/File/280420219523F244/Danhsachbaucu-PYFO.pdf"
-DOC_URL_CONGRESSIONAL_UNITS = "https://images.hcmcpv.org.vn/Uploads/File/280420219523F244/Danhsachbaucu-PYFO.pdf"
-DOC_URL_DOCX_LIST = "https://baochinhphu.vn/danh-sach-868-nguoi-ung-cu-dbqh-khoa-xv-102291334.htm"
-DOC_URL_RESULTS_CEMA = "https://web.archive.org/web/20250221194402/http://www.cema.gov.vn/bau-cu-QH-HDND/cong-bo-danh-sach-499-nguoi-trung-cu-dai-bieu-quoc-hoi-khoa-xv.htm"
-DOC_URL_VTV_INELIGIBLE = "https://web.archive.org/web/20210621105212/https://vtv.vn/chinh-tri/khong-xac-nhan-tu-cach-dai-bieu-quoc-hoi-voi-bi-thu-tinh-uy-binh-duong-20210610192156321.htm"
-DOC_PATH_CANDIDATE_PDF = "data/na15-2021/candidates-list/candidates-list-vietnamese.pdf"
-DOC_PATH_CONGRESSIONAL_UNITS = "data/na15-2021/congressional-units.pdf"
-RESULTS_CEMA_JSON = os.path.join(DATA_DIR, "results", "cema-district-results.json")
-RESULTS_SUMMARY_JSON = os.path.join(DATA_DIR, "results", "research.json")
+CYCLES_CONFIG_PATH = os.path.join(ROOT, "cycles.json")
+DEFAULT_CYCLE_ID = "na15-2021"
 RESULTS_VTV_METADATA_ID = "vtv_report_tran_van_nam_ineligible"
 
 
+def load_cycle_configs() -> dict[str, dict]:
+    """Cycle configs from data/cycles.json, keyed by cycle ID in file order."""
+    with open(CYCLES_CONFIG_PATH, "r", encoding="utf-8") as fh:
+        return {cycle["id"]: cycle for cycle in json.load(fh)["cycles"]}
+
+
+def configure_cycle(cycle: dict, db_path: str | None = None) -> None:
+    """Point the loaders at one cycle's identity, documents and data directory.
+
+    The loaders read these module globals, so a process builds one cycle at
+    a time; the multi-cycle runner gives each cycle its own process, or
+    builds them one after another with ``--in-memory``.
+    """
+    global ELECTION_CYCLE_ID, ELECTION_CYCLE_NAME, ELECTION_CYCLE_YEAR, ELECTION_CYCLE_TYPE
+    global DOCUMENT_FETCHED_DATE, RESULTS_FETCHED_DATE
+    global DOC_URL_CANDIDATE_LIST, DOC_URL_CONGRESSIONAL_UNITS, DOC_URL_DOCX_LIST
+    global DOC_URL_RESULTS_CEMA, DOC_URL_VTV_INELIGIBLE
+    global DOC_PATH_PREFIX, DOC_PATH_CANDIDATE_PDF, DOC_PATH_CONGRESSIONAL_UNITS
+    global CYCLE_DIR, CANDIDATES_DIR, CONGRESSIONAL_UNITS_CSV, RESULTS_CEMA_JSON, RESULTS_SUMMARY_JSON
+    global DB_PATH
+
+    documents = cycle["documents"]
+    ELECTION_CYCLE_ID = cycle["id"]
+    ELECTION_CYCLE_NAME = cycle["name"]
+    ELECTION_CYCLE_YEAR = cycle["year"]
+    ELECTION_CYCLE_TYPE = cycle["type"]
+    DOCUMENT_FETCHED_DATE = cycle["document_fetched_date"]
+    RESULTS_FETCHED_DATE = cycle["results_fetched_date"]
+    DOC_URL_CANDIDATE_LIST = documents["candidate_list_url"]
+    DOC_URL_CONGRESSIONAL_UNITS = documents["congressional_units_url"]
+    DOC_URL_DOCX_LIST = documents["docx_list_url"]
+    DOC_URL_RESULTS_CEMA = documents["results_cema_url"]
+    DOC_URL_VTV_INELIGIBLE = documents["vtv_ineligible_url"]
+    # Document file paths are stored relative to the repository root.
+    DOC_PATH_PREFIX = f"data/{cycle['data_dir']}"
+    DOC_PATH_CANDIDATE_PDF = f"{DOC_PATH_PREFIX}/{documents['candidate_list_pdf']}"
+    DOC_PATH_CONGRESSIONAL_UNITS = f"{DOC_PATH_PREFIX}/{documents['congressional_units_pdf']}"
+    CYCLE_DIR = os.path.join(ROOT, cycle["data_dir"])
+    CANDIDATES_DIR = os.path.join(CYCLE_DIR, "candidates-list")
+    CONGRESSIONAL_UNITS_CSV = os.path.join(CYCLE_DIR, "congressional-units-parsed.csv")
+    RESULTS_CEMA_JSON = os.path.join(CYCLE_DIR, "results", "cema-district-results.json")
+    RESULTS_SUMMARY_JSON = os.path.join(CYCLE_DIR, "results", "research.json")
+    if db_path is not None:
+        DB_PATH = db_path
+
+
+configure_cycle(load_cycle_configs()[DEFAULT_CYCLE_ID])
+
+PROFILER = PipelineProfiler.from_env("build-staging-db")
+
+
 def fold_text(value: str) -> str:
     if value is None:
         return ""
@@ -62,10 +105,6 @@ def normalize_candidate_name(value: str) -> tuple[str, str | None]:
     return folded, alias_folded
 
 
-def escape_like(value: str) -> str:
-    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
-
-
 def normalize_locality_name(value: str) -> str:
     if value is None:
         return ""
@@ -110,6 +149,22 @@ def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
+def register_sql_functions(conn: sqlite3.Connection) -> None:
+    # Lets set-based INSERT ... SELECT statements derive the same IDs and
+    # folded text as the Python loaders.
+    conn.create_function("make_id", 2, make_id, deterministic=True)
+    conn.create_function("fold_text", 1, fold_text, deterministic=True)
+
+
+def apply_bulk_pragmas(conn: sqlite3.Connection) -> None:
+    # staging.db is a throwaway artifact rebuilt from inputs, so durability
+    # is traded for ingest speed while it is being built.
+    conn.execute("PRAGMA journal_mode = MEMORY")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA cache_size = -65536")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+
 def init_db(conn: sqlite3.Connection) -> None:
     conn.executescript(
         """
@@ -198,6 +253,12 @@ def init_db(conn: sqlite3.Connection) -> None:
           notes TEXT
         );
 
+        CREATE TABLE IF NOT EXISTS election_cycle_document (
+          cycle_id TEXT NOT NULL REFERENCES election_cycle(id) ON DELETE CASCADE,
+          document_id TEXT NOT NULL REFERENCES document(id) ON DELETE CASCADE,
+          PRIMARY KEY (cycle_id, document_id)
+        );
+
         CREATE TABLE IF NOT EXISTS source (
           id TEXT PRIMARY KEY,
           document_id TEXT NOT NULL REFERENCES document(id) ON DELETE RESTRICT,
@@ -262,6 +323,33 @@ def init_db(conn: sqlite3.Connection) -> None:
           notes TEXT
         );
 
+        CREATE TABLE IF NOT EXISTS election_result_constituency_summary (
+          constituency_id TEXT PRIMARY KEY REFERENCES constituency(id) ON DELETE CASCADE,
+          cycle_id TEXT NOT NULL REFERENCES election_cycle(id) ON DELETE CASCADE,
+          locality_id TEXT REFERENCES locality(id) ON DELETE RESTRICT,
+          unit_number INTEGER,
+          seat_count INTEGER NOT NULL,
+          candidate_count INTEGER NOT NULL,
+          winner_count INTEGER NOT NULL,
+          total_votes INTEGER,
+          lowest_winner_result_id TEXT REFERENCES election_result_candidate(id) ON DELETE CASCADE,
+          lowest_winner_votes INTEGER,
+          lowest_winner_percent REAL,
+          highest_loser_result_id TEXT REFERENCES election_result_candidate(id) ON DELETE CASCADE,
+          highest_loser_votes INTEGER,
+          highest_loser_percent REAL,
+          margin_votes INTEGER,
+          margin_percent REAL,
+          margin_rank INTEGER
+        );
+
+        CREATE TABLE IF NOT EXISTS build_manifest (
+          stage TEXT NOT NULL,
+          path TEXT NOT NULL,
+          sha256 TEXT NOT NULL,
+          PRIMARY KEY (stage, path)
+        );
+
         CREATE UNIQUE INDEX IF NOT EXISTS ux_constituency_cycle_locality_unit
           ON constituency (cycle_id, locality_id, unit_number);
 
@@ -278,6 +366,12 @@ def init_db(conn: sqlite3.Connection) -> None:
         CREATE INDEX IF NOT EXISTS ix_candidate_constituency ON candidate_entry (constituency_id);
         CREATE INDEX IF NOT EXISTS ix_result_constituency ON election_result_candidate (constituency_id);
         CREATE INDEX IF NOT EXISTS ix_result_candidate_entry ON election_result_candidate (candidate_entry_id);
+        CREATE INDEX IF NOT EXISTS ix_result_constituency_summary_margin_votes
+          ON election_result_constituency_summary (cycle_id, margin_votes);
+        CREATE INDEX IF NOT EXISTS ix_result_constituency_summary_margin_percent
+          ON election_result_constituency_summary (cycle_id, margin_percent);
+        CREATE INDEX IF NOT EXISTS ix_result_constituency_summary_total_votes
+          ON election_result_constituency_summary (cycle_id, total_votes);
         """
     )
 
@@ -291,6 +385,23 @@ def load_manual_timelines() -> dict:
         raise RuntimeError("Manual timelines must be a JSON object keyed by cycle id.")
     return payload
 
+def apply_cycle_timeline(conn: sqlite3.Connection) -> None:
+    cycle_override = load_manual_timelines().get(ELECTION_CYCLE_ID) or {}
+    conn.execute(
+        """
+        UPDATE election_cycle
+        SET start_date = ?, end_date = ?, notes = ?
+        WHERE id = ?
+        """,
+        (
+            cycle_override.get("start_date"),
+            cycle_override.get("end_date"),
+            cycle_override.get("notes"),
+            ELECTION_CYCLE_ID,
+        ),
+    )
+
+
 def load_documents(conn: sqlite3.Connection) -> None:
     documents = [
         {
@@ -323,14 +434,14 @@ def load_documents(conn: sqlite3.Connection) -> None:
         },
     ]
 
-    docx_paths = sorted(glob.glob(os.path.join(DATA_DIR, "candidates-list", "*.docx")))
+    docx_paths = sorted(glob.glob(os.path.join(CANDIDATES_DIR, "*.docx")))
     for path in docx_paths:
         filename = os.path.basename(path)
         documents.append(
             {
                 "title": f"Candidate list ({filename})",
                 "url": DOC_URL_DOCX_LIST,
-                "file_path": f"data/na15-2021/candidates-list/{filename}",
+                "file_path": f"{DOC_PATH_PREFIX}/candidates-list/{filename}",
                 "doc_type": "docx",
                 "fetched_date": DOCUMENT_FETCHED_DATE,
             }
@@ -355,80 +466,62 @@ def load_documents(conn: sqlite3.Connection) -> None:
                 doc.get("fetched_date"),
             ),
         )
+        # Documents are shared between cycles in a merged staging DB; this
+        # records which cycle(s) cite each one.
+        conn.execute(
+            "INSERT INTO election_cycle_document (cycle_id, document_id) VALUES (?, ?)",
+            (ELECTION_CYCLE_ID, doc_id),
+        )
+
+
+def insert_record_sources(
+    conn: sqlite3.Connection,
+    table: str,
+    record_type: str,
+    field: str,
+    url: str,
+    document_id: str,
+    where: str = "",
+    params: tuple = (),
+) -> None:
+    # One set-based INSERT per record type; IDs come from the SQL make_id().
+    conn.execute(
+        f"""
+        INSERT INTO source (id, document_id, record_type, record_id, field, url)
+        SELECT make_id('source-', ? || '|' || id || '|' || ? || '|' || ?), ?, ?, id, ?, ?
+        FROM {table}
+        {where}
+        """,
+        (record_type, field, url, document_id, record_type, field, url, *params),
+    )
 
 
 def add_candidate_sources(conn: sqlite3.Connection) -> None:
-    document_id = make_id("doc-", f"pdf|{DOC_PATH_CANDIDATE_PDF}")
-    candidate_rows = conn.execute("SELECT id FROM candidate_entry").fetchall()
-    for (entry_id,) in candidate_rows:
-        source_id = make_id(
-            "source-", f"candidate_entry|{entry_id}|candidate_list|{DOC_URL_CANDIDATE_LIST}"
-        )
-        conn.execute(
-            """
-            INSERT INTO source (id, document_id, record_type, record_id, field, url)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                source_id,
-                document_id,
-                "candidate_entry",
-                entry_id,
-                "candidate_list",
-                DOC_URL_CANDIDATE_LIST,
-            ),
-        )
+    insert_record_sources(
+        conn,
+        "candidate_entry",
+        "candidate_entry",
+        "candidate_list",
+        DOC_URL_CANDIDATE_LIST,
+        make_id("doc-", f"pdf|{DOC_PATH_CANDIDATE_PDF}"),
+    )
 
 
 def add_constituency_sources(conn: sqlite3.Connection) -> None:
     document_id = make_id("doc-", f"pdf|{DOC_PATH_CONGRESSIONAL_UNITS}")
-    constituency_rows = conn.execute("SELECT id FROM constituency").fetchall()
-    for (constituency_id,) in constituency_rows:
-        source_id = make_id(
-            "source-",
-            f"constituency|{constituency_id}|congressional_units|{DOC_URL_CONGRESSIONAL_UNITS}",
-        )
-        conn.execute(
-            """
-            INSERT INTO source (id, document_id, record_type, record_id, field, url)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                source_id,
-                document_id,
-                "constituency",
-                constituency_id,
-                "congressional_units",
-                DOC_URL_CONGRESSIONAL_UNITS,
-            ),
-        )
-
-    district_rows = conn.execute(
-        "SELECT id FROM constituency_district"
-    ).fetchall()
-    for (district_id,) in district_rows:
-        source_id = make_id(
-            "source-",
-            f"constituency_district|{district_id}|congressional_units|{DOC_URL_CONGRESSIONAL_UNITS}",
-        )
-        conn.execute(
-            """
-            INSERT INTO source (id, document_id, record_type, record_id, field, url)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                source_id,
-                document_id,
-                "constituency_district",
-                district_id,
-                "congressional_units",
-                DOC_URL_CONGRESSIONAL_UNITS,
-            ),
+    for table in ("constituency", "constituency_district"):
+        insert_record_sources(
+            conn,
+            table,
+            table,
+            "congressional_units",
+            DOC_URL_CONGRESSIONAL_UNITS,
+            document_id,
         )
 
 
 def load_congressional_units(conn: sqlite3.Connection) -> dict:
-    path = os.path.join(DATA_DIR, "congressional-units-parsed.csv")
+    path = CONGRESSIONAL_UNITS_CSV
     locality_map = {}
     locality_key_map = {}
     constituency_map = {}
@@ -495,6 +588,36 @@ def load_congressional_units(conn: sqlite3.Connection) -> dict:
     }
 
 
+def load_unit_maps(conn: sqlite3.Connection) -> dict:
+    """Rebuild the lookup maps of an already-loaded cycle without reinserting units."""
+    locality_map = {}
+    locality_key_map = {}
+    with open(CONGRESSIONAL_UNITS_CSV, "r", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            locality_keys = locality_match_keys(row["associated_province"].strip())
+            locality_folded = locality_keys[0]
+            if locality_folded not in locality_map:
+                locality_map[locality_folded] = make_id("loc-", f"{ELECTION_CYCLE_ID}|{locality_folded}")
+                for key in locality_keys:
+                    locality_key_map[key] = locality_map[locality_folded]
+            else:
+                for key in locality_keys:
+                    locality_key_map.setdefault(key, locality_map[locality_folded])
+
+    constituency_map = {
+        (locality_id, unit_number): constituency_id
+        for constituency_id, locality_id, unit_number in conn.execute(
+            "SELECT id, locality_id, unit_number FROM constituency WHERE cycle_id = ?",
+            (ELECTION_CYCLE_ID,),
+        ).fetchall()
+    }
+    return {
+        "locality_map": locality_map,
+        "locality_key_map": locality_key_map,
+        "constituency_map": constituency_map,
+    }
+
+
 def get_attr(row: dict, key: str) -> str:
     value = row.get(key)
     if value is None:
@@ -502,253 +625,342 @@ def get_attr(row: dict, key: str) -> str:
     return str(value).strip()
 
 
+CANDIDATE_ATTRIBUTE_MAP = {
+    "Trình độ học vấn - Giáo dục phổ thông": "education_general",
+    "Trình độ học vấn - Chuyên môn, nghiệp vụ": "education_professional",
+    "Trình độ học vấn - Học hàm, học vị": "education_academic_rank",
+    "Trình độ học vấn - Lý luận chính trị": "education_political",
+    "Trình độ học vấn - Ngoại ngữ": "education_languages",
+    "Nghề nghiệp, chức vụ": "occupation_title",
+    "Nơi công tác": "workplace",
+}
+
+
+def candidate_list_paths() -> list[str]:
+    """One source file per candidate list: its CSV, else the official DOCX."""
+    paths = {}
+    for path in sorted(glob.glob(os.path.join(CANDIDATES_DIR, "*.docx"))):
+        paths[os.path.splitext(os.path.basename(path))[0]] = path
+    for path in sorted(glob.glob(os.path.join(CANDIDATES_DIR, "*.csv"))):
+        paths[os.path.splitext(os.path.basename(path))[0]] = path
+    return [paths[stem] for stem in sorted(paths)]
+
+
+def docx_twin(path: str) -> str:
+    return os.path.splitext(path)[0] + ".docx"
+
+
+def iter_candidate_list_rows(paths: list[str]):
+    """Candidate rows in list order.
+
+    CSVs are read as is. DOCX tables (lists without a CSV, and the twins of
+    the CSVs) are parsed on a process pool and cached; a CSV that differs
+    from its DOCX twin is used anyway and reported on stderr.
+    """
+    docx_paths = [docx_twin(path) for path in paths if os.path.exists(docx_twin(path))]
+    docx_rows = extract_candidate_lists(docx_paths, cache=DocxRowCache()) if docx_paths else {}
+    for path in paths:
+        if path.endswith(".docx"):
+            yield from docx_rows[path]
+            continue
+        with open(path, "r", encoding="utf-8") as fh:
+            rows = list(csv.DictReader(fh))
+        twin = docx_twin(path)
+        if twin in docx_rows:
+            problems = diff_rows(docx_rows[twin], rows)
+            if problems:
+                print(
+                    f"WARNING: {os.path.basename(path)} differs from {os.path.basename(twin)} "
+                    f"({'; '.join(problems)}); using the CSV. Run docx_candidates.py to see "
+                    "every difference, or --write to regenerate the CSV from the DOCX.",
+                    file=sys.stderr,
+                )
+        yield from rows
+
+
 def load_candidates(
     conn: sqlite3.Connection, locality_key_map: dict, constituency_map: dict
 ) -> None:
-    csv_paths = sorted(glob.glob(os.path.join(DATA_DIR, "candidates-list", "*.csv")))
-    if not csv_paths:
-        raise RuntimeError("No candidate CSV files found.")
+    list_paths = candidate_list_paths()
+    if not list_paths:
+        raise RuntimeError("No candidate DOCX or CSV files found.")
+
+    # Rows are parsed into per-table batches and written with executemany.
+    person_rows = []
+    entry_rows = []
+    attribute_rows = []
+    # First (unit_context, unit_description) seen per constituency; applied
+    # once at the end with the same COALESCE semantics as a per-row update.
+    constituency_context = {}
+
+    for row in iter_candidate_list_rows(list_paths):
+        province_raw = get_attr(row, "province_or_city")
+        province_folded = fold_text(normalize_locality_name(province_raw))
+        if province_folded not in locality_key_map:
+            raise RuntimeError(
+                f"Unknown locality: {province_raw} (folded: {province_folded})"
+            )
 
-    for path in csv_paths:
-        with open(path, "r", encoding="utf-8") as fh:
-            reader = csv.DictReader(fh)
-            for row in reader:
-                province_raw = get_attr(row, "province_or_city")
-                province_folded = fold_text(normalize_locality_name(province_raw))
-                if province_folded not in locality_key_map:
-                    raise RuntimeError(
-                        f"Unknown locality: {province_raw} (folded: {province_folded})"
-                    )
-
-                unit_number = to_int(get_attr(row, "unit_number"))
-                locality_id = locality_key_map[province_folded]
-                constituency_id = constituency_map.get((locality_id, unit_number))
-                if constituency_id is None:
-                    unit_context_raw = get_attr(row, "unit_context")
-                    unit_description = get_attr(row, "unit_description")
-                    seat_count = parse_seat_count(unit_context_raw or unit_description) or 0
-                    constituency_id = make_id(
-                        "const-auto-", f"{ELECTION_CYCLE_ID}|{locality_id}|{unit_number}"
-                    )
-                    conn.execute(
-                        """
-                        INSERT INTO constituency
-                          (id, cycle_id, locality_id, unit_number, seat_count, description, unit_context_raw)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            constituency_id,
-                            ELECTION_CYCLE_ID,
-                            locality_id,
-                            unit_number,
-                            seat_count,
-                            unit_description or None,
-                            unit_context_raw or None,
-                        ),
-                    )
-                    constituency_map[(locality_id, unit_number)] = constituency_id
-
-                full_name = get_attr(row, "Họ và tên")
-                dob = get_attr(row, "Ngày tháng năm sinh")
-                birthplace = get_attr(row, "Quê quán")
-                # IDs are deterministic: changes in source fields will change IDs on rebuild.
-                person_key = f"{fold_text(full_name)}|{dob}|{fold_text(birthplace)}"
-                person_id = make_id("person-", person_key)
+        unit_number = to_int(get_attr(row, "unit_number"))
+        locality_id = locality_key_map[province_folded]
+        constituency_id = constituency_map.get((locality_id, unit_number))
+        if constituency_id is None:
+            unit_context_raw = get_attr(row, "unit_context")
+            unit_description = get_attr(row, "unit_description")
+            seat_count = parse_seat_count(unit_context_raw or unit_description) or 0
+            constituency_id = make_id(
+                "const-auto-", f"{ELECTION_CYCLE_ID}|{locality_id}|{unit_number}"
+            )
+            conn.execute(
+                """
+                INSERT INTO constituency
+                  (id, cycle_id, locality_id, unit_number, seat_count, description, unit_context_raw)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    constituency_id,
+                    ELECTION_CYCLE_ID,
+                    locality_id,
+                    unit_number,
+                    seat_count,
+                    unit_description or None,
+                    unit_context_raw or None,
+                ),
+            )
+            constituency_map[(locality_id, unit_number)] = constituency_id
 
-                conn.execute(
-                    """
-                    INSERT OR IGNORE INTO person
-                      (id, full_name, full_name_folded, dob, gender, nationality,
-                       ethnicity, religion, birthplace, current_residence)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        person_id,
-                        full_name,
-                        fold_text(full_name),
-                        dob,
-                        get_attr(row, "Giới tính"),
-                        get_attr(row, "Quốc tịch"),
-                        get_attr(row, "Dân tộc"),
-                        get_attr(row, "Tôn giáo"),
-                        birthplace,
-                        get_attr(row, "Nơi ở hiện nay"),
-                    ),
-                )
+        if constituency_id not in constituency_context:
+            constituency_context[constituency_id] = (
+                get_attr(row, "unit_context"),
+                get_attr(row, "unit_description"),
+            )
 
-                list_order = to_int(get_attr(row, "STT"))
-                # Candidate entries are keyed by cycle + constituency + list order (STT).
-                candidate_entry_id = f"{ELECTION_CYCLE_ID}-{constituency_id}-{list_order}"
+        full_name = get_attr(row, "Họ và tên")
+        full_name_folded = fold_text(full_name)
+        dob = get_attr(row, "Ngày tháng năm sinh")
+        birthplace = get_attr(row, "Quê quán")
+        # IDs are deterministic: changes in source fields will change IDs on rebuild.
+        person_key = f"{full_name_folded}|{dob}|{fold_text(birthplace)}"
+        person_id = make_id("person-", person_key)
 
-                conn.execute(
-                    """
-                    INSERT INTO candidate_entry
-                      (id, person_id, cycle_id, constituency_id, list_order,
-                       party_member_since, is_na_delegate, is_council_delegate)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        candidate_entry_id,
-                        person_id,
-                        ELECTION_CYCLE_ID,
-                        constituency_id,
-                        list_order,
-                        get_attr(row, "Ngày vào Đảng"),
-                        get_attr(row, "Là đại biểu QH"),
-                        get_attr(row, "Là đại biểu HĐND"),
-                    ),
-                )
+        person_rows.append(
+            (
+                person_id,
+                full_name,
+                full_name_folded,
+                dob,
+                get_attr(row, "Giới tính"),
+                get_attr(row, "Quốc tịch"),
+                get_attr(row, "Dân tộc"),
+                get_attr(row, "Tôn giáo"),
+                birthplace,
+                get_attr(row, "Nơi ở hiện nay"),
+            )
+        )
 
-                conn.execute(
-                    """
-                    UPDATE constituency
-                    SET unit_context_raw = COALESCE(unit_context_raw, ?),
-                        description = COALESCE(description, ?)
-                    WHERE id = ?
-                    """,
-                    (
-                        get_attr(row, "unit_context"),
-                        get_attr(row, "unit_description"),
-                        constituency_id,
-                    ),
+        list_order = to_int(get_attr(row, "STT"))
+        # Candidate entries are keyed by cycle + constituency + list order (STT).
+        candidate_entry_id = f"{ELECTION_CYCLE_ID}-{constituency_id}-{list_order}"
+
+        entry_rows.append(
+            (
+                candidate_entry_id,
+                person_id,
+                ELECTION_CYCLE_ID,
+                constituency_id,
+                list_order,
+                get_attr(row, "Ngày vào Đảng"),
+                get_attr(row, "Là đại biểu QH"),
+                get_attr(row, "Là đại biểu HĐND"),
+            )
+        )
+
+        for source_key, attr_key in CANDIDATE_ATTRIBUTE_MAP.items():
+            value = get_attr(row, source_key)
+            if not value:
+                continue
+            # Attribute IDs are deterministic per candidate entry + attribute key.
+            attr_id = make_id("attr-", f"{candidate_entry_id}|{attr_key}")
+            attribute_rows.append(
+                (
+                    attr_id,
+                    candidate_entry_id,
+                    attr_key,
+                    value,
+                    fold_text(value),
                 )
+            )
 
-                attr_map = {
-                    "Trình độ học vấn - Giáo dục phổ thông": "education_general",
-                    "Trình độ học vấn - Chuyên môn, nghiệp vụ": "education_professional",
-                    "Trình độ học vấn - Học hàm, học vị": "education_academic_rank",
-                    "Trình độ học vấn - Lý luận chính trị": "education_political",
-                    "Trình độ học vấn - Ngoại ngữ": "education_languages",
-                    "Nghề nghiệp, chức vụ": "occupation_title",
-                    "Nơi công tác": "workplace",
-                }
-
-                for source_key, attr_key in attr_map.items():
-                    value = get_attr(row, source_key)
-                    if not value:
-                        continue
-                    # Attribute IDs are deterministic per candidate entry + attribute key.
-                    attr_id = make_id("attr-", f"{candidate_entry_id}|{attr_key}")
-                    conn.execute(
-                        """
-                        INSERT INTO candidate_attribute
-                          (id, candidate_entry_id, key, value, value_folded)
-                        VALUES (?, ?, ?, ?, ?)
-                        """,
-                        (
-                            attr_id,
-                            candidate_entry_id,
-                            attr_key,
-                            value,
-                            fold_text(value),
-                        ),
-                    )
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO person
+          (id, full_name, full_name_folded, dob, gender, nationality,
+           ethnicity, religion, birthplace, current_residence)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        person_rows,
+    )
+    conn.executemany(
+        """
+        INSERT INTO candidate_entry
+          (id, person_id, cycle_id, constituency_id, list_order,
+           party_member_since, is_na_delegate, is_council_delegate)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        entry_rows,
+    )
+    conn.executemany(
+        """
+        UPDATE constituency
+        SET unit_context_raw = COALESCE(unit_context_raw, ?),
+            description = COALESCE(description, ?)
+        WHERE id = ?
+        """,
+        [
+            (unit_context, unit_description, constituency_id)
+            for constituency_id, (unit_context, unit_description) in constituency_context.items()
+        ],
+    )
+    conn.executemany(
+        """
+        INSERT INTO candidate_attribute
+          (id, candidate_entry_id, key, value, value_folded)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        attribute_rows,
+    )
+
+
+class CandidateNameIndex:
+    """In-memory lookup of folded candidate names for one election cycle.
+
+    Answers the exact, prefix, suffix and contains tiers used when matching
+    results to candidate entries, both within a constituency and cycle-wide,
+    without issuing a LIKE scan per lookup.
+    """
+
+    def __init__(self, rows: list[tuple[str, str, str]]) -> None:
+        # rows: (candidate_entry_id, constituency_id, full_name_folded)
+        self.rows = rows
+        self.by_name: dict[str, list[int]] = {}
+        self.by_constituency: dict[str, list[int]] = {}
+        self.trigrams: dict[str, set[int]] = {}
+        for index, (_, constituency_id, name) in enumerate(rows):
+            self.by_name.setdefault(name, []).append(index)
+            self.by_constituency.setdefault(constituency_id, []).append(index)
+            for gram in {name[i : i + 3] for i in range(len(name) - 2)}:
+                self.trigrams.setdefault(gram, set()).add(index)
+        self.prefix_keys = sorted((name, index) for index, (_, _, name) in enumerate(rows))
+        self.suffix_keys = sorted((name[::-1], index) for index, (_, _, name) in enumerate(rows))
+
+    @classmethod
+    def from_db(cls, conn: sqlite3.Connection, cycle_id: str) -> "CandidateNameIndex":
+        rows = conn.execute(
+            """
+            SELECT ce.id, ce.constituency_id, p.full_name_folded
+            FROM candidate_entry ce
+            JOIN person p ON p.id = ce.person_id
+            WHERE ce.cycle_id = ?
+            """,
+            (cycle_id,),
+        ).fetchall()
+        return cls([tuple(row) for row in rows])
+
+    def _range(self, keys: list[tuple[str, int]], prefix: str) -> list[int]:
+        lo = bisect.bisect_left(keys, (prefix,))
+        hi = bisect.bisect_left(keys, (prefix + "\uffff",))
+        return [index for _, index in keys[lo:hi]]
+
+    def _candidates(self, mode: str, name: str) -> list[int]:
+        if mode == "exact":
+            return self.by_name.get(name, [])
+        if mode == "prefix":
+            return self._range(self.prefix_keys, name)
+        if mode == "suffix":
+            return self._range(self.suffix_keys, name[::-1])
+        if len(name) < 3:
+            return [index for index, row in enumerate(self.rows) if name in row[2]]
+        grams = [self.trigrams.get(name[i : i + 3], set()) for i in range(len(name) - 2)]
+        hits = set.intersection(*sorted(grams, key=len))
+        return [index for index in sorted(hits) if name in self.rows[index][2]]
+
+    def match(
+        self, mode: str, name: str, constituency_id: str | None = None
+    ) -> list[tuple[str, str]]:
+        """Return (candidate_entry_id, constituency_id) pairs for a folded name.
+
+        ``mode`` is one of exact/prefix/suffix/contains; when
+        ``constituency_id`` is given, only entries in that constituency match.
+        """
+        if constituency_id is not None:
+            checks = {
+                "exact": lambda value: value == name,
+                "prefix": lambda value: value.startswith(name),
+                "suffix": lambda value: value.endswith(name),
+                "contains": lambda value: name in value,
+            }
+            check = checks[mode]
+            indexes = [
+                index
+                for index in self.by_constituency.get(constituency_id, [])
+                if check(self.rows[index][2])
+            ]
+        else:
+            indexes = self._candidates(mode, name)
+        return [(self.rows[index][0], self.rows[index][1]) for index in indexes]
+
+
+NAME_MATCH_TIERS = [
+    ("name_like_prefix", "prefix"),
+    ("name_like_suffix", "suffix"),
+    ("name_like_contains", "contains"),
+]
 
 
 def resolve_candidate_entry_id(
-    conn: sqlite3.Connection,
-    cycle_id: str,
+    index: CandidateNameIndex,
     constituency_id: str,
     name_folded: str,
     name_folded_raw: str,
 ) -> tuple[str | None, str | None]:
-    rows = conn.execute(
-        """
-        SELECT ce.id, ce.constituency_id
-        FROM candidate_entry ce
-        JOIN person p ON p.id = ce.person_id
-        WHERE ce.constituency_id = ? AND p.full_name_folded = ?
-        """,
-        (constituency_id, name_folded),
-    ).fetchall()
+    rows = index.match("exact", name_folded, constituency_id)
     if len(rows) == 1:
         return rows[0][0], None
     if len(rows) > 1:
         return None, "multiple_candidates_match"
 
     if name_folded_raw != name_folded:
-        rows = conn.execute(
-            """
-            SELECT ce.id, ce.constituency_id
-            FROM candidate_entry ce
-            JOIN person p ON p.id = ce.person_id
-            WHERE ce.constituency_id = ? AND p.full_name_folded = ?
-            """,
-            (constituency_id, name_folded_raw),
-        ).fetchall()
+        rows = index.match("exact", name_folded_raw, constituency_id)
         if len(rows) == 1:
             return rows[0][0], None
         if len(rows) > 1:
             return None, "multiple_candidates_match"
 
-    like_patterns = [
-        ("name_like_prefix", "{}%"),
-        ("name_like_suffix", "%{}"),
-        ("name_like_contains", "%{}%"),
-    ]
-
-    for label, pattern in like_patterns:
-        escaped = escape_like(name_folded)
-        rows = conn.execute(
-            """
-            SELECT ce.id, ce.constituency_id
-            FROM candidate_entry ce
-            JOIN person p ON p.id = ce.person_id
-            WHERE ce.constituency_id = ?
-              AND p.full_name_folded LIKE ? ESCAPE '\\'
-            """,
-            (constituency_id, pattern.format(escaped)),
-        ).fetchall()
+    for label, mode in NAME_MATCH_TIERS:
+        rows = index.match(mode, name_folded, constituency_id)
         if len(rows) == 1:
             return rows[0][0], label
         if len(rows) > 1:
             return None, "multiple_candidates_match"
 
     if name_folded_raw != name_folded:
-        for label, pattern in like_patterns:
-            escaped = escape_like(name_folded_raw)
-            rows = conn.execute(
-                """
-                SELECT ce.id, ce.constituency_id
-                FROM candidate_entry ce
-                JOIN person p ON p.id = ce.person_id
-                WHERE ce.constituency_id = ?
-                  AND p.full_name_folded LIKE ? ESCAPE '\\'
-                """,
-                (constituency_id, pattern.format(escaped)),
-            ).fetchall()
+        for label, mode in NAME_MATCH_TIERS:
+            rows = index.match(mode, name_folded_raw, constituency_id)
             if len(rows) == 1:
                 return rows[0][0], f"{label}_raw"
             if len(rows) > 1:
                 return None, "multiple_candidates_match"
 
     # Cycle-wide fallback: match by name and flag if constituency differs.
-    rows = conn.execute(
-        """
-        SELECT ce.id, ce.constituency_id
-        FROM candidate_entry ce
-        JOIN person p ON p.id = ce.person_id
-        WHERE ce.cycle_id = ? AND p.full_name_folded = ?
-        """,
-        (cycle_id, name_folded),
-    ).fetchall()
+    rows = index.match("exact", name_folded)
     if len(rows) == 1:
         note = None if rows[0][1] == constituency_id else "constituency_mismatch"
         return rows[0][0], note
     if len(rows) > 1:
         return None, "multiple_candidates_match"
 
-    for label, pattern in like_patterns:
-        escaped = escape_like(name_folded)
-        rows = conn.execute(
-            """
-            SELECT ce.id, ce.constituency_id
-            FROM candidate_entry ce
-            JOIN person p ON p.id = ce.person_id
-            WHERE ce.cycle_id = ? AND p.full_name_folded LIKE ? ESCAPE '\\'
-            """,
-            (cycle_id, pattern.format(escaped)),
-        ).fetchall()
+    for label, mode in NAME_MATCH_TIERS:
+        rows = index.match(mode, name_folded)
         if len(rows) == 1:
             note = label
             if rows[0][1] != constituency_id:
@@ -758,15 +970,7 @@ def resolve_candidate_entry_id(
             return None, "multiple_candidates_match"
 
     if name_folded_raw != name_folded:
-        rows = conn.execute(
-            """
-            SELECT ce.id, ce.constituency_id
-            FROM candidate_entry ce
-            JOIN person p ON p.id = ce.person_id
-            WHERE ce.cycle_id = ? AND p.full_name_folded = ?
-            """,
-            (cycle_id, name_folded_raw),
-        ).fetchall()
+        rows = index.match("exact", name_folded_raw)
         if len(rows) == 1:
             note = None if rows[0][1] == constituency_id else "constituency_mismatch"
             return rows[0][0], note
@@ -774,17 +978,8 @@ def resolve_candidate_entry_id(
             return None, "multiple_candidates_match"
 
     if name_folded_raw != name_folded:
-        for label, pattern in like_patterns:
-            escaped = escape_like(name_folded_raw)
-            rows = conn.execute(
-                """
-                SELECT ce.id, ce.constituency_id
-                FROM candidate_entry ce
-                JOIN person p ON p.id = ce.person_id
-                WHERE ce.cycle_id = ? AND p.full_name_folded LIKE ? ESCAPE '\\'
-                """,
-                (cycle_id, pattern.format(escaped)),
-            ).fetchall()
+        for label, mode in NAME_MATCH_TIERS:
+            rows = index.match(mode, name_folded_raw)
             if len(rows) == 1:
                 note = f"{label}_raw"
                 if rows[0][1] != constituency_id:
@@ -810,6 +1005,9 @@ def load_cema_results(
         raise RuntimeError("CEMA results JSON records must be a list.")
 
     document_id = make_id("doc-", f"web|{DOC_URL_RESULTS_CEMA}")
+    # Folded names are loaded once; every match tier is answered in memory.
+    name_index = CandidateNameIndex.from_db(conn, ELECTION_CYCLE_ID)
+    result_rows = []
 
     for record in records:
         province_raw = str(record.get("province") or "").strip()
@@ -838,14 +1036,13 @@ def load_cema_results(
         candidate_entry_id = None
         if constituency_id:
             candidate_entry_id, match_note = resolve_candidate_entry_id(
-                conn, ELECTION_CYCLE_ID, constituency_id, name_folded, name_folded_raw
+                name_index, constituency_id, name_folded, name_folded_raw
             )
             if match_note:
                 notes = match_note
             if candidate_entry_id is None and name_folded_alias:
                 candidate_entry_id, match_note = resolve_candidate_entry_id(
-                    conn,
-                    ELECTION_CYCLE_ID,
+                    name_index,
                     constituency_id,
                     name_folded_alias,
                     name_folded_alias,
@@ -862,15 +1059,7 @@ def load_cema_results(
             f"{ELECTION_CYCLE_ID}|{province_raw}|{unit_number}|{order_in_unit}|{name_folded}",
         )
 
-        conn.execute(
-            """
-            INSERT INTO election_result_candidate
-              (id, cycle_id, locality_id, constituency_id, candidate_entry_id,
-               candidate_name, candidate_name_folded, unit_number, unit_description,
-               order_in_unit, votes, votes_raw, percent, percent_raw,
-               source_document_id, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+        result_rows.append(
             (
                 result_id,
                 ELECTION_CYCLE_ID,
@@ -888,26 +1077,100 @@ def load_cema_results(
                 percent_raw,
                 document_id,
                 notes,
-            ),
+            )
         )
 
-        source_id = make_id(
-            "source-", f"election_result_candidate|{result_id}|results|{DOC_URL_RESULTS_CEMA}"
-        )
-        conn.execute(
-            """
-            INSERT INTO source (id, document_id, record_type, record_id, field, url)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                source_id,
-                document_id,
-                "election_result_candidate",
-                result_id,
-                "results",
-                DOC_URL_RESULTS_CEMA,
-            ),
+    conn.executemany(
+        """
+        INSERT INTO election_result_candidate
+          (id, cycle_id, locality_id, constituency_id, candidate_entry_id,
+           candidate_name, candidate_name_folded, unit_number, unit_description,
+           order_in_unit, votes, votes_raw, percent, percent_raw,
+           source_document_id, notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        result_rows,
+    )
+    insert_record_sources(
+        conn,
+        "election_result_candidate",
+        "election_result_candidate",
+        "results",
+        DOC_URL_RESULTS_CEMA,
+        document_id,
+        "WHERE cycle_id = ?",
+        (ELECTION_CYCLE_ID,),
+    )
+
+
+def materialize_result_constituency_summary(conn: sqlite3.Connection) -> None:
+    """Aggregate matched results into one row per constituency.
+
+    A result wins when ``order_in_unit <= seat_count``, the rule the export
+    uses for result status; rows without an order are left out. The margin is
+    the lowest winner's votes (and percent) minus the highest loser's, set
+    only when the unit has both and none of its rows lacks votes or percent.
+    ``margin_rank`` is 1 for the closest race in the cycle. Vote ties pick the
+    row listed first in the unit.
+    """
+    conn.execute(
+        """
+        INSERT INTO election_result_constituency_summary
+          (constituency_id, cycle_id, locality_id, unit_number, seat_count,
+           candidate_count, winner_count, total_votes,
+           lowest_winner_result_id, lowest_winner_votes, lowest_winner_percent,
+           highest_loser_result_id, highest_loser_votes, highest_loser_percent,
+           margin_votes, margin_percent, margin_rank)
+        WITH ranked AS (
+          SELECT erc.id, erc.constituency_id, erc.votes, erc.percent,
+                 erc.order_in_unit <= c.seat_count AS won,
+                 ROW_NUMBER() OVER (
+                   PARTITION BY erc.constituency_id, erc.order_in_unit <= c.seat_count
+                   ORDER BY erc.votes IS NULL,
+                            CASE WHEN erc.order_in_unit <= c.seat_count
+                                 THEN erc.votes ELSE -erc.votes END,
+                            erc.unit_number, erc.order_in_unit, erc.id
+                 ) AS pick
+          FROM election_result_candidate erc
+          JOIN constituency c ON c.id = erc.constituency_id
+          WHERE erc.cycle_id = ? AND erc.order_in_unit IS NOT NULL
+        ),
+        units AS (
+          SELECT c.id AS constituency_id, c.cycle_id, c.locality_id, c.unit_number, c.seat_count,
+                 COUNT(*) AS candidate_count,
+                 SUM(r.won) AS winner_count,
+                 SUM(r.votes) AS total_votes,
+                 MAX(r.votes IS NULL OR r.percent IS NULL) AS incomplete,
+                 MAX(CASE WHEN r.won AND r.pick = 1 THEN r.id END) AS lowest_winner_result_id,
+                 MAX(CASE WHEN NOT r.won AND r.pick = 1 THEN r.id END) AS highest_loser_result_id
+          FROM ranked r
+          JOIN constituency c ON c.id = r.constituency_id
+          GROUP BY c.id
+        ),
+        margins AS (
+          SELECT u.*,
+                 w.votes AS lowest_winner_votes, w.percent AS lowest_winner_percent,
+                 l.votes AS highest_loser_votes, l.percent AS highest_loser_percent,
+                 CASE WHEN NOT u.incomplete THEN w.votes - l.votes END AS margin_votes,
+                 CASE WHEN NOT u.incomplete THEN w.percent - l.percent END AS margin_percent
+          FROM units u
+          LEFT JOIN election_result_candidate w ON w.id = u.lowest_winner_result_id
+          LEFT JOIN election_result_candidate l ON l.id = u.highest_loser_result_id
         )
+        SELECT constituency_id, cycle_id, locality_id, unit_number, seat_count,
+               candidate_count, winner_count, total_votes,
+               lowest_winner_result_id, lowest_winner_votes, lowest_winner_percent,
+               highest_loser_result_id, highest_loser_votes, highest_loser_percent,
+               margin_votes, margin_percent,
+               CASE WHEN margin_votes IS NOT NULL THEN
+                 RANK() OVER (
+                   PARTITION BY cycle_id, margin_votes IS NULL ORDER BY margin_votes
+                 )
+               END
+        FROM margins
+        """,
+        (ELECTION_CYCLE_ID,),
+    )
 
 
 def load_results_summary(conn: sqlite3.Connection) -> None:
@@ -1030,50 +1293,294 @@ def load_result_annotations(conn: sqlite3.Connection) -> None:
         ),
     )
 
-def main() -> None:
-    ensure_dir(DATA_DIR)
+# Loader stages in build order. Each stage is re-run when one of its input
+# files changes, together with every stage downstream of it.
+BUILD_STAGES = [
+    "cycle",
+    "documents",
+    "congressional_units",
+    "candidates",
+    "results",
+    "results_summary",
+    "result_annotations",
+]
+
+STAGE_DEPENDENTS = {
+    "congressional_units": ["candidates"],
+    "candidates": ["results"],
+    "results": ["result_annotations"],
+}
+
+
+def stage_input_paths() -> dict[str, list[str]]:
+    return {
+        "cycle": [MANUAL_TIMELINES_PATH],
+        "documents": sorted(glob.glob(os.path.join(CANDIDATES_DIR, "*.docx"))),
+        "congressional_units": [CONGRESSIONAL_UNITS_CSV],
+        "candidates": candidate_list_paths(),
+        "results": [RESULTS_CEMA_JSON],
+        "results_summary": [RESULTS_SUMMARY_JSON],
+        "result_annotations": [RESULTS_SUMMARY_JSON],
+    }
+
+
+def file_sha256(path: str) -> str:
+    if not os.path.exists(path):
+        return "missing"
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compute_manifest() -> dict[str, dict[str, str]]:
+    manifest = {}
+    for stage, paths in stage_input_paths().items():
+        manifest[stage] = {os.path.relpath(path, ROOT): file_sha256(path) for path in paths}
+    return manifest
+
+
+def read_manifest(conn: sqlite3.Connection) -> dict[str, dict[str, str]]:
+    manifest: dict[str, dict[str, str]] = {}
+    for stage, path, sha256 in conn.execute("SELECT stage, path, sha256 FROM build_manifest"):
+        manifest.setdefault(stage, {})[path] = sha256
+    return manifest
+
+
+def write_manifest(conn: sqlite3.Connection, manifest: dict[str, dict[str, str]]) -> None:
+    conn.execute("DELETE FROM build_manifest")
+    conn.executemany(
+        "INSERT INTO build_manifest (stage, path, sha256) VALUES (?, ?, ?)",
+        [
+            (stage, path, sha256)
+            for stage, hashes in manifest.items()
+            for path, sha256 in sorted(hashes.items())
+        ],
+    )
+
+
+def dirty_stages(previous: dict, current: dict) -> set[str]:
+    dirty = {stage for stage in BUILD_STAGES if previous.get(stage) != current.get(stage)}
+    pending = list(dirty)
+    while pending:
+        for dependent in STAGE_DEPENDENTS.get(pending.pop(), []):
+            if dependent not in dirty:
+                dirty.add(dependent)
+                pending.append(dependent)
+    return dirty
+
+
+def clear_stages(conn: sqlite3.Connection, stages: set[str]) -> None:
+    """Delete rows written by the given stages, downstream stages first."""
+    cycle = (ELECTION_CYCLE_ID,)
+    if "result_annotations" in stages:
+        conn.execute(
+            """
+            DELETE FROM election_result_candidate_annotation
+            WHERE result_id IN (SELECT id FROM election_result_candidate WHERE cycle_id = ?)
+            """,
+            cycle,
+        )
+    if "results_summary" in stages:
+        conn.execute("DELETE FROM election_result_summary WHERE cycle_id = ?", cycle)
+    if "results" in stages:
+        conn.execute("DELETE FROM election_result_constituency_summary WHERE cycle_id = ?", cycle)
+        conn.execute(
+            """
+            DELETE FROM source
+            WHERE record_type = 'election_result_candidate'
+              AND record_id IN (SELECT id FROM election_result_candidate WHERE cycle_id = ?)
+            """,
+            cycle,
+        )
+        conn.execute("DELETE FROM election_result_candidate WHERE cycle_id = ?", cycle)
+    if "candidates" in stages:
+        # Constituency sources are written after candidates (they cover
+        # auto-created constituencies), so they belong to this stage.
+        conn.execute(
+            """
+            DELETE FROM source
+            WHERE (record_type = 'candidate_entry'
+                   AND record_id IN (SELECT id FROM candidate_entry WHERE cycle_id = ?))
+               OR (record_type = 'constituency'
+                   AND record_id IN (SELECT id FROM constituency WHERE cycle_id = ?))
+               OR (record_type = 'constituency_district'
+                   AND record_id IN (
+                     SELECT d.id
+                     FROM constituency_district d
+                     JOIN constituency c ON c.id = d.constituency_id
+                     WHERE c.cycle_id = ?
+                   ))
+            """,
+            cycle * 3,
+        )
+        conn.execute("DELETE FROM candidate_entry WHERE cycle_id = ?", cycle)
+        conn.execute("DELETE FROM person WHERE id NOT IN (SELECT person_id FROM candidate_entry)")
+        conn.execute(
+            "DELETE FROM constituency WHERE cycle_id = ? AND id LIKE 'const-auto-%'", cycle
+        )
+        # Units rows never carry unit_context_raw; candidates backfill it.
+        conn.execute("UPDATE constituency SET unit_context_raw = NULL WHERE cycle_id = ?", cycle)
+    if "congressional_units" in stages:
+        conn.execute(
+            """
+            DELETE FROM constituency_district
+            WHERE constituency_id IN (SELECT id FROM constituency WHERE cycle_id = ?)
+            """,
+            cycle,
+        )
+        conn.execute("DELETE FROM constituency WHERE cycle_id = ?", cycle)
+        conn.execute("DELETE FROM locality WHERE cycle_id = ?", cycle)
+
+
+def run_stages(conn: sqlite3.Connection, stages: set[str]) -> None:
+    if "cycle" in stages:
+        with PROFILER.stage("apply_cycle_timeline"):
+            apply_cycle_timeline(conn)
+    if "documents" in stages:
+        with PROFILER.stage("load_documents"):
+            load_documents(conn)
+    if "congressional_units" in stages:
+        with PROFILER.stage("load_congressional_units"):
+            maps = load_congressional_units(conn)
+    elif stages & {"candidates", "results"}:
+        with PROFILER.stage("load_unit_maps"):
+            maps = load_unit_maps(conn)
+    if "candidates" in stages:
+        with PROFILER.stage("load_candidates"):
+            load_candidates(conn, maps["locality_key_map"], maps["constituency_map"])
+        with PROFILER.stage("add_candidate_sources"):
+            add_candidate_sources(conn)
+        with PROFILER.stage("add_constituency_sources"):
+            add_constituency_sources(conn)
+    if "results" in stages:
+        with PROFILER.stage("load_cema_results"):
+            load_cema_results(conn, maps["locality_key_map"], maps["constituency_map"])
+        with PROFILER.stage("materialize_result_constituency_summary"):
+            materialize_result_constituency_summary(conn)
+    if "results_summary" in stages:
+        with PROFILER.stage("load_results_summary"):
+            load_results_summary(conn)
+    if "result_annotations" in stages:
+        with PROFILER.stage("load_result_annotations"):
+            load_result_annotations(conn)
+
+
+def build_into(conn: sqlite3.Connection, manifest: dict) -> None:
+    """Build the configured cycle from scratch into an empty database."""
+    PROFILER.attach(conn)
+    apply_bulk_pragmas(conn)
+    register_sql_functions(conn)
+    init_db(conn)
+    conn.execute(
+        """
+        INSERT INTO election_cycle (id, name, year, type)
+        VALUES (?, ?, ?, ?)
+        """,
+        (ELECTION_CYCLE_ID, ELECTION_CYCLE_NAME, ELECTION_CYCLE_YEAR, ELECTION_CYCLE_TYPE),
+    )
+    run_stages(conn, set(BUILD_STAGES))
+    write_manifest(conn, manifest)
+    conn.commit()
+    PROFILER.record_tables(conn)
+
+
+def build_full(manifest: dict) -> None:
     if os.path.exists(DB_PATH):
         os.remove(DB_PATH)
 
     conn = sqlite3.connect(DB_PATH)
     try:
+        build_into(conn, manifest)
+    finally:
+        conn.close()
+
+    print(f"Created {DB_PATH}")
+
+
+def build_incremental(manifest: dict) -> bool:
+    """Re-run only stages whose inputs changed; return False if a full build is needed."""
+    if not os.path.exists(DB_PATH):
+        return False
+
+    conn = sqlite3.connect(DB_PATH)
+    PROFILER.attach(conn)
+    try:
+        apply_bulk_pragmas(conn)
+        register_sql_functions(conn)
         init_db(conn)
-        conn.execute(
-            """
-            INSERT INTO election_cycle (id, name, year, type)
-            VALUES (?, ?, ?, ?)
-            """,
-            (ELECTION_CYCLE_ID, ELECTION_CYCLE_NAME, ELECTION_CYCLE_YEAR, ELECTION_CYCLE_TYPE),
-        )
-        manual_timelines = load_manual_timelines()
-        cycle_override = manual_timelines.get(ELECTION_CYCLE_ID)
-        if cycle_override:
-            conn.execute(
-                """
-                UPDATE election_cycle
-                SET start_date = ?, end_date = ?, notes = ?
-                WHERE id = ?
-                """,
-                (
-                    cycle_override.get("start_date"),
-                    cycle_override.get("end_date"),
-                    cycle_override.get("notes"),
-                    ELECTION_CYCLE_ID,
-                ),
-            )
-        load_documents(conn)
-        maps = load_congressional_units(conn)
-        load_candidates(conn, maps["locality_key_map"], maps["constituency_map"])
-        add_candidate_sources(conn)
-        add_constituency_sources(conn)
-        load_cema_results(conn, maps["locality_key_map"], maps["constituency_map"])
-        load_results_summary(conn)
-        load_result_annotations(conn)
+        previous = read_manifest(conn)
+        # Documents are referenced by every source row, so they force a full build.
+        if not previous or previous.get("documents") != manifest.get("documents"):
+            return False
+        stages = dirty_stages(previous, manifest)
+        if not stages:
+            print(f"Up to date: {DB_PATH}")
+            return True
+        with PROFILER.stage("clear_stages"):
+            clear_stages(conn, stages)
+        run_stages(conn, stages)
+        write_manifest(conn, manifest)
         conn.commit()
+        PROFILER.record_tables(conn)
     finally:
         conn.close()
 
-    print(f"Created {DB_PATH}")
+    ordered = [stage for stage in BUILD_STAGES if stage in stages]
+    print(f"Updated {DB_PATH} (stages: {', '.join(ordered)})")
+    return True
+
+
+def memory_db_uri(name: str) -> str:
+    """URI of a named in-memory database that other connections can ATTACH."""
+    return f"file:{name}?mode=memory&cache=shared"
+
+
+def build_in_memory(name: str) -> sqlite3.Connection:
+    """Build the configured cycle into the in-memory database ``name``.
+
+    The database lives as long as the returned connection stays open.
+    """
+    conn = sqlite3.connect(memory_db_uri(name), uri=True)
+    try:
+        build_into(conn, compute_manifest())
+    except BaseException:
+        conn.close()
+        raise
+    print(f"Built {ELECTION_CYCLE_ID} in memory")
+    return conn
+
+
+def build(incremental: bool = False) -> None:
+    """Build the configured cycle into ``DB_PATH``."""
+    ensure_dir(os.path.dirname(DB_PATH))
+    manifest = compute_manifest()
+    if not (incremental and build_incremental(manifest)):
+        build_full(manifest)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the SQLite staging DB.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Re-run only loader stages whose input files changed since the last build.",
+    )
+    parser.add_argument(
+        "--cycle",
+        default=DEFAULT_CYCLE_ID,
+        help=f"Cycle ID from data/cycles.json to build (default: {DEFAULT_CYCLE_ID}).",
+    )
+    parser.add_argument("--db", default=DB_PATH, help="Database to write (default: data/staging.db).")
+    args = parser.parse_args()
+
+    cycles = load_cycle_configs()
+    if args.cycle not in cycles:
+        parser.error(f"unknown cycle {args.cycle!r}; configured: {', '.join(cycles)}")
+    configure_cycle(cycles[args.cycle], os.path.abspath(args.db))
+    build(args.incremental)
+    PROFILER.finish()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""Candidate rows straight from the official candidate-list DOCX files.
+
+Each ``candidates-list/*.docx`` is a run of unit blocks: a "UBBC Tỉnh/Thành
+phố: ... Đơn vị bầu cử Số N: ..." paragraph followed by a table whose first
+two rows are a merged header (``w:gridSpan`` across "Trình độ học vấn",
+``w:vMerge`` down every other column) and whose remaining rows are
+candidates. ``word/document.xml`` is read from the zip with a streaming
+``iterparse`` and cleared row by row, so memory stays flat however long the
+list is.
+
+Rows come out keyed by ``CANDIDATE_COLUMNS``, the header of the CSV twins
+that ``load_candidates`` reads. Cell text is stripped but not
+otherwise normalized, and line breaks (``w:br``) add nothing, as in those
+files. ``extract_candidate_lists`` parses several files on a process pool
+and caches each file's rows by its SHA-256, so re-runs only parse DOCX files
+that changed.
+
+The CSVs stay the ingest source, so hand fixes to them are kept: run this
+directly to check the CSV twins against their DOCX files (the default), or
+``--write`` to regenerate them. The build parses a DOCX itself only for a
+list that has no CSV yet, and warns when a CSV differs from its DOCX.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+CANDIDATES_DIR = os.path.join(DATA_DIR, "candidates-list")
+DEFAULT_CACHE_DIR = os.path.join(DATA_DIR, "candidates-list", ".docx-cache")
+# Bump when the parser's output changes so stale cache entries are ignored.
+CACHE_VERSION = 1
+
+CANDIDATE_COLUMNS = [
+    "unit_context",
+    "province_or_city",
+    "unit_number",
+    "unit_description",
+    "STT",
+    "Họ và tên",
+    "Ngày tháng năm sinh",
+    "Giới tính",
+    "Quốc tịch",
+    "Dân tộc",
+    "Tôn giáo",
+    "Quê quán",
+    "Nơi ở hiện nay",
+    "Trình độ học vấn - Giáo dục phổ thông",
+    "Trình độ học vấn - Chuyên môn, nghiệp vụ",
+    "Trình độ học vấn - Học hàm, học vị",
+    "Trình độ học vấn - Lý luận chính trị",
+    "Trình độ học vấn - Ngoại ngữ",
+    "Nghề nghiệp, chức vụ",
+    "Nơi công tác",
+    "Ngày vào Đảng",
+    "Là đại biểu QH",
+    "Là đại biểu HĐND",
+]
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_TBL = f"{W_NS}tbl"
+W_TR = f"{W_NS}tr"
+W_TC = f"{W_NS}tc"
+W_P = f"{W_NS}p"
+W_T = f"{W_NS}t"
+W_TAB = f"{W_NS}tab"
+W_GRID_SPAN = f"{W_NS}gridSpan"
+W_VMERGE = f"{W_NS}vMerge"
+W_VAL = f"{W_NS}val"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+UNIT_CONTEXT_RE = re.compile(
+    r"^UBBC\s+Tỉnh/Thành phố:\s*(.*?)\s*Đơn vị bầu cử\s+Số\s*(\d+)\s*:\s*(.*)$"
+)
+
+
+class Cell:
+    """Text of one ``w:tc`` plus its horizontal span and vertical merge state."""
+
+    __slots__ = ("text", "span", "vmerge")
+
+    def __init__(self, text: str, span: int, vmerge: str | None) -> None:
+        self.text = text
+        self.span = span
+        # None, "restart" (top of a merge) or "continue" (merged into the cell above).
+        self.vmerge = vmerge
+
+
+def iter_document_blocks(fh) -> Iterator[tuple[str, object]]:
+    """Body paragraphs and table rows of a ``word/document.xml`` stream, in order.
+
+    Yields ``("paragraph", text)`` for top-level paragraphs, ``("row",
+    [Cell, ...])`` for rows of top-level tables and ``("table_end", None)``
+    after each such table. Nested tables fold into their cell's text, and
+    ``mc:Fallback`` copies of alternate content are skipped.
+    """
+    table_depth = 0
+    fallback_depth = 0
+    paragraph_parts: list[str] = []
+    cell_parts: list[str] | None = None
+    cell_span = 1
+    cell_vmerge: str | None = None
+    row: list[Cell] | None = None
+
+    for event, elem in ET.iterparse(fh, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag == W_TBL:
+                table_depth += 1
+            elif tag == MC_FALLBACK:
+                fallback_depth += 1
+            elif table_depth == 1 and tag == W_TR:
+                row = []
+            elif table_depth == 1 and tag == W_TC:
+                cell_parts, cell_span, cell_vmerge = [], 1, None
+            elif tag == W_P and cell_parts is None:
+                paragraph_parts = []
+            continue
+
+        if fallback_depth:
+            if tag == MC_FALLBACK:
+                fallback_depth -= 1
+            elem.clear()
+            continue
+        parts = paragraph_parts if cell_parts is None else cell_parts
+        if tag == W_T:
+            parts.append(elem.text or "")
+        elif tag == W_TAB:
+            parts.append(" ")
+        elif tag == W_P:
+            if cell_parts is not None:
+                cell_parts.append(" ")
+            elif table_depth == 0:
+                yield "paragraph", "".join(paragraph_parts).strip()
+                elem.clear()
+        elif table_depth == 1 and tag == W_GRID_SPAN:
+            cell_span = int(elem.get(W_VAL, "1"))
+        elif table_depth == 1 and tag == W_VMERGE:
+            cell_vmerge = elem.get(W_VAL) or "continue"
+        elif table_depth == 1 and tag == W_TC:
+            row.append(Cell("".join(cell_parts).strip(), cell_span, cell_vmerge))
+            cell_parts = None
+        elif table_depth == 1 and tag == W_TR:
+            yield "row", row
+            row = None
+            elem.clear()
+        elif tag == W_TBL:
+            table_depth -= 1
+            if table_depth == 0:
+                yield "table_end", None
+                elem.clear()
+
+
+def expand_row(cells: list[Cell], above: list[str] | None) -> list[str]:
+    """Grid-aligned values: spans repeat their text, vertical merges copy the row above."""
+    values: list[str] = []
+    for cell in cells:
+        for _ in range(cell.span):
+            column = len(values)
+            if cell.vmerge == "continue" and above is not None and column < len(above):
+                values.append(above[column])
+            else:
+                values.append(cell.text)
+    return values
+
+
+def header_names(header_rows: list[list[str]]) -> list[str]:
+    """Column names from the merged header rows, "Group - Sub" where a group spans columns."""
+    names = []
+    for column in zip(*header_rows):
+        parts: list[str] = []
+        for text in column:
+            text = " ".join(text.split())
+            if text and text not in parts:
+                parts.append(text)
+        names.append(" - ".join(parts))
+    return names
+
+
+def parse_unit_context(text: str) -> dict | None:
+    match = UNIT_CONTEXT_RE.match(text)
+    if match is None:
+        return None
+    return {
+        "unit_context": text,
+        "province_or_city": match.group(1),
+        "unit_number": match.group(2),
+        "unit_description": match.group(3),
+    }
+
+
+def iter_candidate_rows(fh, source: str = "document.xml") -> Iterator[dict]:
+    """Candidate rows, keyed by ``CANDIDATE_COLUMNS``, from a document.xml stream."""
+    unit: dict | None = None
+    header_rows: list[list[str]] = []
+    columns: list[str] | None = None
+    above: list[str] | None = None
+
+    for kind, value in iter_document_blocks(fh):
+        if kind == "paragraph":
+            parsed = parse_unit_context(value)
+            if parsed is not None:
+                unit = parsed
+            continue
+        if kind == "table_end":
+            header_rows, columns, above = [], None, None
+            continue
+
+        values = expand_row(value, above)
+        above = values
+        if columns is None:
+            # Header rows run until the first row whose STT cell is a number.
+            if not values or not values[0].isdigit():
+                header_rows.append(values)
+                continue
+            columns = header_names(header_rows)
+            # The first four columns come from the unit paragraph.
+            missing = [name for name in CANDIDATE_COLUMNS[4:] if name not in columns]
+            if missing:
+                raise ValueError(f"{source}: table header lacks {', '.join(missing)}")
+        if unit is None:
+            raise ValueError(f"{source}: candidate table before any unit paragraph")
+        if not any(values):
+            continue
+        row = dict(unit)
+        row.update(zip(columns, values))
+        yield {name: row.get(name, "") for name in CANDIDATE_COLUMNS}
+
+
+def parse_candidate_docx(path: str) -> list[dict]:
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as fh:
+        return list(iter_candidate_rows(fh, os.path.basename(path)))
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DocxRowCache:
+    """Parsed rows per DOCX content hash, one JSON file each under ``cache_dir``."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR) -> None:
+        self.cache_dir = cache_dir
+
+    def _path(self, sha256: str) -> str:
+        return os.path.join(self.cache_dir, f"{sha256}.json")
+
+    def get(self, sha256: str) -> list[dict] | None:
+        try:
+            with open(self._path(sha256), "r", encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if entry.get("version") != CACHE_VERSION:
+            return None
+        return entry["rows"]
+
+    def put(self, sha256: str, rows: list[dict]) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data = json.dumps({"version": CACHE_VERSION, "rows": rows}, ensure_ascii=False)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.write(data)
+            os.replace(tmp_path, self._path(sha256))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def extract_candidate_lists(
+    paths: list[str],
+    workers: int | None = None,
+    cache: DocxRowCache | None = None,
+) -> dict[str, list[dict]]:
+    """Rows per DOCX path, parsing cache misses on a process pool.
+
+    ``workers=1`` parses in-process; ``cache=None`` disables the cache.
+    """
+    hashes = {path: file_sha256(path) for path in paths}
+    rows_by_path: dict[str, list[dict]] = {}
+    pending = []
+    for path in paths:
+        cached = cache.get(hashes[path]) if cache is not None else None
+        if cached is None:
+            pending.append(path)
+        else:
+            rows_by_path[path] = cached
+
+    if len(pending) > 1 and workers != 1:
+        max_workers = min(workers or os.cpu_count() or 1, len(pending))
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            parsed = list(pool.map(parse_candidate_docx, pending))
+    else:
+        parsed = [parse_candidate_docx(path) for path in pending]
+    for path, rows in zip(pending, parsed):
+        rows_by_path[path] = rows
+        if cache is not None:
+            cache.put(hashes[path], rows)
+    return {path: rows_by_path[path] for path in paths}
+
+
+def rows_to_csv(rows: list[dict]) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CANDIDATE_COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def csv_twin(path: str) -> str:
+    return os.path.splitext(path)[0] + ".csv"
+
+
+def diff_rows(expected: list[dict], actual: list[dict]) -> list[str]:
+    """Human-readable differences between two row lists (first few only)."""
+    problems = []
+    if len(expected) != len(actual):
+        problems.append(f"{len(actual)} rows, expected {len(expected)}")
+    for index, (want, got) in enumerate(zip(expected, actual), start=1):
+        for name in CANDIDATE_COLUMNS:
+            if (want.get(name) or "") != (got.get(name) or ""):
+                problems.append(f"row {index} {name}: {got.get(name)!r} != {want.get(name)!r}")
+        if len(problems) >= 5:
+            break
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract candidate rows from the DOCX lists.")
+    parser.add_argument("paths", nargs="*", help="DOCX files (default: candidates-list/*.docx).")
+    parser.add_argument("--write", action="store_true", help="Rewrite each DOCX file's CSV twin.")
+    parser.add_argument("--workers", type=int, help="Parser processes (default: CPU count).")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Parsed-row cache directory.")
+    parser.add_argument("--no-cache", action="store_true", help="Parse every file, ignoring the cache.")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob(os.path.join(CANDIDATES_DIR, "*.docx")))
+    if not paths:
+        sys.exit("No DOCX files found.")
+    cache = None if args.no_cache else DocxRowCache(args.cache_dir)
+    rows_by_path = extract_candidate_lists(paths, workers=args.workers, cache=cache)
+
+    mismatched = 0
+    for path, rows in rows_by_path.items():
+        twin = csv_twin(path)
+        name = os.path.basename(path)
+        if args.write:
+            with open(twin, "w", encoding="utf-8", newline="") as fh:
+                fh.write(rows_to_csv(rows))
+            print(f"{name}: wrote {len(rows)} rows to {os.path.basename(twin)}")
+            continue
+        if not os.path.exists(twin):
+            print(f"{name}: {len(rows)} rows, no CSV twin")
+            mismatched += 1
+            continue
+        with open(twin, "r", encoding="utf-8") as fh:
+            expected = list(csv.DictReader(fh))
+        problems = diff_rows(expected, rows)
+        if problems:
+            mismatched += 1
+            print(f"{name}: differs from {os.path.basename(twin)}")
+            for problem in problems:
+                print(f"  {problem}")
+        else:
+            print(f"{name}: {len(rows)} rows match {os.path.basename(twin)}")
+    if mismatched:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,30 @@
 #!/usr/bin/env python3
+import argparse
+import hashlib
 import json
 import os
 import sqlite3
-from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timezone
 import re
+import shutil
+import statistics
 import unicodedata
+from itertools import groupby
+from typing import Callable, Iterable, Iterator
+
+from json_writer import (
+    COMPRESSED_SUFFIXES,
+    DEFAULT_BROTLI_QUALITY,
+    DEFAULT_GZIP_LEVEL,
+    DEFAULT_WORKERS,
+    OMIT,
+    JsonWriter,
+    RawJson,
+    item_spans,
+    serialize,
+)
+from pipeline_profiler import PipelineProfiler
 
 
 DATA_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -12,6 +32,33 @@ ROOT = os.path.dirname(os.path.dirname(DATA_DIR))
 DB_PATH = os.path.join(os.path.dirname(DATA_DIR), "staging.db")
 OUTPUT_ROOT = os.path.join(ROOT, "public", "data")
 
+PROFILER = PipelineProfiler.from_env("export-json")
+
+# Schema 1 inlines full document metadata into every source; schema 2 keeps
+# only references and adds a per-payload ``documents`` dictionary.
+SCHEMA_VERSIONS = (1, 2)
+DEFAULT_SCHEMA_VERSION = 1
+
+# "sql" builds candidate details and constituency records with SQLite's
+# JSON1 functions instead of Python dicts.
+ENGINES = ("python", "sql")
+DEFAULT_ENGINE = "python"
+
+# Processes used when several cycles are exported; each takes one cycle.
+DEFAULT_CYCLE_WORKERS = os.cpu_count() or 1
+
+# Groupings for --bundle-details.
+BUNDLE_BY = ("constituency", "locality")
+
+# Directories holding one small file per record; each is profiled as one stage.
+SHARD_DIRS = {
+    "candidates_detail",
+    "candidates_detail_bundles",
+    "candidates_index",
+    "results_by_constituency",
+    "results_by_candidate",
+}
+
 
 def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
@@ -39,12 +86,11 @@ def constituency_label(unit_number: int | None) -> str:
     return f"Đơn vị bầu cử số {unit_number}"
 
 
-def write_json(path: str, payload: dict) -> None:
-    ensure_dir(os.path.dirname(path))
-    with open(path, "w", encoding="utf-8") as fh:
-        json.dump(payload, fh, ensure_ascii=False, indent=2)
-        fh.write("\n")
-
+def profile_name(path: str) -> str:
+    name = os.path.relpath(path, OUTPUT_ROOT)
+    if os.path.basename(os.path.dirname(path)) in SHARD_DIRS:
+        name = os.path.join(os.path.dirname(name), "*.json")
+    return f"write {name}"
 
 
 def fetch_one(conn: sqlite3.Connection, query: str, params: tuple = ()) -> sqlite3.Row:
@@ -55,13 +101,346 @@ def fetch_one(conn: sqlite3.Connection, query: str, params: tuple = ()) -> sqlit
     return row
 
 
-def fetch_sources(conn: sqlite3.Connection, record_type: str, record_id: str) -> list[dict]:
-    return [
-        {
+SOURCE_COLUMNS = """
+    s.record_id,
+    s.field,
+    s.document_id,
+    s.url,
+    s.notes,
+    d.title,
+    d.url AS document_url,
+    d.doc_type,
+    d.published_date,
+    d.fetched_date
+"""
+
+
+def source_record(row: sqlite3.Row, document_refs: bool = False) -> dict:
+    """A ``sources`` entry; with ``document_refs`` it only names its document
+    and keeps ``url`` only when the source overrides the document URL."""
+    if document_refs:
+        return {
             "field": row["field"],
             "document_id": row["document_id"],
+            "url": row["url"] if row["url"] != row["document_url"] else None,
+            "notes": row["notes"],
+        }
+    return {
+        "field": row["field"],
+        "document_id": row["document_id"],
+        "title": row["title"],
+        "url": row["url"] or row["document_url"],
+        "doc_type": row["doc_type"],
+        "published_date": row["published_date"],
+        "fetched_date": row["fetched_date"],
+        "notes": row["notes"],
+    }
+
+
+def query_sources(
+    conn: sqlite3.Connection, record_type: str, record_ids_sql: str, params: tuple
+) -> sqlite3.Cursor:
+    """Sources of every record selected by ``record_ids_sql``, by record ID."""
+    return conn.execute(
+        f"""
+        SELECT {SOURCE_COLUMNS}
+        FROM source s
+        JOIN document d ON d.id = s.document_id
+        WHERE s.record_type = ? AND s.record_id IN ({record_ids_sql})
+        ORDER BY s.record_id, s.field, d.title
+        """,
+        (record_type, *params),
+    )
+
+
+def fetch_sources_by_record(
+    conn: sqlite3.Connection,
+    record_type: str,
+    record_ids_sql: str,
+    params: tuple,
+    document_refs: bool = False,
+) -> dict[str, list[dict]]:
+    """Load sources for every record selected by ``record_ids_sql`` in one query."""
+    sources: dict[str, list[dict]] = {}
+    for row in query_sources(conn, record_type, record_ids_sql, params):
+        sources.setdefault(row["record_id"], []).append(source_record(row, document_refs))
+    return sources
+
+
+class ChildGroups:
+    """Child rows read in step with their parents instead of held in a map.
+
+    ``rows`` must be grouped by ``key`` in the order the parents are visited,
+    and only hold rows of visited parents; ``take`` is then a merge step, so
+    only one group is in memory at a time.
+    """
+
+    def __init__(self, rows: Iterable, key: str, build: Callable = lambda row: row) -> None:
+        self.groups = groupby(rows, key=lambda row: row[key])
+        self.build = build
+        self.pending = next(self.groups, None)
+
+    def take(self, parent_id) -> list:
+        if self.pending is None or self.pending[0] != parent_id:
+            return []
+        items = [self.build(row) for row in self.pending[1]]
+        self.pending = next(self.groups, None)
+        return items
+
+
+def source_json_sql(document_refs: bool = False) -> str:
+    """``source_record`` as a JSON1 expression over ``source s JOIN document d``."""
+    if document_refs:
+        return """json_object(
+            'field', s.field,
+            'document_id', s.document_id,
+            'url', CASE WHEN s.url IS NOT d.url THEN s.url END,
+            'notes', s.notes
+        )"""
+    return """json_object(
+        'field', s.field,
+        'document_id', s.document_id,
+        'title', d.title,
+        'url', CASE WHEN COALESCE(s.url, '') = '' THEN d.url ELSE s.url END,
+        'doc_type', d.doc_type,
+        'published_date', d.published_date,
+        'fetched_date', d.fetched_date,
+        'notes', s.notes
+    )"""
+
+
+def sources_json_sql(record_type: str, record_ids_sql: str, document_refs: bool = False) -> str:
+    """``record_id, items``: each record's sources as a JSON array, in export order."""
+    return f"""
+        SELECT record_id, json_group_array(json(source)) AS items
+        FROM (
+            SELECT s.record_id, {source_json_sql(document_refs)} AS source
+            FROM source s
+            JOIN document d ON d.id = s.document_id
+            WHERE s.record_type = '{record_type}' AND s.record_id IN ({record_ids_sql})
+            ORDER BY s.record_id, s.field, d.title
+        )
+        GROUP BY record_id
+    """
+
+
+def constituency_records_sql(document_refs: bool = False) -> str:
+    """``id, locality_id, unit_number, sort_name, record``: constituency
+    records built by SQLite.
+
+    Needs the ``fold_text`` and ``constituency_label`` functions registered on
+    the connection and a ``:cycle_id`` parameter.
+    """
+    constituency_ids_sql = "SELECT id FROM constituency WHERE cycle_id = :cycle_id"
+    district_ids_sql = (
+        f"SELECT id FROM constituency_district WHERE constituency_id IN ({constituency_ids_sql})"
+    )
+    return f"""
+        WITH constituency_sources AS (
+            {sources_json_sql("constituency", constituency_ids_sql, document_refs)}
+        ),
+        district_sources AS (
+            {sources_json_sql("constituency_district", district_ids_sql, document_refs)}
+        ),
+        districts AS (
+            SELECT constituency_id, json_group_array(json(district)) AS items
+            FROM (
+                SELECT cd.constituency_id,
+                       json_object(
+                           'name_vi', cd.name,
+                           'name_folded', cd.name_folded,
+                           'sources', json(COALESCE(ds.items, '[]'))
+                       ) AS district
+                FROM constituency_district cd
+                LEFT JOIN district_sources ds ON ds.record_id = cd.id
+                WHERE cd.constituency_id IN ({constituency_ids_sql})
+                ORDER BY cd.constituency_id, cd.name
+            )
+            GROUP BY constituency_id
+        )
+        SELECT c.id,
+               c.locality_id,
+               c.unit_number,
+               COALESCE(l.name, '') AS sort_name,
+               json_object(
+                   'id', c.id,
+                   'locality_id', c.locality_id,
+                   'unit_number', c.unit_number,
+                   'seat_count', c.seat_count,
+                   'name_vi', constituency_label(c.unit_number),
+                   'name_folded', fold_text(constituency_label(c.unit_number)),
+                   'description', c.description,
+                   'unit_context_raw', c.unit_context_raw,
+                   'districts', json(COALESCE(dist.items, '[]')),
+                   'sources', json(COALESCE(cs.items, '[]'))
+               ) AS record
+        FROM constituency c
+        LEFT JOIN locality l ON l.id = c.locality_id AND l.cycle_id = :cycle_id
+        LEFT JOIN districts dist ON dist.constituency_id = c.id
+        LEFT JOIN constituency_sources cs ON cs.record_id = c.id
+        WHERE c.cycle_id = :cycle_id
+    """
+
+
+def candidate_details_sql(order_sql: str, document_refs: bool = False) -> str:
+    """``entry_id, constituency_id, locality_id, detail``: detail payloads
+    built by SQLite, with the same needs as ``constituency_records_sql``."""
+    entry_ids_sql = """
+        SELECT ce.id
+        FROM candidate_entry ce
+        JOIN person p ON p.id = ce.person_id
+        JOIN constituency c ON c.id = ce.constituency_id
+        WHERE ce.cycle_id = :cycle_id
+    """
+    return f"""
+        WITH constituency_records AS ({constituency_records_sql(document_refs)}),
+        locality_records AS (
+            SELECT id,
+                   json_object('id', id, 'name_vi', name, 'name_folded', name_folded, 'type', type)
+                       AS record
+            FROM locality
+            WHERE cycle_id = :cycle_id
+        ),
+        attributes AS (
+            SELECT candidate_entry_id,
+                   json_group_array(json_object('key', key, 'value', value)) AS items
+            FROM (
+                SELECT candidate_entry_id, key, value
+                FROM candidate_attribute
+                WHERE candidate_entry_id IN ({entry_ids_sql})
+                ORDER BY candidate_entry_id, key
+            )
+            GROUP BY candidate_entry_id
+        ),
+        changelogs AS (
+            SELECT record_id,
+                   json_group_array(
+                       json_object('change_type', change_type, 'changed_at', changed_at, 'summary', summary)
+                   ) AS items
+            FROM (
+                SELECT record_id, change_type, changed_at, summary
+                FROM change_log
+                WHERE record_type = 'candidate_entry' AND record_id IN ({entry_ids_sql})
+                ORDER BY record_id, changed_at, rowid
+            )
+            GROUP BY record_id
+        ),
+        candidate_sources AS ({sources_json_sql("candidate_entry", entry_ids_sql, document_refs)})
+        SELECT ce.id AS entry_id,
+               ce.constituency_id,
+               c.locality_id,
+               json_object(
+                   'entry_id', ce.id,
+                   'cycle_id', :cycle_id,
+                   'person', json_object(
+                       'id', ce.person_id,
+                       'full_name', p.full_name,
+                       'full_name_folded', p.full_name_folded,
+                       'dob', p.dob,
+                       'gender', p.gender,
+                       'nationality', p.nationality,
+                       'ethnicity', p.ethnicity,
+                       'religion', p.religion,
+                       'birthplace', p.birthplace,
+                       'current_residence', p.current_residence
+                   ),
+                   'entry', json_object(
+                       'constituency_id', ce.constituency_id,
+                       'list_order', ce.list_order,
+                       'party_member_since', ce.party_member_since,
+                       'is_na_delegate', ce.is_na_delegate,
+                       'is_council_delegate', ce.is_council_delegate
+                   ),
+                   'locality', json(lr.record),
+                   'constituency', json(cr.record),
+                   'attributes', json(COALESCE(a.items, '[]')),
+                   'sources', json(COALESCE(cs.items, '[]')),
+                   'changelog', json(COALESCE(cl.items, '[]'))
+               ) AS detail
+        FROM candidate_entry ce
+        JOIN person p ON p.id = ce.person_id
+        JOIN constituency c ON c.id = ce.constituency_id
+        LEFT JOIN locality_records lr ON lr.id = c.locality_id
+        LEFT JOIN constituency_records cr ON cr.id = ce.constituency_id
+        LEFT JOIN attributes a ON a.candidate_entry_id = ce.id
+        LEFT JOIN changelogs cl ON cl.record_id = ce.id
+        LEFT JOIN candidate_sources cs ON cs.record_id = ce.id
+        WHERE ce.cycle_id = :cycle_id
+        ORDER BY {order_sql}
+    """
+
+
+def search_haystack(record: dict) -> str:
+    """Text the candidates search matches against, joined as the client does."""
+    fields = (record["name_folded"], record["locality_folded"], record["constituency_folded"])
+    return " ".join(value for value in fields if value)
+
+
+def encode_postings(offsets: list[int]) -> str:
+    """Sorted offsets as comma-separated gaps (the first value is absolute)."""
+    previous = 0
+    gaps = []
+    for offset in offsets:
+        gaps.append(str(offset - previous))
+        previous = offset
+    return ",".join(gaps)
+
+
+def build_search_index(index_records: Iterable[dict]) -> dict:
+    """Token and trigram postings over the candidates index records.
+
+    Offsets point into ``candidates_index.json`` ``records``. Trigrams are
+    taken over the whole haystack (spaces included), so intersecting them and
+    checking the candidates keeps plain substring semantics; queries shorter
+    than three characters can't span a space and match through the tokens.
+    """
+    tokens: dict[str, list[int]] = {}
+    trigrams: dict[str, list[int]] = {}
+    record_count = 0
+    for offset, record in enumerate(index_records):
+        record_count += 1
+        haystack = search_haystack(record)
+        for token in set(haystack.split()):
+            tokens.setdefault(token, []).append(offset)
+        for trigram in {haystack[index : index + 3] for index in range(len(haystack) - 2)}:
+            trigrams.setdefault(trigram, []).append(offset)
+    return {
+        "normalization": "fold_text",
+        "fields": ["name_folded", "locality_folded", "constituency_folded"],
+        "record_count": record_count,
+        "postings_encoding": "delta",
+        "tokens": {key: encode_postings(tokens[key]) for key in sorted(tokens)},
+        "trigrams": {key: encode_postings(trigrams[key]) for key in sorted(trigrams)},
+    }
+
+
+def parse_dob(value: str | None) -> date | None:
+    match = re.fullmatch(r"\s*(\d{1,2})/(\d{1,2})/(\d{4})\s*", value or "")
+    if not match:
+        return None
+    day, month, year = (int(part) for part in match.groups())
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def age_on(dob: date, reference: date) -> int:
+    return reference.year - dob.year - ((reference.month, reference.day) < (dob.month, dob.day))
+
+
+def share(count: int, total: int) -> float | None:
+    return round(count * 100 / total, 2) if total else None
+
+
+def fetch_documents(conn: sqlite3.Connection, cycle_id: str) -> dict[str, dict]:
+    """The cycle's documents keyed by ID, in title order."""
+    return {
+        row["id"]: {
+            "id": row["id"],
             "title": row["title"],
-            "url": row["url"] or row["document_url"],
+            "url": row["url"],
+            "file_path": row["file_path"],
             "doc_type": row["doc_type"],
             "published_date": row["published_date"],
             "fetched_date": row["fetched_date"],
@@ -69,63 +448,115 @@ def fetch_sources(conn: sqlite3.Connection, record_type: str, record_id: str) ->
         }
         for row in conn.execute(
             """
-            SELECT s.field,
-                   s.document_id,
-                   s.url,
-                   s.notes,
-                   d.title,
-                   d.url AS document_url,
-                   d.doc_type,
-                   d.published_date,
-                   d.fetched_date
-            FROM source s
-            JOIN document d ON d.id = s.document_id
-            WHERE s.record_type = ? AND s.record_id = ?
-            ORDER BY s.field, d.title
+            SELECT d.id, d.title, d.url, d.file_path, d.doc_type, d.published_date,
+                   d.fetched_date, d.notes
+            FROM document d
+            JOIN election_cycle_document cd ON cd.document_id = d.id
+            WHERE cd.cycle_id = ?
+            ORDER BY d.title
             """,
-            (record_type, record_id),
-        ).fetchall()
-    ]
+            (cycle_id,),
+        )
+    }
 
 
-def fetch_document(conn: sqlite3.Connection, document_id: str) -> dict | None:
-    row = conn.execute(
-        """
-        SELECT id, title, url, file_path, doc_type, published_date, fetched_date, notes
-        FROM document
-        WHERE id = ?
-        """,
-        (document_id,),
-    ).fetchone()
-    if not row:
-        return None
-    return {
-        "id": row["id"],
-        "title": row["title"],
-        "url": row["url"],
-        "file_path": row["file_path"],
-        "doc_type": row["doc_type"],
-        "published_date": row["published_date"],
-        "fetched_date": row["fetched_date"],
-        "notes": row["notes"],
-    }
+def document_link(documents: dict[str, dict], document_id: str | None, document_refs: bool) -> dict:
+    """The ``source`` of a record: the document itself, or its ID under schema 2."""
+    if document_refs:
+        return {"source_document_id": document_id}
+    return {"source": documents.get(document_id) if document_id else None}
 
 
-def export_cycle(conn: sqlite3.Connection) -> None:
-    conn.row_factory = sqlite3.Row
+def referenced_documents(value, found: set[str]) -> set[str]:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in ("document_id", "source_document_id") and isinstance(item, str):
+                found.add(item)
+            else:
+                referenced_documents(item, found)
+    elif isinstance(value, list):
+        for item in value:
+            referenced_documents(item, found)
+    return found
 
-    cycle_row = fetch_one(
-        conn,
-        """
-        SELECT id, name, year, type, start_date, end_date, notes
-        FROM election_cycle
-        ORDER BY year DESC
-        LIMIT 1
-        """,
+
+def with_documents(payload: dict, documents: dict[str, dict]) -> dict:
+    """Stamp a schema 2 payload and attach the documents it references."""
+    ids = referenced_documents(payload, set())
+    stamped = {"schema_version": 2, **payload}
+    if ids:
+        stamped["documents"] = {doc_id: doc for doc_id, doc in documents.items() if doc_id in ids}
+    return stamped
+
+
+def with_streamed_documents(payload: dict, documents: dict[str, dict]) -> dict:
+    """``with_documents`` for streamed payloads: references are collected as
+    the records are written and ``documents`` is filled in last."""
+    ids: set[str] = set()
+
+    def tracked(records: Iterator) -> Iterator:
+        for record in records:
+            referenced_documents(record, ids)
+            yield record
+
+    stamped: dict = {"schema_version": 2}
+    for key, value in payload.items():
+        if isinstance(value, Iterator):
+            stamped[key] = tracked(value)
+        else:
+            referenced_documents({key: value}, ids)
+            stamped[key] = value
+    stamped["documents"] = lambda: (
+        {doc_id: doc for doc_id, doc in documents.items() if doc_id in ids} if ids else OMIT
     )
+    return stamped
+
+
+def export_cycle(
+    conn: sqlite3.Connection,
+    writer: JsonWriter,
+    schema_version: int = DEFAULT_SCHEMA_VERSION,
+    shard_index: bool = False,
+    bundle_details: str | None = None,
+    engine: str = DEFAULT_ENGINE,
+    cycle_id: str | None = None,
+) -> None:
+    """Export one cycle (the latest one unless ``cycle_id`` is given)."""
+    conn.row_factory = sqlite3.Row
+
+    if cycle_id is None:
+        cycle_row = fetch_one(
+            conn,
+            """
+            SELECT id, name, year, type, start_date, end_date, notes
+            FROM election_cycle
+            ORDER BY year DESC
+            LIMIT 1
+            """,
+        )
+    else:
+        cycle_row = fetch_one(
+            conn,
+            """
+            SELECT id, name, year, type, start_date, end_date, notes
+            FROM election_cycle
+            WHERE id = ?
+            """,
+            (cycle_id,),
+        )
     cycle_id = cycle_row["id"]
     generated_at = utc_now()
     base_dir = os.path.join(OUTPUT_ROOT, "elections", cycle_id)
+    document_refs = schema_version >= 2
+    documents = fetch_documents(conn, cycle_id)
+
+    def emit(path: str, payload: dict) -> None:
+        writer.write(path, with_documents(payload, documents) if document_refs else payload)
+
+    def emit_stream(path: str, payload: dict) -> None:
+        writer.write_stream(
+            path, with_streamed_documents(payload, documents) if document_refs else payload
+        )
 
     localities = [
         {
@@ -145,64 +576,97 @@ def export_cycle(conn: sqlite3.Connection) -> None:
         ).fetchall()
     ]
 
-    constituencies = []
-    for row in conn.execute(
-        """
-        SELECT id, locality_id, unit_number, seat_count, description, unit_context_raw
-        FROM constituency
-        WHERE cycle_id = ?
-        ORDER BY locality_id, unit_number
-        """,
-        (cycle_id,),
-    ).fetchall():
-        districts = [
-            {
-                "name_vi": dist["name"],
-                "name_folded": dist["name_folded"],
-                "sources": fetch_sources(conn, "constituency_district", dist["id"]),
-            }
-            for dist in conn.execute(
-                """
-                SELECT id, name, name_folded
-                FROM constituency_district
-                WHERE constituency_id = ?
-                ORDER BY name
-                """,
-                (row["id"],),
-            ).fetchall()
-        ]
-        constituencies.append(
-            {
-                "id": row["id"],
-                "locality_id": row["locality_id"],
-                "unit_number": row["unit_number"],
-                "seat_count": row["seat_count"],
-                "name_vi": constituency_label(row["unit_number"]),
-                "name_folded": fold_text(constituency_label(row["unit_number"])),
-                "description": row["description"],
-                "unit_context_raw": row["unit_context_raw"],
-                "districts": districts,
-                "sources": fetch_sources(conn, "constituency", row["id"]),
-            }
+    locality_map = {loc["id"]: loc for loc in localities}
+
+    if engine == "sql":
+        # SQLite assembles each record; schema 2 payloads are parsed again so
+        # their document references can be collected.
+        conn.create_function("fold_text", 1, fold_text, deterministic=True)
+        conn.create_function("constituency_label", 1, constituency_label, deterministic=True)
+        constituency_rows = conn.execute(
+            f"""
+            SELECT record
+            FROM ({constituency_records_sql(document_refs)})
+            ORDER BY sort_name, COALESCE(unit_number, 0), locality_id, unit_number
+            """,
+            {"cycle_id": cycle_id},
+        ).fetchall()
+        constituencies = [json.loads(row["record"]) for row in constituency_rows]
+        constituency_records = (
+            constituencies if document_refs else [RawJson(row["record"]) for row in constituency_rows]
         )
+    else:
+        # Per-record children are preloaded for the whole cycle and grouped in
+        # memory rather than queried once per record.
+        constituency_ids_sql = "SELECT id FROM constituency WHERE cycle_id = ?"
+        constituency_sources = fetch_sources_by_record(
+            conn, "constituency", constituency_ids_sql, (cycle_id,), document_refs
+        )
+        district_sources = fetch_sources_by_record(
+            conn,
+            "constituency_district",
+            f"SELECT id FROM constituency_district WHERE constituency_id IN ({constituency_ids_sql})",
+            (cycle_id,),
+            document_refs,
+        )
+        districts_by_constituency: dict[str, list[dict]] = {}
+        for dist in conn.execute(
+            f"""
+            SELECT id, constituency_id, name, name_folded
+            FROM constituency_district
+            WHERE constituency_id IN ({constituency_ids_sql})
+            ORDER BY constituency_id, name
+            """,
+            (cycle_id,),
+        ):
+            districts_by_constituency.setdefault(dist["constituency_id"], []).append(
+                {
+                    "name_vi": dist["name"],
+                    "name_folded": dist["name_folded"],
+                    "sources": district_sources.get(dist["id"], []),
+                }
+            )
 
-    locality_map = {loc["id"]: loc for loc in localities}
+        constituencies = []
+        for row in conn.execute(
+            """
+            SELECT id, locality_id, unit_number, seat_count, description, unit_context_raw
+            FROM constituency
+            WHERE cycle_id = ?
+            ORDER BY locality_id, unit_number
+            """,
+            (cycle_id,),
+        ).fetchall():
+            constituencies.append(
+                {
+                    "id": row["id"],
+                    "locality_id": row["locality_id"],
+                    "unit_number": row["unit_number"],
+                    "seat_count": row["seat_count"],
+                    "name_vi": constituency_label(row["unit_number"]),
+                    "name_folded": fold_text(constituency_label(row["unit_number"])),
+                    "description": row["description"],
+                    "unit_context_raw": row["unit_context_raw"],
+                    "districts": districts_by_constituency.get(row["id"], []),
+                    "sources": constituency_sources.get(row["id"], []),
+                }
+            )
 
-    constituencies.sort(
-        key=lambda record: (
-            locality_map.get(record["locality_id"], {}).get("name_vi", ""),
-            record["unit_number"] or 0,
+        constituencies.sort(
+            key=lambda record: (
+                locality_map.get(record["locality_id"], {}).get("name_vi", ""),
+                record["unit_number"] or 0,
+            )
         )
-    )
+        constituency_records = constituencies
 
     constituency_map = {c["id"]: c for c in constituencies}
 
-    index_records = []
-    detail_dir = os.path.join(base_dir, "candidates_detail")
-    ensure_dir(detail_dir)
-
-    candidate_rows = conn.execute(
-        """
+    # Records are built from cursors and written as they are read. Children
+    # (attributes, sources, annotations, ...) come from cursors sorted like
+    # their parents and are merged in one group at a time, so memory does not
+    # grow with the number of candidates or results.
+    candidates_sql = """
         SELECT ce.id AS entry_id,
                ce.person_id,
                ce.constituency_id,
@@ -225,16 +689,21 @@ def export_cycle(conn: sqlite3.Connection) -> None:
         JOIN person p ON p.id = ce.person_id
         JOIN constituency c ON c.id = ce.constituency_id
         WHERE ce.cycle_id = ?
-        ORDER BY c.locality_id, c.unit_number, ce.list_order
-        """,
-        (cycle_id,),
-    ).fetchall()
+        ORDER BY {order}
+    """
+    # Only entries the candidates query returns, so child cursors line up.
+    entry_ids_sql = """
+        SELECT ce.id
+        FROM candidate_entry ce
+        JOIN person p ON p.id = ce.person_id
+        JOIN constituency c ON c.id = ce.constituency_id
+        WHERE ce.cycle_id = ?
+    """
 
-    for row in candidate_rows:
+    def index_record(row: sqlite3.Row) -> dict:
         locality = locality_map.get(row["locality_id"])
         constituency = constituency_map.get(row["constituency_id"])
-
-        index_record = {
+        return {
             "entry_id": row["entry_id"],
             "person_id": row["person_id"],
             "name_vi": row["full_name"],
@@ -248,147 +717,360 @@ def export_cycle(conn: sqlite3.Connection) -> None:
             "unit_number": row["unit_number"],
             "list_order": row["list_order"],
         }
-        index_records.append(index_record)
 
-        attributes = [
-            {"key": attr["key"], "value": attr["value"]}
-            for attr in conn.execute(
-                """
-                SELECT key, value
-                FROM candidate_attribute
-                WHERE candidate_entry_id = ?
-                ORDER BY key
+    def iter_index_records() -> Iterator[dict]:
+        for row in conn.execute(
+            candidates_sql.format(order="c.locality_id, c.unit_number, ce.list_order"),
+            (cycle_id,),
+        ):
+            yield index_record(row)
+
+    results_summary_row = conn.execute(
+        """
+        SELECT id, total_seats, total_candidates, total_voters, total_votes_cast,
+               turnout_percent, valid_votes, invalid_votes, confirmed_winners,
+               unconfirmed_winners, source_document_id, notes
+        FROM election_result_summary
+        WHERE cycle_id = ?
+        ORDER BY id
+        LIMIT 1
+        """,
+        (cycle_id,),
+    ).fetchone()
+    results_source = document_link(
+        documents,
+        results_summary_row["source_document_id"] if results_summary_row else None,
+        document_refs,
+    )
+
+    def iter_result_records(order_sql: str, where_sql: str = "", where_params: tuple = ()) -> Iterator[dict]:
+        """Result records sorted by ``order_sql``, which must end in ``erc.id``."""
+        params = (cycle_id, *where_params)
+        sources = ChildGroups(
+            conn.execute(
+                f"""
+                SELECT {SOURCE_COLUMNS}
+                FROM election_result_candidate erc
+                JOIN source s
+                  ON s.record_type = 'election_result_candidate' AND s.record_id = erc.id
+                JOIN document d ON d.id = s.document_id
+                WHERE erc.cycle_id = ? {where_sql}
+                ORDER BY {order_sql}, s.field, d.title
                 """,
-                (row["entry_id"],),
-            ).fetchall()
-        ]
+                params,
+            ),
+            "record_id",
+            lambda row: source_record(row, document_refs),
+        )
+        annotations = ChildGroups(
+            conn.execute(
+                f"""
+                SELECT ann.id, ann.result_id, ann.status, ann.reason, ann.effective_date,
+                       ann.source_document_id, ann.notes
+                FROM election_result_candidate erc
+                JOIN election_result_candidate_annotation ann ON ann.result_id = erc.id
+                WHERE erc.cycle_id = ? {where_sql}
+                ORDER BY {order_sql}, ann.effective_date, ann.rowid
+                """,
+                params,
+            ),
+            "result_id",
+            lambda ann: {
+                "id": ann["id"],
+                "status": ann["status"],
+                "reason": ann["reason"],
+                "effective_date": ann["effective_date"],
+                **document_link(documents, ann["source_document_id"], document_refs),
+                "notes": ann["notes"],
+            },
+        )
+        for row in conn.execute(
+            f"""
+            SELECT erc.id, erc.candidate_entry_id, erc.candidate_name, erc.candidate_name_folded,
+                   erc.locality_id, erc.constituency_id, erc.unit_number, erc.unit_description,
+                   erc.order_in_unit, erc.votes, erc.votes_raw, erc.percent, erc.percent_raw, erc.notes,
+                   ce.person_id AS person_id, c.seat_count AS seat_count
+            FROM election_result_candidate erc
+            LEFT JOIN candidate_entry ce ON ce.id = erc.candidate_entry_id
+            LEFT JOIN constituency c ON c.id = erc.constituency_id
+            WHERE erc.cycle_id = ? {where_sql}
+            ORDER BY {order_sql}
+            """,
+            params,
+        ):
+            status = None
+            if row["order_in_unit"] is not None and row["seat_count"] is not None:
+                status = "won" if row["order_in_unit"] <= row["seat_count"] else "lost"
+            yield {
+                "id": row["id"],
+                "candidate_entry_id": row["candidate_entry_id"],
+                "person_id": row["person_id"],
+                "candidate_name_vi": row["candidate_name"],
+                "candidate_name_folded": row["candidate_name_folded"],
+                "locality_id": row["locality_id"],
+                "constituency_id": row["constituency_id"],
+                "unit_number": row["unit_number"],
+                "unit_description_vi": row["unit_description"],
+                "order_in_unit": row["order_in_unit"],
+                "status": status,
+                "votes": row["votes"],
+                "votes_raw": row["votes_raw"],
+                "percent": row["percent"],
+                "percent_raw": row["percent_raw"],
+                "notes": row["notes"],
+                "sources": sources.take(row["id"]),
+                "annotations": annotations.take(row["id"]),
+            }
 
-        changelog = [
-            {
+    # Candidate details are written in one pass, ordered by bundle when
+    # bundling so each bundle is complete before the next one starts.
+    detail_order = {
+        None: "ce.id",
+        "constituency": "ce.constituency_id, ce.id",
+        "locality": "c.locality_id, ce.id",
+    }[bundle_details]
+    def iter_details() -> Iterator[tuple[sqlite3.Row, dict | RawJson]]:
+        if engine == "sql":
+            for row in conn.execute(
+                candidate_details_sql(detail_order, document_refs), {"cycle_id": cycle_id}
+            ):
+                detail = row["detail"]
+                yield row, json.loads(detail) if document_refs else RawJson(detail)
+            return
+
+        entry_children_sql = """
+            JOIN candidate_entry ce ON ce.id = {entry_id}
+            JOIN person p ON p.id = ce.person_id
+            JOIN constituency c ON c.id = ce.constituency_id
+            WHERE ce.cycle_id = ?
+        """
+        attributes = ChildGroups(
+            conn.execute(
+                f"""
+                SELECT ca.candidate_entry_id, ca.key, ca.value
+                FROM candidate_attribute ca
+                {entry_children_sql.format(entry_id="ca.candidate_entry_id")}
+                ORDER BY {detail_order}, ca.key
+                """,
+                (cycle_id,),
+            ),
+            "candidate_entry_id",
+            lambda attr: {"key": attr["key"], "value": attr["value"]},
+        )
+        changelogs = ChildGroups(
+            conn.execute(
+                f"""
+                SELECT cl.record_id, cl.change_type, cl.changed_at, cl.summary
+                FROM change_log cl
+                {entry_children_sql.format(entry_id="cl.record_id")}
+                  AND cl.record_type = 'candidate_entry'
+                ORDER BY {detail_order}, cl.changed_at, cl.rowid
+                """,
+                (cycle_id,),
+            ),
+            "record_id",
+            lambda log: {
                 "change_type": log["change_type"],
                 "changed_at": log["changed_at"],
                 "summary": log["summary"],
-            }
-            for log in conn.execute(
-                """
-                SELECT change_type, changed_at, summary
-                FROM change_log
-                WHERE record_type = 'candidate_entry' AND record_id = ?
-                ORDER BY changed_at
-                """,
-                (row["entry_id"],),
-            ).fetchall()
-        ]
-
-        sources = [
-            {
-                "field": src["field"],
-                "document_id": src["document_id"],
-                "title": src["title"],
-                "url": src["url"] or src["document_url"],
-                "doc_type": src["doc_type"],
-                "published_date": src["published_date"],
-                "fetched_date": src["fetched_date"],
-                "notes": src["notes"],
-            }
-            for src in conn.execute(
-                """
-                SELECT s.field,
-                       s.document_id,
-                       s.url,
-                       s.notes,
-                       d.title,
-                       d.url AS document_url,
-                       d.doc_type,
-                       d.published_date,
-                       d.fetched_date
+            },
+        )
+        candidate_sources = ChildGroups(
+            conn.execute(
+                f"""
+                SELECT {SOURCE_COLUMNS}
                 FROM source s
                 JOIN document d ON d.id = s.document_id
-                WHERE s.record_type = 'candidate_entry' AND s.record_id = ?
-                ORDER BY s.field, d.title
+                {entry_children_sql.format(entry_id="s.record_id")}
+                  AND s.record_type = 'candidate_entry'
+                ORDER BY {detail_order}, s.field, d.title
                 """,
-                (row["entry_id"],),
-            ).fetchall()
-        ]
+                (cycle_id,),
+            ),
+            "record_id",
+            lambda row: source_record(row, document_refs),
+        )
 
-        detail_payload = {
-            "entry_id": row["entry_id"],
-            "cycle_id": cycle_id,
-            "person": {
-                "id": row["person_id"],
-                "full_name": row["full_name"],
-                "full_name_folded": row["full_name_folded"],
-                "dob": row["dob"],
-                "gender": row["gender"],
-                "nationality": row["nationality"],
-                "ethnicity": row["ethnicity"],
-                "religion": row["religion"],
-                "birthplace": row["birthplace"],
-                "current_residence": row["current_residence"],
-            },
-            "entry": {
-                "constituency_id": row["constituency_id"],
-                "list_order": row["list_order"],
-                "party_member_since": row["party_member_since"],
-                "is_na_delegate": row["is_na_delegate"],
-                "is_council_delegate": row["is_council_delegate"],
+        for row in conn.execute(candidates_sql.format(order=detail_order), (cycle_id,)):
+            yield row, {
+                "entry_id": row["entry_id"],
+                "cycle_id": cycle_id,
+                "person": {
+                    "id": row["person_id"],
+                    "full_name": row["full_name"],
+                    "full_name_folded": row["full_name_folded"],
+                    "dob": row["dob"],
+                    "gender": row["gender"],
+                    "nationality": row["nationality"],
+                    "ethnicity": row["ethnicity"],
+                    "religion": row["religion"],
+                    "birthplace": row["birthplace"],
+                    "current_residence": row["current_residence"],
+                },
+                "entry": {
+                    "constituency_id": row["constituency_id"],
+                    "list_order": row["list_order"],
+                    "party_member_since": row["party_member_since"],
+                    "is_na_delegate": row["is_na_delegate"],
+                    "is_council_delegate": row["is_council_delegate"],
+                },
+                "locality": locality_map.get(row["locality_id"]),
+                "constituency": constituency_map.get(row["constituency_id"]),
+                "attributes": attributes.take(row["entry_id"]),
+                "sources": candidate_sources.take(row["entry_id"]),
+                "changelog": changelogs.take(row["entry_id"]),
+            }
+
+    detail_dir = os.path.join(base_dir, "candidates_detail")
+    bundle_dir = os.path.join(base_dir, "candidates_detail_bundles")
+    lookup_path = os.path.join(base_dir, "candidates_detail_lookup.json")
+    if bundle_details is None:
+        # Outputs of the other mode are removed so pages never read stale data.
+        shutil.rmtree(bundle_dir, ignore_errors=True)
+        for suffix in ("", *COMPRESSED_SUFFIXES):
+            if os.path.exists(lookup_path + suffix):
+                os.remove(lookup_path + suffix)
+        for row, detail_payload in iter_details():
+            emit(os.path.join(detail_dir, f"{row['entry_id']}.json"), detail_payload)
+    else:
+        shutil.rmtree(detail_dir, ignore_errors=True)
+        # Bundles hold every detail payload of a constituency or locality;
+        # the lookup gives each entry's bundle and the byte offset and length
+        # of its payload, which parses as JSON on its own.
+        bundles: list[str] = []
+        lookup: dict[str, list[int]] = {}
+        group_column = "constituency_id" if bundle_details == "constituency" else "locality_id"
+        for group_id, group in groupby(iter_details(), key=lambda item: item[0][group_column]):
+            rows = list(group)
+            details = [detail_payload for _, detail_payload in rows]
+            bundle_path = f"candidates_detail_bundles/{group_id}.json"
+            bundle = {
+                "cycle_id": cycle_id,
+                "generated_at": generated_at,
+                "bundle_by": bundle_details,
+                "bundle_id": group_id,
+                "records": details,
+            }
+            if document_refs:
+                bundle = with_documents(bundle, documents)
+            spans = item_spans({**bundle, "records": iter(details)}, writer.compact)
+            # Streamed, so details built by SQLite are written as JSON text.
+            writer.write_stream(
+                os.path.join(base_dir, bundle_path), {**bundle, "records": iter(details)}
+            )
+            for (row, _), (offset, length) in zip(rows, spans):
+                lookup[row["entry_id"]] = [len(bundles), offset, length]
+            bundles.append(bundle_path)
+        emit(
+            lookup_path,
+            {
+                "cycle_id": cycle_id,
+                "generated_at": generated_at,
+                "bundle_by": bundle_details,
+                "record_count": len(lookup),
+                "bundles": bundles,
+                "records": lookup,
             },
-            "locality": locality,
-            "constituency": constituency,
-            "attributes": attributes,
-            "sources": sources,
-            "changelog": changelog,
-        }
+        )
 
-        write_json(os.path.join(detail_dir, f"{row['entry_id']}.json"), detail_payload)
+    # A candidate's results file holds its first result in results.json order,
+    # the record the page used to find there.
+    candidate_results = ChildGroups(
+        iter_result_records(
+            "erc.candidate_entry_id, erc.locality_id, erc.unit_number, erc.order_in_unit, erc.id",
+            f"AND erc.candidate_entry_id IN ({entry_ids_sql})",
+            (cycle_id,),
+        ),
+        "candidate_entry_id",
+    )
+    for row in conn.execute(f"{entry_ids_sql} ORDER BY ce.id", (cycle_id,)):
+        results = candidate_results.take(row["id"])
+        emit(
+            os.path.join(base_dir, "results_by_candidate", f"{row['id']}.json"),
+            {
+                "cycle_id": cycle_id,
+                "generated_at": generated_at,
+                **results_source,
+                "record": results[0] if results else None,
+            },
+        )
 
-    write_json(
+    emit_stream(
         os.path.join(base_dir, "candidates_index.json"),
         {
             "cycle_id": cycle_id,
             "generated_at": generated_at,
-            "records": index_records,
+            "records": iter_index_records(),
         },
     )
 
-    write_json(
+    emit(
+        os.path.join(base_dir, "candidates_search_index.json"),
+        {"cycle_id": cycle_id, "generated_at": generated_at, **build_search_index(iter_index_records())},
+    )
+
+    if shard_index:
+        # One shard per locality plus a manifest, so consumers can fetch only
+        # the provinces they show. Shards carry no generated_at, so their bytes
+        # only change with their content and the hash verifies the file as
+        # written; the manifest's generated_at dates them.
+        shards_by_locality: dict[str, dict] = {}
+        record_count = 0
+        for locality_id, group in groupby(iter_index_records(), key=lambda record: record["locality_id"]):
+            if locality_id not in locality_map:
+                continue
+            records = list(group)
+            record_count += len(records)
+            shard_path = f"candidates_index/{locality_id}.json"
+            shard = {
+                "cycle_id": cycle_id,
+                "locality_id": locality_id,
+                "records": records,
+            }
+            if document_refs:
+                shard = with_documents(shard, documents)
+            writer.write(os.path.join(base_dir, shard_path), shard)
+            shards_by_locality[locality_id] = {
+                "locality_id": locality_id,
+                "name_vi": locality_map[locality_id]["name_vi"],
+                "record_count": len(records),
+                "path": shard_path,
+                "sha256": hashlib.sha256(serialize(shard, writer.compact)).hexdigest(),
+            }
+        emit(
+            os.path.join(base_dir, "candidates_index_manifest.json"),
+            {
+                "cycle_id": cycle_id,
+                "generated_at": generated_at,
+                "record_count": record_count,
+                "shards": [
+                    shards_by_locality[locality["id"]]
+                    for locality in localities
+                    if locality["id"] in shards_by_locality
+                ],
+            },
+        )
+
+    emit(
         os.path.join(base_dir, "localities.json"),
         {"cycle_id": cycle_id, "generated_at": generated_at, "records": localities},
     )
 
-    write_json(
+    emit_stream(
         os.path.join(base_dir, "constituencies.json"),
-        {"cycle_id": cycle_id, "generated_at": generated_at, "records": constituencies},
+        {"cycle_id": cycle_id, "generated_at": generated_at, "records": iter(constituency_records)},
     )
 
-    write_json(
+    emit(
         os.path.join(base_dir, "documents.json"),
         {
             "cycle_id": cycle_id,
             "generated_at": generated_at,
-            "records": [
-                {
-                    "id": row["id"],
-                    "title": row["title"],
-                    "url": row["url"],
-                    "file_path": row["file_path"],
-                    "doc_type": row["doc_type"],
-                    "published_date": row["published_date"],
-                    "fetched_date": row["fetched_date"],
-                    "notes": row["notes"],
-                }
-                for row in conn.execute(
-                    """
-                    SELECT id, title, url, file_path, doc_type, published_date, fetched_date, notes
-                    FROM document
-                    ORDER BY title
-                    """
-                ).fetchall()
-            ],
+            "records": list(documents.values()),
         },
     )
 
-    write_json(
+    emit(
         os.path.join(base_dir, "timeline.json"),
         {
             "cycle_id": cycle_id,
@@ -405,123 +1087,690 @@ def export_cycle(conn: sqlite3.Connection) -> None:
         },
     )
 
-    write_json(
+    emit(
         os.path.join(base_dir, "changelog.json"),
         {"cycle_id": cycle_id, "generated_at": generated_at, "records": []},
     )
 
-    results_summary_row = conn.execute(
-        """
-        SELECT id, total_seats, total_candidates, total_voters, total_votes_cast,
-               turnout_percent, valid_votes, invalid_votes, confirmed_winners,
-               unconfirmed_winners, source_document_id, notes
-        FROM election_result_summary
-        WHERE cycle_id = ?
-        ORDER BY id
-        LIMIT 1
-        """,
-        (cycle_id,),
-    ).fetchone()
+    summary = None
+    if results_summary_row:
+        summary = {
+            "total_seats": results_summary_row["total_seats"],
+            "total_candidates": results_summary_row["total_candidates"],
+            "total_voters": results_summary_row["total_voters"],
+            "total_votes_cast": results_summary_row["total_votes_cast"],
+            "turnout_percent": results_summary_row["turnout_percent"],
+            "valid_votes": results_summary_row["valid_votes"],
+            "invalid_votes": results_summary_row["invalid_votes"],
+            "confirmed_winners": results_summary_row["confirmed_winners"],
+            "unconfirmed_winners": results_summary_row["unconfirmed_winners"],
+        }
+    emit_stream(
+        os.path.join(base_dir, "results.json"),
+        {
+            "cycle_id": cycle_id,
+            "generated_at": generated_at,
+            **results_source,
+            "summary": summary,
+            "records": iter_result_records(
+                "erc.locality_id, erc.unit_number, erc.order_in_unit, erc.id"
+            ),
+        },
+    )
+
+    # Pages are generated per constituency and per candidate, so each gets a
+    # small shard instead of parsing the full results, index and localities.
+    # Within a constituency, results are ordered by rank (missing ranks first).
+    constituency_results = ChildGroups(
+        iter_result_records(
+            "erc.constituency_id, COALESCE(erc.order_in_unit, 0), erc.locality_id, "
+            "erc.unit_number, erc.order_in_unit, erc.id",
+            "AND erc.constituency_id IN (SELECT id FROM constituency WHERE cycle_id = ?)",
+            (cycle_id,),
+        ),
+        "constituency_id",
+    )
+    constituency_entries = ChildGroups(
+        conn.execute(
+            """
+            SELECT ce.id AS entry_id, ce.constituency_id
+            FROM candidate_entry ce
+            JOIN person p ON p.id = ce.person_id
+            JOIN constituency c ON c.id = ce.constituency_id
+            WHERE ce.cycle_id = ? AND c.cycle_id = ?
+            ORDER BY ce.constituency_id, ce.list_order
+            """,
+            (cycle_id, cycle_id),
+        ),
+        "constituency_id",
+        lambda row: row["entry_id"],
+    )
+    for constituency in sorted(constituencies, key=lambda record: record["id"]):
+        emit(
+            os.path.join(base_dir, "results_by_constituency", f"{constituency['id']}.json"),
+            {
+                "cycle_id": cycle_id,
+                "generated_at": generated_at,
+                "constituency": constituency,
+                "locality": locality_map.get(constituency["locality_id"]),
+                "candidate_entry_ids": constituency_entries.take(constituency["id"]),
+                **results_source,
+                "records": constituency_results.take(constituency["id"]),
+            },
+        )
+
+    export_quick_stats(conn, writer, cycle_row, generated_at, base_dir)
+
+
+QUICK_STATS_TOP = 5
+# Substring matches on the folded academic rank; "giao su" also counts
+# "pho giao su", matching how the ranks are cited in bulletins.
+ACADEMIC_MENTIONS = [("Tiến sĩ", "tien si"), ("Giáo sư", "giao su"), ("Phó giáo sư", "pho giao su")]
+EDUCATION_KEYS = {
+    "general": "education_general",
+    "professional": "education_professional",
+    "political": "education_political",
+}
+
+
+def value_counts(conn: sqlite3.Connection, query: str, params: tuple, total: int) -> list[dict]:
+    """Run a ``SELECT value, COUNT(*)`` query into count/percent records."""
+    return [
+        {"value": row[0], "count": row[1], "percent": share(row[1], total)}
+        for row in conn.execute(query, params)
+    ]
 
-    results_rows = conn.execute(
+
+def export_quick_stats(
+    conn: sqlite3.Connection,
+    writer: JsonWriter,
+    cycle_row: sqlite3.Row,
+    generated_at: str,
+    base_dir: str,
+) -> None:
+    cycle_id = cycle_row["id"]
+    entry_ids_sql = "SELECT id FROM candidate_entry WHERE cycle_id = ?"
+
+    # A result row is a winner when its rank in the unit fits within the seats,
+    # the same rule used for the results.json status.
+    result_rows = conn.execute(
         """
-        SELECT erc.id, erc.candidate_entry_id, erc.candidate_name, erc.candidate_name_folded,
-               erc.locality_id, erc.constituency_id, erc.unit_number, erc.unit_description,
-               erc.order_in_unit, erc.votes, erc.votes_raw, erc.percent, erc.percent_raw, erc.notes,
-               ce.person_id AS person_id, c.seat_count AS seat_count
+        SELECT erc.id, erc.candidate_entry_id, erc.candidate_name, erc.constituency_id,
+               erc.unit_number, erc.votes, erc.percent, erc.notes,
+               l.name AS locality_vi,
+               erc.order_in_unit <= c.seat_count AS won,
+               lc.unit_number AS list_unit_number
         FROM election_result_candidate erc
-        LEFT JOIN candidate_entry ce ON ce.id = erc.candidate_entry_id
+        LEFT JOIN locality l ON l.id = erc.locality_id
         LEFT JOIN constituency c ON c.id = erc.constituency_id
+        LEFT JOIN candidate_entry ce ON ce.id = erc.candidate_entry_id
+        LEFT JOIN constituency lc ON lc.id = ce.constituency_id
         WHERE erc.cycle_id = ?
         ORDER BY erc.locality_id, erc.unit_number, erc.order_in_unit
         """,
         (cycle_id,),
     ).fetchall()
-    results_records = []
-    for row in results_rows:
-        status = None
-        if row["order_in_unit"] is not None and row["seat_count"] is not None:
-            status = "won" if row["order_in_unit"] <= row["seat_count"] else "lost"
-        annotations = [
+    winner_entry_ids = {row["candidate_entry_id"] for row in result_rows if row["won"]}
+
+    totals_row = fetch_one(
+        conn,
+        """
+        SELECT (SELECT COUNT(*) FROM candidate_entry WHERE cycle_id = ?) AS candidates,
+               (SELECT COUNT(*) FROM constituency WHERE cycle_id = ?) AS constituencies,
+               (SELECT COUNT(*) FROM locality WHERE cycle_id = ?) AS localities,
+               (SELECT COALESCE(SUM(seat_count), 0) FROM constituency WHERE cycle_id = ?) AS seats
+        """,
+        (cycle_id,) * 4,
+    )
+    total_candidates = totals_row["candidates"]
+
+    localities = [
+        {
+            "locality_id": row["id"],
+            "name_vi": row["name"],
+            "constituencies": row["constituencies"],
+            "seats": row["seats"],
+            "candidates": row["candidates"],
+        }
+        for row in conn.execute(
+            """
+            SELECT l.id, l.name,
+                   COUNT(c.id) AS constituencies,
+                   COALESCE(SUM(c.seat_count), 0) AS seats,
+                   COALESCE(SUM((SELECT COUNT(*) FROM candidate_entry ce
+                                 WHERE ce.constituency_id = c.id)), 0) AS candidates
+            FROM locality l
+            LEFT JOIN constituency c ON c.locality_id = l.id
+            WHERE l.cycle_id = ?
+            GROUP BY l.id
+            ORDER BY seats DESC, l.name
+            """,
+            (cycle_id,),
+        )
+    ]
+    seat_distribution = []
+    for locality in localities:
+        if seat_distribution and seat_distribution[-1]["seats"] == locality["seats"]:
+            bucket = seat_distribution[-1]
+        else:
+            bucket = {"seats": locality["seats"], "localities": []}
+            seat_distribution.append(bucket)
+        bucket["localities"].append(locality["name_vi"])
+
+    people = conn.execute(
+        """
+        SELECT ce.id AS entry_id, p.full_name, p.dob, c.unit_number, l.name AS locality_vi
+        FROM candidate_entry ce
+        JOIN person p ON p.id = ce.person_id
+        JOIN constituency c ON c.id = ce.constituency_id
+        JOIN locality l ON l.id = c.locality_id
+        WHERE ce.cycle_id = ?
+        ORDER BY p.full_name, ce.id
+        """,
+        (cycle_id,),
+    ).fetchall()
+    reference = date.fromisoformat(cycle_row["start_date"]) if cycle_row["start_date"] else None
+    aged = []
+    for row in people:
+        dob = parse_dob(row["dob"])
+        if reference is None or dob is None:
+            continue
+        aged.append(
             {
-                "id": ann["id"],
-                "status": ann["status"],
-                "reason": ann["reason"],
-                "effective_date": ann["effective_date"],
-                "source": fetch_document(conn, ann["source_document_id"]) if ann["source_document_id"] else None,
-                "notes": ann["notes"],
+                "entry_id": row["entry_id"],
+                "name_vi": row["full_name"],
+                "dob": dob.isoformat(),
+                "age": age_on(dob, reference),
+                "locality_vi": row["locality_vi"],
+                "unit_number": row["unit_number"],
             }
-            for ann in conn.execute(
-                """
-                SELECT id, status, reason, effective_date, source_document_id, notes
-                FROM election_result_candidate_annotation
-                WHERE result_id = ?
-                ORDER BY effective_date
-                """,
-                (row["id"],),
-            ).fetchall()
-        ]
-        results_records.append(
+        )
+    winners_aged = [record for record in aged if record["entry_id"] in winner_entry_ids]
+
+    def age_group(records: list[dict]) -> dict:
+        ages = [record["age"] for record in records]
+        oldest = sorted(records, key=lambda record: record["dob"])
+        return {
+            "count": len(ages),
+            "average": round(statistics.fmean(ages), 2) if ages else None,
+            "median": statistics.median(ages) if ages else None,
+            "oldest": oldest[:QUICK_STATS_TOP],
+            "youngest": oldest[::-1][:QUICK_STATS_TOP],
+        }
+
+    def person_values(column: str) -> list[dict]:
+        return value_counts(
+            conn,
+            f"""
+            SELECT NULLIF(TRIM(p.{column}), '') AS value, COUNT(*) AS n
+            FROM candidate_entry ce
+            JOIN person p ON p.id = ce.person_id
+            WHERE ce.cycle_id = ?
+            GROUP BY value
+            ORDER BY n DESC, value
+            """,
+            (cycle_id,),
+            total_candidates,
+        )
+
+    def attribute_values(key: str) -> list[dict]:
+        return value_counts(
+            conn,
+            f"""
+            SELECT NULLIF(TRIM(ca.value), '') AS value, COUNT(*) AS n
+            FROM candidate_entry ce
+            LEFT JOIN candidate_attribute ca
+              ON ca.candidate_entry_id = ce.id AND ca.key = ?
+            WHERE ce.cycle_id = ?
+            GROUP BY value
+            ORDER BY n DESC, value
+            """,
+            (key, cycle_id),
+            total_candidates,
+        )
+
+    ethnicity = person_values("ethnicity")
+    kinh = sum(item["count"] for item in ethnicity if item["value"] == "Kinh")
+
+    academic_rank = value_counts(
+        conn,
+        f"""
+        SELECT MIN(value) AS value, COUNT(*) AS n
+        FROM candidate_attribute
+        WHERE key = 'education_academic_rank'
+          AND candidate_entry_id IN ({entry_ids_sql})
+          AND COALESCE(value_folded, '') <> ''
+        GROUP BY value_folded
+        ORDER BY n DESC, value
+        """,
+        (cycle_id,),
+        total_candidates,
+    )
+    mentions_row = fetch_one(
+        conn,
+        f"""
+        SELECT {", ".join(f"SUM(value_folded LIKE '%{folded}%')" for _, folded in ACADEMIC_MENTIONS)},
+               COUNT(*)
+        FROM candidate_attribute
+        WHERE key = 'education_academic_rank'
+          AND candidate_entry_id IN ({entry_ids_sql})
+          AND COALESCE(value_folded, '') <> ''
+        """,
+        (cycle_id,),
+    )
+
+    # "Không" marks candidates who never sat in the National Assembly; any
+    # other value lists the previous terms served.
+    incumbency = {"na_delegates": 0, "first_time": 0, "unknown": 0, "winners_na_delegates": 0}
+    terms: dict[str, int] = {}
+    for row in conn.execute(
+        """
+        SELECT NULLIF(TRIM(ce.is_na_delegate), '') AS terms,
+               COUNT(*) AS n,
+               SUM(EXISTS (
+                   SELECT 1
+                   FROM election_result_candidate erc
+                   JOIN constituency c ON c.id = erc.constituency_id
+                   WHERE erc.candidate_entry_id = ce.id AND erc.order_in_unit <= c.seat_count
+               )) AS winners
+        FROM candidate_entry ce
+        WHERE ce.cycle_id = ?
+        GROUP BY terms
+        """,
+        (cycle_id,),
+    ):
+        if row["terms"] is None:
+            incumbency["unknown"] += row["n"]
+        elif row["terms"] == "Không":
+            incumbency["first_time"] += row["n"]
+        else:
+            incumbency["na_delegates"] += row["n"]
+            incumbency["winners_na_delegates"] += row["winners"]
+            for term in row["terms"].split(","):
+                terms[term.strip()] = terms.get(term.strip(), 0) + row["n"]
+
+    def result_item(row: sqlite3.Row) -> dict:
+        return {
+            "result_id": row["id"],
+            "candidate_entry_id": row["candidate_entry_id"],
+            "name_vi": row["candidate_name"],
+            "locality_vi": row["locality_vi"],
+            "unit_number": row["unit_number"],
+            "votes": row["votes"],
+            "percent": row["percent"],
+        }
+
+    def ranked(rows: list[sqlite3.Row], column: str, descending: bool) -> list[dict]:
+        present = [row for row in rows if row[column] is not None]
+        present.sort(key=lambda row: (-row[column] if descending else row[column], row["candidate_name"]))
+        return [result_item(row) for row in present[:QUICK_STATS_TOP]]
+
+    winner_rows = [row for row in result_rows if row["won"]]
+
+    # Margins per constituency are materialized by the staging build; the
+    # smallest and largest come straight off its (cycle_id, margin_*) indexes.
+    def margin_result(row: sqlite3.Row, side: str) -> dict:
+        return {
+            "result_id": row[f"{side}_id"],
+            "candidate_entry_id": row[f"{side}_entry_id"],
+            "name_vi": row[f"{side}_name"],
+            "locality_vi": row["locality_vi"],
+            "unit_number": row["unit_number"],
+            "votes": row[f"{side}_votes"],
+            "percent": row[f"{side}_percent"],
+        }
+
+    def margin_sort(column: str, descending: bool) -> list[dict]:
+        rows = conn.execute(
+            f"""
+            SELECT s.constituency_id, s.unit_number, l.name AS locality_vi,
+                   s.margin_votes, s.margin_percent,
+                   w.id AS winner_id, w.candidate_entry_id AS winner_entry_id,
+                   w.candidate_name AS winner_name, w.votes AS winner_votes,
+                   w.percent AS winner_percent,
+                   h.id AS loser_id, h.candidate_entry_id AS loser_entry_id,
+                   h.candidate_name AS loser_name, h.votes AS loser_votes,
+                   h.percent AS loser_percent
+            FROM election_result_constituency_summary s
+            JOIN election_result_candidate w ON w.id = s.lowest_winner_result_id
+            JOIN election_result_candidate h ON h.id = s.highest_loser_result_id
+            LEFT JOIN locality l ON l.id = s.locality_id
+            WHERE s.cycle_id = ? AND s.{column} IS NOT NULL
+            ORDER BY s.{column} {"DESC" if descending else "ASC"},
+                     COALESCE(l.name, ''), s.locality_id, s.unit_number
+            LIMIT ?
+            """,
+            (cycle_id, QUICK_STATS_TOP),
+        )
+        return [
             {
-                "id": row["id"],
-                "candidate_entry_id": row["candidate_entry_id"],
-                "person_id": row["person_id"],
-                "candidate_name_vi": row["candidate_name"],
-                "candidate_name_folded": row["candidate_name_folded"],
-                "locality_id": row["locality_id"],
                 "constituency_id": row["constituency_id"],
+                "locality_vi": row["locality_vi"],
                 "unit_number": row["unit_number"],
-                "unit_description_vi": row["unit_description"],
-                "order_in_unit": row["order_in_unit"],
-                "status": status,
-                "votes": row["votes"],
-                "votes_raw": row["votes_raw"],
-                "percent": row["percent"],
-                "percent_raw": row["percent_raw"],
-                "notes": row["notes"],
-                "sources": fetch_sources(conn, "election_result_candidate", row["id"]),
-                "annotations": annotations,
+                "lowest_winner": margin_result(row, "winner"),
+                "highest_loser": margin_result(row, "loser"),
+                "votes_gap": row["margin_votes"],
+                "percent_gap": round(row["margin_percent"], 2),
             }
-        )
+            for row in rows
+        ]
 
-    results_payload = {
-        "cycle_id": cycle_id,
-        "generated_at": generated_at,
-        "source": None,
-        "summary": None,
-        "records": results_records,
-    }
+    summary_row = conn.execute(
+        """
+        SELECT total_voters, total_votes_cast, turnout_percent, valid_votes, invalid_votes
+        FROM election_result_summary
+        WHERE cycle_id = ?
+        ORDER BY id
+        LIMIT 1
+        """,
+        (cycle_id,),
+    ).fetchone()
 
-    if results_summary_row:
-        source_id = results_summary_row["source_document_id"]
-        results_payload["source"] = fetch_document(conn, source_id) if source_id else None
-        results_payload["summary"] = {
-            "total_seats": results_summary_row["total_seats"],
-            "total_candidates": results_summary_row["total_candidates"],
-            "total_voters": results_summary_row["total_voters"],
-            "total_votes_cast": results_summary_row["total_votes_cast"],
-            "turnout_percent": results_summary_row["turnout_percent"],
-            "valid_votes": results_summary_row["valid_votes"],
-            "invalid_votes": results_summary_row["invalid_votes"],
-            "confirmed_winners": results_summary_row["confirmed_winners"],
-            "unconfirmed_winners": results_summary_row["unconfirmed_winners"],
+    not_confirmed = [
+        {
+            "name_vi": row["candidate_name"],
+            "locality_vi": row["locality_vi"],
+            "unit_number": row["unit_number"],
+            "status": row["status"],
+            "notes": row["notes"],
         }
+        for row in conn.execute(
+            """
+            SELECT erc.candidate_name, erc.unit_number, l.name AS locality_vi, a.status, a.notes
+            FROM election_result_candidate_annotation a
+            JOIN election_result_candidate erc ON erc.id = a.result_id
+            LEFT JOIN locality l ON l.id = erc.locality_id
+            WHERE erc.cycle_id = ? AND a.status = 'not_confirmed'
+            ORDER BY l.name, erc.unit_number, erc.order_in_unit
+            """,
+            (cycle_id,),
+        )
+    ]
+
+    writer.write(
+        os.path.join(base_dir, "quick_stats.json"),
+        {
+            "cycle_id": cycle_id,
+            "generated_at": generated_at,
+            "cycle": {"id": cycle_id, "name": cycle_row["name"], "year": cycle_row["year"]},
+            "age_reference_date": cycle_row["start_date"],
+            "totals": {
+                "candidates": total_candidates,
+                "winners": len(winner_rows),
+                "result_records": len(result_rows),
+                "constituencies": totals_row["constituencies"],
+                "localities": totals_row["localities"],
+                "seats": totals_row["seats"],
+                "candidates_per_constituency": (
+                    round(total_candidates / totals_row["constituencies"], 2)
+                    if totals_row["constituencies"]
+                    else None
+                ),
+            },
+            "localities": localities,
+            "seat_distribution": seat_distribution,
+            "age": {"candidates": age_group(aged), "winners": age_group(winners_aged)},
+            "demographics": {
+                "gender": person_values("gender"),
+                "ethnicity": ethnicity,
+                "ethnicity_split": {
+                    "kinh": {"count": kinh, "percent": share(kinh, total_candidates)},
+                    "non_kinh": {
+                        "count": total_candidates - kinh,
+                        "percent": share(total_candidates - kinh, total_candidates),
+                    },
+                },
+                "religion": person_values("religion"),
+            },
+            "education": {
+                **{name: attribute_values(key) for name, key in EDUCATION_KEYS.items()},
+                "academic_rank": academic_rank,
+                "academic_mentions": [
+                    {"label": label, "count": mentions_row[index] or 0}
+                    for index, (label, _) in enumerate(ACADEMIC_MENTIONS)
+                ],
+                "academic_missing": total_candidates - mentions_row[len(ACADEMIC_MENTIONS)],
+            },
+            "incumbency": {
+                **incumbency,
+                "previous_terms": [
+                    {"term": term, "count": count}
+                    for term, count in sorted(terms.items(), key=lambda item: (-item[1], item[0]))
+                ],
+            },
+            "turnout": dict(summary_row) if summary_row else None,
+            "votes": {
+                "top_votes": ranked(result_rows, "votes", True),
+                "bottom_votes_winners": ranked(winner_rows, "votes", False),
+                "top_percent": ranked(result_rows, "percent", True),
+                "bottom_percent_winners": ranked(winner_rows, "percent", False),
+            },
+            "margins": {
+                "votes_largest": margin_sort("margin_votes", True),
+                "votes_smallest": margin_sort("margin_votes", False),
+                "percent_largest": margin_sort("margin_percent", True),
+                "percent_smallest": margin_sort("margin_percent", False),
+            },
+            "irregularities": {
+                "not_confirmed": not_confirmed,
+                "constituency_mismatch": [
+                    {
+                        "name_vi": row["candidate_name"],
+                        "locality_vi": row["locality_vi"],
+                        "list_unit_number": row["list_unit_number"],
+                        "results_unit_number": row["unit_number"],
+                    }
+                    for row in result_rows
+                    if row["notes"] == "constituency_mismatch"
+                ],
+            },
+        },
+    )
 
-    write_json(os.path.join(base_dir, "results.json"), results_payload)
+
+def list_cycle_ids(conn: sqlite3.Connection) -> list[str]:
+    """Every cycle in the staging DB, latest first."""
+    return [row[0] for row in conn.execute("SELECT id FROM election_cycle ORDER BY year DESC, id")]
+
+
+def new_writer(args: argparse.Namespace, profiler: PipelineProfiler | None, manifest_root: str | None) -> JsonWriter:
+    return JsonWriter(
+        args.workers,
+        profiler,
+        profile_name if profiler else None,
+        compact=args.compact,
+        gzip_level=args.gzip_level,
+        brotli_quality=args.brotli_quality,
+        manifest_root=manifest_root,
+    )
+
+
+def export_cycle_in_process(db_path: str, cycle_id: str, args: argparse.Namespace) -> dict:
+    """Export one cycle on its own connection and writer (a cycle pool task).
+
+    The manifest is left to the parent, which merges every cycle's sizes.
+    """
+    conn = sqlite3.connect(db_path)
+    writer = new_writer(args, None, None)
+    try:
+        with writer:
+            export_cycle(
+                conn,
+                writer,
+                args.schema_version,
+                args.shard_index,
+                args.bundle_details,
+                args.engine,
+                cycle_id,
+            )
+    finally:
+        conn.close()
+    return {"sizes": writer.sizes, "written": writer.written, "unchanged": writer.unchanged}
+
+
+def add_cycle_result(writer: JsonWriter, result: dict) -> None:
+    """Fold a pooled cycle export into the writer that owns the manifest."""
+    writer.sizes.update(result["sizes"])
+    writer.written += result["written"]
+    writer.unchanged += result["unchanged"]
+
+
+def export_cycles_on(conn: sqlite3.Connection, cycle_ids: list[str], args: argparse.Namespace) -> JsonWriter:
+    """Export ``cycle_ids`` one after another from an open connection and write the manifest."""
+    ensure_dir(OUTPUT_ROOT)
+    writer = new_writer(args, PROFILER, OUTPUT_ROOT)
+    PROFILER.attach(conn)
+    with PROFILER.stage("export_cycle"), writer:
+        for cycle_id in cycle_ids:
+            export_cycle(
+                conn,
+                writer,
+                args.schema_version,
+                args.shard_index,
+                args.bundle_details,
+                args.engine,
+                cycle_id,
+            )
+    return writer
+
+
+def export_cycles(
+    db_path: str,
+    cycle_ids: list[str],
+    args: argparse.Namespace,
+    task: Callable[[str, str, argparse.Namespace], dict] = export_cycle_in_process,
+) -> JsonWriter:
+    """Export ``cycle_ids`` and write the export manifest; returns the manifest's writer.
+
+    Several cycles are exported by a process pool of up to ``args.cycle_workers``
+    processes, one ``task(db_path, cycle_id, args)`` per cycle; a single cycle
+    (or one worker) runs here, with the profiler attached. Callers that load
+    this script by path pass a ``task`` the pool can import from their module.
+    """
+    if len(cycle_ids) == 1 or args.cycle_workers == 1:
+        conn = sqlite3.connect(db_path)
+        try:
+            return export_cycles_on(conn, cycle_ids, args)
+        finally:
+            conn.close()
+
+    ensure_dir(OUTPUT_ROOT)
+    writer = new_writer(args, PROFILER, OUTPUT_ROOT)
+    with PROFILER.stage("export_cycles"), writer:
+        with ProcessPoolExecutor(max_workers=min(args.cycle_workers, len(cycle_ids))) as pool:
+            futures = [
+                pool.submit(task, db_path, cycle_id, args) for cycle_id in cycle_ids
+            ]
+            for future in futures:
+                add_cycle_result(writer, future.result())
+    return writer
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Export staging DB data as JSON for the site.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Threads used to serialize and write files (default: {DEFAULT_WORKERS}).",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write minified JSON plus .gz (and .br, if brotli is installed) siblings.",
+    )
+    parser.add_argument(
+        "--gzip-level",
+        type=int,
+        choices=range(1, 10),
+        default=DEFAULT_GZIP_LEVEL,
+        metavar="1-9",
+        help=f"gzip level for --compact (default: {DEFAULT_GZIP_LEVEL}).",
+    )
+    parser.add_argument(
+        "--brotli-quality",
+        type=int,
+        choices=range(0, 12),
+        default=DEFAULT_BROTLI_QUALITY,
+        metavar="0-11",
+        help=f"Brotli quality for --compact (default: {DEFAULT_BROTLI_QUALITY}).",
+    )
+    parser.add_argument(
+        "--schema-version",
+        type=int,
+        choices=SCHEMA_VERSIONS,
+        default=DEFAULT_SCHEMA_VERSION,
+        help=(
+            "Payload schema: 1 inlines document metadata in every source (current shape); "
+            "2 references documents by ID through a per-file documents dictionary."
+        ),
+    )
+    parser.add_argument(
+        "--shard-index",
+        action="store_true",
+        help=(
+            "Also write candidates_index/<locality_id>.json shards and "
+            "candidates_index_manifest.json."
+        ),
+    )
+    parser.add_argument(
+        "--bundle-details",
+        choices=BUNDLE_BY,
+        help=(
+            "Pack candidate details into one file per constituency or locality, with "
+            "candidates_detail_lookup.json mapping each entry to its bundle slice, "
+            "instead of one file per candidate."
+        ),
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default=DEFAULT_ENGINE,
+        help=(
+            "How candidate details and constituency records are built: in Python "
+            "(default) or as JSON text by SQLite. Both give identical files."
+        ),
+    )
+    parser.add_argument(
+        "--cycle",
+        action="append",
+        dest="cycles",
+        metavar="ID",
+        help="Cycle to export; repeat for several (default: every cycle in the staging DB).",
+    )
+    parser.add_argument(
+        "--cycle-workers",
+        type=int,
+        default=DEFAULT_CYCLE_WORKERS,
+        help=f"Processes exporting cycles in parallel (default: {DEFAULT_CYCLE_WORKERS}).",
+    )
+    return parser
 
 
 def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+
     if not os.path.exists(DB_PATH):
         raise RuntimeError(f"Missing staging DB at {DB_PATH}")
 
-    ensure_dir(OUTPUT_ROOT)
     conn = sqlite3.connect(DB_PATH)
     try:
-        export_cycle(conn)
+        known = list_cycle_ids(conn)
     finally:
         conn.close()
+    cycle_ids = args.cycles or known
+    unknown = [cycle_id for cycle_id in cycle_ids if cycle_id not in known]
+    if unknown:
+        parser.error(f"cycles not in the staging DB: {', '.join(unknown)}")
+
+    writer = export_cycles(DB_PATH, cycle_ids, args)
+    PROFILER.finish()
 
-    print(f"Exported JSON to {OUTPUT_ROOT}")
+    print(
+        f"Exported {', '.join(cycle_ids)} to {OUTPUT_ROOT} "
+        f"({writer.written} written, {writer.unchanged} unchanged)"
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,432 @@
+"""Concurrent, skip-if-unchanged JSON file writer for the export step.
+
+Payloads are serialized on a thread pool. Before writing, each payload is
+compared with the file already on disk with volatile keys (``generated_at``)
+left out, so a re-export only touches files whose content actually changed.
+Changed files are written to a temp file in the same directory and renamed
+into place, so readers never see a half-written file.
+
+With ``compact`` set, JSON is written with minimal separators and every file
+gets a ``.gz`` sibling (plus ``.br`` when a brotli module is installed).
+Siblings of unchanged files are kept, so delete them to re-encode at a new
+level. Given a ``manifest_root``, a compact writer's ``close`` updates a
+manifest of raw and compressed sizes: files written in this run replace
+their entries, and entries for other files that still exist are kept with
+their sizes re-read from disk, so exporting one cycle keeps the others.
+
+``write_stream`` serializes on the calling thread straight to disk: iterator
+values are written one item at a time, so payloads fed from a database cursor
+never exist as a whole list or string. The bytes match ``serialize``.
+
+``RawJson`` payloads and array items are JSON text built elsewhere (by
+SQLite's JSON functions); compact output copies them verbatim.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Callable
+
+from pipeline_profiler import PipelineProfiler
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+# Top-level keys that change on every run without the content changing.
+VOLATILE_KEYS = frozenset({"generated_at"})
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+DEFAULT_GZIP_LEVEL = 9
+DEFAULT_BROTLI_QUALITY = 11
+MANIFEST_NAME = "export_manifest.json"
+COMPRESSED_SUFFIXES = (".gz", ".br")
+COPY_CHUNK = 1 << 16
+# Returned by a deferred payload value to leave its key out.
+OMIT = object()
+
+
+class RawJson(str):
+    """Compact JSON text, such as a SQLite ``json_object`` result.
+
+    It must match ``json.dumps(..., ensure_ascii=False, separators=(",", ":"))``
+    of the same value, so it is copied as is in compact mode and re-indented
+    otherwise. Only use it at the top level or as a streamed array item.
+    """
+
+
+def serialize(payload: dict | RawJson, compact: bool = False) -> bytes:
+    if isinstance(payload, RawJson):
+        if compact:
+            return payload.encode("utf-8")
+        payload = json.loads(payload)
+    if compact:
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return (json.dumps(payload, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+
+def iter_serialize(payload: dict, compact: bool = False) -> Iterator[tuple[str, str | None]]:
+    """Yield ``(text, role)`` chunks that join up to ``serialize(payload)``.
+
+    Top-level iterator values are written as arrays one item at a time, and
+    callables are called once the keys before them are written (returning
+    ``OMIT`` drops the key). ``role`` is ``"volatile"`` for the string values
+    of ``VOLATILE_KEYS`` and ``"item"`` for each streamed array item.
+    """
+    def dumps(value, indent: str = "") -> str:
+        if isinstance(value, RawJson):
+            if compact:
+                return value
+            value = json.loads(value)
+        if compact:
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        return json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n" + indent)
+
+    entry_prefix, key_separator, item_prefix = (",", ":", ",") if compact else (",\n  ", ": ", ",\n    ")
+    opened = False
+    for key, value in payload.items():
+        if callable(value):
+            value = value()
+            if value is OMIT:
+                continue
+        prefix = entry_prefix if opened else ("{" if compact else "{\n  ")
+        opened = True
+        yield f"{prefix}{dumps(key)}{key_separator}", None
+        if not isinstance(value, Iterator):
+            volatile = key in VOLATILE_KEYS and isinstance(value, str)
+            yield dumps(value, "  "), "volatile" if volatile else None
+            continue
+        empty = True
+        for item in value:
+            yield (item_prefix if not empty else ("[" if compact else "[\n    ")), None
+            yield dumps(item, "    "), "item"
+            empty = False
+        yield ("[]" if empty else ("]" if compact else "\n  ]")), None
+    if not opened:
+        yield "{}" if compact else "{}\n", None
+    else:
+        yield "}" if compact else "\n}\n", None
+
+
+def item_spans(payload: dict, compact: bool = False) -> list[tuple[int, int]]:
+    """Byte ``(offset, length)`` of each streamed array item in the output.
+
+    Each span parses as JSON on its own, so readers can slice one item out of
+    the file without parsing the rest.
+    """
+    spans = []
+    offset = 0
+    for text, role in iter_serialize(payload, compact):
+        length = len(text.encode("utf-8"))
+        if role == "item":
+            spans.append((offset, length))
+        offset += length
+    return spans
+
+
+def content_hash(payload: dict, compact: bool = False) -> str:
+    """SHA-256 of the serialized payload without its volatile keys."""
+    stable = {key: value for key, value in payload.items() if key not in VOLATILE_KEYS}
+    return hashlib.sha256(serialize(stable, compact)).hexdigest()
+
+
+def existing_hash(path: str, compact: bool = False) -> str | None:
+    """Hash of the file on disk, or None if it is missing or in another format."""
+    try:
+        with open(path, "rb") as fh:
+            raw = fh.read()
+        payload = json.loads(raw)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or serialize(payload, compact) != raw:
+        return None
+    return content_hash(payload, compact)
+
+
+def existing_bytes(path: str) -> bytes | None:
+    try:
+        with open(path, "rb") as fh:
+            return fh.read()
+    except OSError:
+        return None
+
+
+def same_bytes(old: BinaryIO, new: BinaryIO, count: int | None) -> bool:
+    """Compare the next ``count`` bytes of both files (to the end when None)."""
+    while count is None or count > 0:
+        size = COPY_CHUNK if count is None else min(COPY_CHUNK, count)
+        old_chunk = old.read(size)
+        if old_chunk != new.read(size):
+            return False
+        if not old_chunk:
+            return count is None
+        if count is not None:
+            count -= len(old_chunk)
+    return True
+
+
+def skip_string(fh: BinaryIO) -> bool:
+    """Read past one JSON string; False if the next value is not a string."""
+    if fh.read(1) != b'"':
+        return False
+    while True:
+        char = fh.read(1)
+        if char == b"\\":
+            fh.read(1)
+        elif char in (b'"', b""):
+            return char == b'"'
+
+
+def same_content(path: str, new_path: str, volatile_spans: list[tuple[int, int]]) -> bool:
+    """Whether ``path`` matches ``new_path`` apart from its volatile values.
+
+    ``volatile_spans`` are the ``(offset, length)`` of volatile strings in the
+    new file; the old values may differ in length, so each is skipped up to
+    its closing quote.
+    """
+    try:
+        old = open(path, "rb")
+    except OSError:
+        return False
+    with old, open(new_path, "rb") as new:
+        position = 0
+        for offset, length in volatile_spans:
+            if not same_bytes(old, new, offset - position) or not skip_string(old):
+                return False
+            position = offset + length
+            new.seek(position)
+        return same_bytes(old, new, None)
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class JsonWriter:
+    """Writes JSON files on a thread pool, skipping unchanged content.
+
+    ``stage_name`` maps a path to a profiler stage; worker timings are summed
+    per stage and handed to the profiler on ``close`` from the calling thread,
+    since the profiler reads the SQLite connection.
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        profiler: PipelineProfiler | None = None,
+        stage_name: Callable[[str], str] | None = None,
+        compact: bool = False,
+        gzip_level: int = DEFAULT_GZIP_LEVEL,
+        brotli_quality: int = DEFAULT_BROTLI_QUALITY,
+        manifest_root: str | None = None,
+    ) -> None:
+        self.profiler = profiler
+        self.stage_name = stage_name
+        self.compact = compact
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.manifest_root = manifest_root
+        self.sizes: dict[str, dict] = {}
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        # Bounds the payloads held in memory while the pool catches up.
+        self.pending = threading.BoundedSemaphore(max(1, workers) * 4)
+        self.futures: list[Future] = []
+        self.lock = threading.Lock()
+        self.created_dirs: set[str] = set()
+        self.written = 0
+        self.unchanged = 0
+        self.timings: dict[str, list] = {}
+
+    def __enter__(self) -> "JsonWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(raise_errors=exc_type is None)
+
+    def _ensure_dir(self, path: str) -> str:
+        directory = os.path.dirname(path)
+        if directory not in self.created_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self.created_dirs.add(directory)
+        return directory
+
+    def write(self, path: str, payload: dict | RawJson) -> None:
+        self._ensure_dir(path)
+        self.pending.acquire()
+        future = self.executor.submit(self._write, path, payload)
+        future.add_done_callback(lambda _: self.pending.release())
+        self.futures.append(future)
+
+    def _write(self, path: str, payload: dict | RawJson) -> None:
+        start = time.perf_counter()
+        if isinstance(payload, RawJson):
+            # Raw payloads carry no volatile keys, so the bytes can be compared.
+            data = serialize(payload, self.compact)
+            changed = existing_bytes(path) != data
+        else:
+            data = None
+            changed = existing_hash(path, self.compact) != content_hash(payload, self.compact)
+        if changed:
+            atomic_write(path, data if data is not None else serialize(payload, self.compact))
+        self._record(path, changed, self._write_compressed(path, changed), start)
+
+    def write_stream(self, path: str, payload: dict) -> None:
+        """Serialize ``payload`` to disk on the calling thread, item by item.
+
+        Use it for payloads whose iterator values read a cursor of the calling
+        thread's SQLite connection. The new file goes to a temp file first and
+        only replaces the old one when it differs outside ``VOLATILE_KEYS``.
+        """
+        start = time.perf_counter()
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=self._ensure_dir(path))
+        try:
+            volatile_spans = []
+            with os.fdopen(fd, "wb") as fh:
+                for text, role in iter_serialize(payload, self.compact):
+                    data = text.encode("utf-8")
+                    if role == "volatile":
+                        volatile_spans.append((fh.tell(), len(data)))
+                    fh.write(data)
+            changed = not same_content(path, tmp_path, volatile_spans)
+            if changed:
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+            else:
+                os.remove(tmp_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._record(path, changed, self._write_compressed(path, changed), start)
+
+    def _record(self, path: str, changed: bool, sizes: dict, start: float) -> None:
+        seconds = time.perf_counter() - start
+        with self.lock:
+            self.sizes[path] = sizes
+            if changed:
+                self.written += 1
+            else:
+                self.unchanged += 1
+            if self.stage_name:
+                timing = self.timings.setdefault(self.stage_name(path), [0, 0.0])
+                timing[0] += 1
+                timing[1] += seconds
+
+    def _write_compressed(self, path: str, changed: bool) -> dict:
+        """Refresh compressed siblings of ``path``, reading it back in chunks."""
+        encoders = {}
+        if self.compact:
+            encoders[".gz"] = self._gzip_file
+            if brotli is not None:
+                encoders[".br"] = self._brotli_file
+        for suffix in COMPRESSED_SUFFIXES:
+            if suffix not in encoders and changed and os.path.exists(path + suffix):
+                # A rewritten file must not leave a stale sibling behind.
+                os.remove(path + suffix)
+        sizes = {"raw": os.path.getsize(path)}
+        for suffix, encode in encoders.items():
+            sibling = path + suffix
+            if changed or not os.path.exists(sibling):
+                fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path))
+                try:
+                    with open(path, "rb") as source, os.fdopen(fd, "wb") as target:
+                        encode(source, target)
+                    os.chmod(tmp_path, 0o644)
+                    os.replace(tmp_path, sibling)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+            sizes[suffix.lstrip(".")] = os.path.getsize(sibling)
+        return sizes
+
+    def _gzip_file(self, source: BinaryIO, target: BinaryIO) -> None:
+        # mtime=0 and no file name keep the output deterministic.
+        with gzip.GzipFile(
+            filename="", mode="wb", compresslevel=self.gzip_level, fileobj=target, mtime=0
+        ) as compressed:
+            for chunk in iter(lambda: source.read(COPY_CHUNK), b""):
+                compressed.write(chunk)
+
+    def _brotli_file(self, source: BinaryIO, target: BinaryIO) -> None:
+        compressor = brotli.Compressor(quality=self.brotli_quality)
+        for chunk in iter(lambda: source.read(COPY_CHUNK), b""):
+            target.write(compressor.process(chunk))
+        target.write(compressor.finish())
+
+    def previous_manifest_files(self) -> dict[str, dict]:
+        """Entries of the manifest on disk for files still there, re-sized."""
+        try:
+            with open(os.path.join(self.manifest_root, MANIFEST_NAME), "rb") as fh:
+                previous = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        files = {}
+        for entry in previous.get("files", []):
+            path = os.path.join(self.manifest_root, entry["path"])
+            if path in self.sizes or not os.path.exists(path):
+                continue
+            sizes = {"raw": os.path.getsize(path)}
+            for suffix in COMPRESSED_SUFFIXES:
+                if os.path.exists(path + suffix):
+                    sizes[suffix.lstrip(".")] = os.path.getsize(path + suffix)
+            files[path] = sizes
+        return files
+
+    def write_manifest(self) -> None:
+        all_sizes = {**self.previous_manifest_files(), **self.sizes}
+        totals: dict[str, int] = {}
+        files = []
+        for path in sorted(all_sizes):
+            sizes = all_sizes[path]
+            files.append({"path": os.path.relpath(path, self.manifest_root), **sizes})
+            for key, size in sizes.items():
+                totals[key] = totals.get(key, 0) + size
+        settings = {"gzip_level": self.gzip_level}
+        if brotli is not None:
+            settings["brotli_quality"] = self.brotli_quality
+        self._write(
+            os.path.join(self.manifest_root, MANIFEST_NAME),
+            {
+                **settings,
+                "file_count": len(files),
+                "totals": totals,
+                "files": files,
+            },
+        )
+
+    def close(self, raise_errors: bool = True) -> None:
+        self.executor.shutdown(wait=True)
+        try:
+            if raise_errors:
+                # A failed export must not leave a manifest behind.
+                for future in self.futures:
+                    future.result()
+                if self.manifest_root and self.compact:
+                    self.write_manifest()
+        finally:
+            if self.profiler:
+                for name, (calls, seconds) in self.timings.items():
+                    self.profiler.add_stage(name, seconds, calls)
+            self.futures.clear()
@@ -0,0 +1,177 @@
+"""Opt-in stage and SQL profiling for the data pipeline scripts.
+
+Set PIPELINE_PROFILE to a JSON report path to enable it, e.g.:
+
+    PIPELINE_PROFILE=data/profile.json npm run data:build
+
+Each script merges its own section into the report and prints a top-N
+summary. PIPELINE_PROFILE_TOP overrides N (default 10).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator
+
+PROFILE_ENV = "PIPELINE_PROFILE"
+PROFILE_TOP_ENV = "PIPELINE_PROFILE_TOP"
+
+SQL_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+SQL_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+SQL_PARAM_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+SQL_SPACE_RE = re.compile(r"\s+")
+
+
+def sql_shape(statement: str) -> str:
+    """Collapse literals and whitespace so repeated statements group together."""
+    shape = SQL_STRING_RE.sub("?", statement)
+    shape = SQL_NUMBER_RE.sub("?", shape)
+    shape = SQL_PARAM_LIST_RE.sub("(?, ...)", shape)
+    return SQL_SPACE_RE.sub(" ", shape).strip()
+
+
+class PipelineProfiler:
+    """Records wall time per stage, rows written and per-SQL-shape timings.
+
+    SQL time is attributed from one traced statement to the next (or to the
+    end of the enclosing stage), so it includes the Python work done while
+    consuming a statement's rows.
+    """
+
+    def __init__(self, script: str, report_path: str | None, top_n: int = 10) -> None:
+        self.script = script
+        self.report_path = report_path
+        self.top_n = top_n
+        self.enabled = report_path is not None
+        self.conn: sqlite3.Connection | None = None
+        self.started = time.perf_counter()
+        self.stages: dict[str, dict] = {}
+        self.tables: dict[str, int] = {}
+        self.sql: dict[str, list] = {}
+        self._current: tuple[str, float] | None = None
+
+    @classmethod
+    def from_env(cls, script: str) -> "PipelineProfiler":
+        report_path = os.environ.get(PROFILE_ENV) or None
+        top_n = int(os.environ.get(PROFILE_TOP_ENV) or 10)
+        return cls(script, report_path, top_n)
+
+    def attach(self, conn: sqlite3.Connection) -> None:
+        if not self.enabled:
+            return
+        self.conn = conn
+        conn.set_trace_callback(self._trace)
+
+    def _trace(self, statement: str) -> None:
+        now = time.perf_counter()
+        self._flush(now)
+        self._current = (sql_shape(statement), now)
+
+    def _flush(self, now: float) -> None:
+        if self._current is None:
+            return
+        shape, start = self._current
+        entry = self.sql.setdefault(shape, [0, 0.0])
+        entry[0] += 1
+        entry[1] += now - start
+        self._current = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        changes_before = self.conn.total_changes if self.conn else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._flush(now)
+            record = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0, "rows_written": 0})
+            record["calls"] += 1
+            record["seconds"] += now - start
+            if self.conn:
+                record["rows_written"] += self.conn.total_changes - changes_before
+
+    def add_stage(self, name: str, seconds: float, calls: int = 1) -> None:
+        """Record time measured elsewhere (e.g. on worker threads) as a stage."""
+        if not self.enabled:
+            return
+        record = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0, "rows_written": 0})
+        record["calls"] += calls
+        record["seconds"] += seconds
+
+    def record_tables(self, conn: sqlite3.Connection) -> None:
+        if not self.enabled:
+            return
+        tables = [
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name"
+            ).fetchall()
+        ]
+        self.tables = {
+            table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+            for table in tables
+        }
+
+    def report(self) -> dict:
+        self._flush(time.perf_counter())
+        sql = sorted(
+            (
+                {"shape": shape, "count": count, "seconds": round(seconds, 6)}
+                for shape, (count, seconds) in self.sql.items()
+            ),
+            key=lambda item: item["seconds"],
+            reverse=True,
+        )
+        return {
+            "recorded_at": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+            "total_seconds": round(time.perf_counter() - self.started, 6),
+            "stages": [
+                {"name": name, **record, "seconds": round(record["seconds"], 6)}
+                for name, record in self.stages.items()
+            ],
+            "table_rows": self.tables,
+            "sql_statements": sum(item["count"] for item in sql),
+            "sql": sql,
+        }
+
+    def finish(self) -> None:
+        if not self.enabled:
+            return
+        section = self.report()
+
+        report = {}
+        if os.path.exists(self.report_path):
+            with open(self.report_path, "r", encoding="utf-8") as fh:
+                report = json.load(fh)
+        report[self.script] = section
+        with open(self.report_path, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, ensure_ascii=False, indent=2)
+            fh.write("\n")
+
+        self.print_summary(section)
+
+    def print_summary(self, section: dict) -> None:
+        print(f"[profile] {self.script}: {section['total_seconds']:.3f}s total, "
+              f"{section['sql_statements']} SQL statements")
+        stages = sorted(section["stages"], key=lambda item: item["seconds"], reverse=True)
+        for item in stages[: self.top_n]:
+            print(
+                f"[profile]   stage {item['name']}: {item['seconds']:.3f}s "
+                f"({item['calls']} calls, {item['rows_written']} rows written)"
+            )
+        for item in section["sql"][: self.top_n]:
+            shape = item["shape"]
+            if len(shape) > 100:
+                shape = shape[:97] + "..."
+            print(f"[profile]   sql {item['seconds']:.3f}s x{item['count']}: {shape}")
+        print(f"[profile] report written to {self.report_path}")
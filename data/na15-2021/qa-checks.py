@@ -3,102 +3,101 @@ import os
 import sqlite3
 import sys
 
+from pipeline_profiler import PipelineProfiler
+
 
 DATA_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(os.path.dirname(DATA_DIR), "staging.db")
 
+PROFILER = PipelineProfiler.from_env("qa-checks")
+
 
 def fetch_all(conn: sqlite3.Connection, query: str, params: tuple = ()) -> list[sqlite3.Row]:
     cur = conn.execute(query, params)
     return cur.fetchall()
 
 
-def main() -> int:
-    if not os.path.exists(DB_PATH):
-        print(f"Missing staging DB at {DB_PATH}")
-        return 2
-
-    conn = sqlite3.connect(DB_PATH)
+def run_checks(conn: sqlite3.Connection) -> int:
+    """Run every check on an open staging DB; returns the exit status."""
     conn.row_factory = sqlite3.Row
+    # Each QA check is a distinct SQL shape, so the trace report times them individually.
+    PROFILER.attach(conn)
     errors: list[str] = []
     warnings: list[str] = []
 
-    try:
-        fk_issues = fetch_all(conn, "PRAGMA foreign_key_check")
-        if fk_issues:
-            errors.append(f"Foreign key violations: {len(fk_issues)}")
-
-        dupe_entries = fetch_all(
-            conn,
-            """
-            SELECT cycle_id, constituency_id, list_order, COUNT(*) AS cnt
-            FROM candidate_entry
-            GROUP BY cycle_id, constituency_id, list_order
-            HAVING cnt > 1
-            """,
-        )
-        if dupe_entries:
-            errors.append(f"Duplicate candidate_entry rows: {len(dupe_entries)} groups")
-
-        dupe_names = fetch_all(
-            conn,
-            """
-            SELECT ce.cycle_id, c.locality_id, p.full_name_folded, COUNT(*) AS cnt
-            FROM candidate_entry ce
-            JOIN person p ON p.id = ce.person_id
-            JOIN constituency c ON c.id = ce.constituency_id
-            GROUP BY ce.cycle_id, c.locality_id, p.full_name_folded
-            HAVING cnt > 1
-            """,
-        )
-        if dupe_names:
-            warnings.append(f"Duplicate names within cycle+locality: {len(dupe_names)} groups")
-
-        missing_required = fetch_all(
-            conn,
-            """
-            SELECT ce.id
-            FROM candidate_entry ce
-            JOIN person p ON p.id = ce.person_id
-            WHERE p.full_name IS NULL OR TRIM(p.full_name) = ""
-               OR ce.constituency_id IS NULL
-               OR ce.list_order IS NULL
-            """,
+    fk_issues = fetch_all(conn, "PRAGMA foreign_key_check")
+    if fk_issues:
+        errors.append(f"Foreign key violations: {len(fk_issues)}")
+
+    dupe_entries = fetch_all(
+        conn,
+        """
+        SELECT cycle_id, constituency_id, list_order, COUNT(*) AS cnt
+        FROM candidate_entry
+        GROUP BY cycle_id, constituency_id, list_order
+        HAVING cnt > 1
+        """,
+    )
+    if dupe_entries:
+        errors.append(f"Duplicate candidate_entry rows: {len(dupe_entries)} groups")
+
+    dupe_names = fetch_all(
+        conn,
+        """
+        SELECT ce.cycle_id, c.locality_id, p.full_name_folded, COUNT(*) AS cnt
+        FROM candidate_entry ce
+        JOIN person p ON p.id = ce.person_id
+        JOIN constituency c ON c.id = ce.constituency_id
+        GROUP BY ce.cycle_id, c.locality_id, p.full_name_folded
+        HAVING cnt > 1
+        """,
+    )
+    if dupe_names:
+        warnings.append(f"Duplicate names within cycle+locality: {len(dupe_names)} groups")
+
+    missing_required = fetch_all(
+        conn,
+        """
+        SELECT ce.id
+        FROM candidate_entry ce
+        JOIN person p ON p.id = ce.person_id
+        WHERE p.full_name IS NULL OR TRIM(p.full_name) = ""
+           OR ce.constituency_id IS NULL
+           OR ce.list_order IS NULL
+        """,
+    )
+    if missing_required:
+        errors.append(f"Missing key fields on candidate_entry: {len(missing_required)}")
+
+    missing_sources = fetch_all(
+        conn,
+        """
+        SELECT ce.id
+        FROM candidate_entry ce
+        LEFT JOIN source s
+          ON s.record_type = 'candidate_entry' AND s.record_id = ce.id
+        WHERE s.id IS NULL
+        """,
+    )
+    if missing_sources:
+        warnings.append(f"Candidate entries missing sources: {len(missing_sources)}")
+
+    missing_results_match = fetch_all(
+        conn,
+        """
+        SELECT id
+        FROM election_result_candidate
+        WHERE candidate_entry_id IS NULL
+        """,
+    )
+    if missing_results_match:
+        errors.append(
+            f"Election result candidates missing candidate_entry match: {len(missing_results_match)}"
         )
-        if missing_required:
-            errors.append(f"Missing key fields on candidate_entry: {len(missing_required)}")
-
-        missing_sources = fetch_all(
-            conn,
-            """
-            SELECT ce.id
-            FROM candidate_entry ce
-            LEFT JOIN source s
-              ON s.record_type = 'candidate_entry' AND s.record_id = ce.id
-            WHERE s.id IS NULL
-            """,
-        )
-        if missing_sources:
-            warnings.append(f"Candidate entries missing sources: {len(missing_sources)}")
-
-        missing_results_match = fetch_all(
-            conn,
-            """
-            SELECT id
-            FROM election_result_candidate
-            WHERE candidate_entry_id IS NULL
-            """,
-        )
-        if missing_results_match:
-            errors.append(
-                f"Election result candidates missing candidate_entry match: {len(missing_results_match)}"
-            )
-
-        document_count = fetch_all(conn, "SELECT COUNT(*) AS cnt FROM document")
-        if document_count and document_count[0]["cnt"] == 0:
-            warnings.append("No documents recorded in document table")
-    finally:
-        conn.close()
+
+    document_count = fetch_all(conn, "SELECT COUNT(*) AS cnt FROM document")
+    if document_count and document_count[0]["cnt"] == 0:
+        warnings.append("No documents recorded in document table")
 
     if warnings:
         print("WARNINGS:")
@@ -114,5 +113,19 @@ def main() -> int:
     return 0
 
 
+def main() -> int:
+    if not os.path.exists(DB_PATH):
+        print(f"Missing staging DB at {DB_PATH}")
+        return 2
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        status = run_checks(conn)
+    finally:
+        conn.close()
+    PROFILER.finish()
+    return status
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,190 @@
+"""Single-pass streaming parser for the CEMA results bulletin.
+
+``iter_paragraphs`` turns HTML arriving in chunks (``str`` or ``bytes``) into
+cleaned paragraph texts, and ``DistrictResultsParser`` turns those into
+province/unit/candidate records as they go by; neither holds more than the
+paragraph being read.
+
+Paragraph boundaries follow ``re.findall(r"<p[^>]*>(.*?)</p>", html, re.S |
+re.I)`` exactly (so ``<pre>``-style tags open a paragraph, as before) and
+the text is cleaned the same way as ``research.strip_tags``. Records and
+skipped lines match the list-based parser this replaces, except that section
+II now ends at the next Roman-numeral heading ("III. ..."): the old end
+pattern doubled its backslashes and never matched. A whole-document
+``html.parser`` model would split paragraphs differently.
+"""
+
+from __future__ import annotations
+
+import codecs
+import html as html_lib
+import re
+from typing import Iterable, Iterator
+
+PARAGRAPH_OPEN_RE = re.compile(r"<p[^>]*>", re.I)
+PARAGRAPH_CLOSE_RE = re.compile(r"</p>", re.I)
+PARTIAL_OPEN_RE = re.compile(r"<p[^>]*$", re.I)
+TAG_RE = re.compile(r"<[^>]+>")
+
+SECTION_END_RE = re.compile(r"^[IVXL]+\.\s")
+PROVINCE_RE = re.compile(r"^(\d+)\s*-\s*(.+)$")
+UNIT_RE = re.compile(r"^Đơn vị bầu cử\s*Số\s*(\d+)\s*:\s*(.*)$", re.IGNORECASE)
+CANDIDATE_RE = re.compile(r"^(\d+)\)\s+(.*)$")
+NAME_VOTES_RE = re.compile(r"^(.*?)\s+được\s+([\d\.]+)\s+phiếu", re.I)
+PERCENT_RE = re.compile(r"tỷ\s+lệ\s+([\d,]+)%", re.I)
+VOTES_HEADER = "Số phiếu bầu cho mỗi người ứng cử"
+
+
+def clean_text(fragment: str) -> str:
+    """Tags to spaces, entities decoded, whitespace collapsed."""
+    if "<" in fragment:
+        fragment = TAG_RE.sub(" ", fragment)
+    # str.split() and re's \s both split on str.isspace() characters.
+    return " ".join(html_lib.unescape(fragment).split())
+
+
+def decode_chunks(chunks: Iterable[bytes | str], encoding: str = "utf-8") -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for chunk in chunks:
+        text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_paragraph_html(chunks: Iterable[bytes | str]) -> Iterator[str]:
+    """Raw inner HTML of each ``<p ...>...</p>``, read incrementally."""
+    buffer = ""
+    start = None  # offset of the open paragraph's content in buffer
+    close_from = 0  # where to resume looking for "</p>"
+    for chunk in decode_chunks(chunks):
+        buffer += chunk
+        pos = 0
+        while True:
+            if start is None:
+                match = PARAGRAPH_OPEN_RE.search(buffer, pos)
+                if match is None:
+                    # Keep only an unterminated "<p..." (or a trailing "<").
+                    partial = PARTIAL_OPEN_RE.search(buffer, pos)
+                    if partial is not None:
+                        buffer = buffer[partial.start() :]
+                    else:
+                        buffer = buffer[-1:] if buffer.endswith("<") else ""
+                    break
+                start = close_from = match.end()
+            match = PARAGRAPH_CLOSE_RE.search(buffer, close_from)
+            if match is None:
+                buffer = buffer[start:]
+                # "</p>" may straddle the next chunk.
+                close_from = max(0, len(buffer) - 3)
+                start = 0
+                break
+            yield buffer[start : match.start()]
+            pos = match.end()
+            start = None
+
+
+def iter_paragraphs(chunks: Iterable[bytes | str]) -> Iterator[str]:
+    """Cleaned, non-empty paragraph texts of the document, in order."""
+    for fragment in iter_paragraph_html(chunks):
+        text = clean_text(fragment)
+        if text:
+            yield text
+
+
+class DistrictResultsParser:
+    """Province/unit/candidate records from bulletin paragraphs.
+
+    Call ``feed`` with each paragraph (it returns a record or ``None``) and
+    ``close`` at the end. Only lines after the "II. ... KẾT QUẢ ... TỈNH"
+    header count. Candidate lines seen before any province are kept in
+    ``skipped``; if the header never shows up, ``skipped`` says so after
+    ``close``.
+    """
+
+    def __init__(self) -> None:
+        self.skipped: list[str] = []
+        self.in_section = False
+        self.done = False
+        self.province: str | None = None
+        self.unit_number: int | None = None
+        self.unit_description: str | None = None
+
+    def feed(self, line: str) -> dict | None:
+        if self.done:
+            return None
+        if not self.in_section:
+            if "II." in line and "KẾT QUẢ" in line and "TỈNH" in line:
+                self.in_section = True
+            return None
+        if SECTION_END_RE.match(line):
+            self.done = True
+            return None
+
+        # Province and candidate lines start with a digit; skip their
+        # patterns for everything else.
+        numbered = line[:1].isdigit()
+        province_match = PROVINCE_RE.match(line) if numbered else None
+        if province_match:
+            self.province = province_match.group(2).strip()
+            self.unit_number = None
+            self.unit_description = None
+            return None
+
+        unit_match = UNIT_RE.match(line)
+        if unit_match:
+            self.unit_number = int(unit_match.group(1))
+            self.unit_description = unit_match.group(2).strip()
+            return None
+
+        if line.startswith(VOTES_HEADER):
+            return None
+
+        candidate_match = CANDIDATE_RE.match(line) if numbered else None
+        if candidate_match is None:
+            return None
+        if not self.province:
+            self.skipped.append(line)
+            return None
+        if self.unit_number is None:
+            return None
+        return self.candidate_record(int(candidate_match.group(1)), candidate_match.group(2).strip())
+
+    def candidate_record(self, order: int, remainder: str) -> dict:
+        name = remainder
+        votes = None
+        percent = None
+        votes_raw = None
+        percent_raw = None
+
+        name_match = NAME_VOTES_RE.match(remainder)
+        if name_match:
+            name = name_match.group(1).strip()
+            votes_raw = name_match.group(2)
+            votes = int(votes_raw.replace(".", "")) if votes_raw else None
+
+        percent_match = PERCENT_RE.search(remainder)
+        if percent_match:
+            percent_raw = percent_match.group(1)
+            try:
+                percent = float(percent_raw.replace(",", "."))
+            except ValueError:
+                percent = None
+
+        return {
+            "province": self.province,
+            "unit_number": self.unit_number,
+            "unit_description": self.unit_description,
+            "order": order,
+            "candidate_name": name,
+            "votes": votes,
+            "votes_raw": votes_raw,
+            "percent": percent,
+            "percent_raw": percent_raw,
+        }
+
+    def close(self) -> None:
+        if not self.in_section:
+            self.skipped = ["Missing II. section header"]
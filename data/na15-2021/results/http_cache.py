@@ -0,0 +1,204 @@
+"""On-disk HTTP fetch cache for the results research scripts.
+
+Each URL gets a metadata file named by the SHA-256 of the URL
+(``entries/<sha>.json``: URL, status, response headers, ETag, Last-Modified,
+fetch and revalidation times, body hash). Bodies are stored once per content
+hash under ``bodies/<sha>``, so snapshots that return the same bytes share a
+file. Writes go through a temp file plus rename.
+
+Modes:
+
+- ``cache`` (default): serve cached responses, fetch and store misses;
+- ``offline``: serve cached responses only, a miss raises ``CacheMiss``;
+- ``revalidate``: send ``If-None-Match`` / ``If-Modified-Since`` for cached
+  URLs and keep the cached body on ``304 Not Modified``;
+- ``refresh``: always fetch and overwrite the cache entry.
+
+Network fetches use a timeout and retry transient failures (connection
+errors, 429 and 5xx) with exponential backoff, or the server's numeric
+``Retry-After`` when it sends one. A ``FetchCache`` can be shared by threads.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+MODES = ("cache", "offline", "revalidate", "refresh")
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / "http-cache"
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a URL has no cache entry."""
+
+
+def url_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def now_iso() -> str:
+    return dt.datetime.now(dt.timezone.utc).isoformat()
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class CachedResponse:
+    """A response body plus how it was served: ``hit``, ``fetched`` or ``not_modified``."""
+
+    def __init__(self, url: str, body: bytes, outcome: str, requests: int) -> None:
+        self.url = url
+        self.body = body
+        self.outcome = outcome
+        self.requests = requests
+
+
+def retry_delay(exc: HTTPError | None, attempt: int, backoff: float) -> float:
+    retry_after = exc.headers.get("Retry-After") if exc is not None and exc.headers else None
+    if retry_after and retry_after.strip().isdigit():
+        return float(retry_after.strip())
+    return backoff * 2 ** (attempt - 1)
+
+
+class FetchCache:
+    def __init__(
+        self,
+        cache_dir: str | Path = DEFAULT_CACHE_DIR,
+        mode: str = "cache",
+        user_agent: str | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown cache mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.cache_dir = Path(cache_dir)
+        self.mode = mode
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        # Per-run counters: hits, misses (fetched), revalidated (304), network requests.
+        self.stats = {"hit": 0, "fetched": 0, "not_modified": 0, "requests": 0}
+        self._stats_lock = threading.Lock()
+
+    def _entry_path(self, url: str) -> Path:
+        return self.cache_dir / "entries" / f"{url_key(url)}.json"
+
+    def _body_path(self, body_sha256: str) -> Path:
+        return self.cache_dir / "bodies" / body_sha256
+
+    def entry(self, url: str) -> dict | None:
+        """Cached metadata for ``url``, or None when missing or its body is gone."""
+        path = self._entry_path(url)
+        if not path.exists():
+            return None
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        if entry.get("url") != url or not self._body_path(entry["body_sha256"]).exists():
+            return None
+        return entry
+
+    def _store(self, url: str, status: int, headers: dict[str, str], body: bytes) -> dict:
+        body_sha256 = hashlib.sha256(body).hexdigest()
+        body_path = self._body_path(body_sha256)
+        if not body_path.exists():
+            write_atomic(body_path, body)
+        fetched_at = now_iso()
+        entry = {
+            "url": url,
+            "status": status,
+            "headers": headers,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "fetched_at": fetched_at,
+            "validated_at": fetched_at,
+            "body_sha256": body_sha256,
+            "body_bytes": len(body),
+        }
+        self._save_entry(entry)
+        return entry
+
+    def _save_entry(self, entry: dict) -> None:
+        data = json.dumps(entry, ensure_ascii=False, indent=2, sort_keys=True) + "\n"
+        write_atomic(self._entry_path(entry["url"]), data.encode("utf-8"))
+
+    def _request(self, url: str, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes, int]:
+        """GET ``url``; a 304 comes back as a status, other HTTP errors raise.
+
+        Returns status, lower-cased headers, body and the number of attempts.
+        """
+        if self.user_agent:
+            headers = {"User-Agent": self.user_agent, **headers}
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                with urlopen(Request(url, headers=headers), timeout=self.timeout) as resp:
+                    return resp.status, {k.lower(): v for k, v in resp.headers.items()}, resp.read(), attempt
+            except HTTPError as exc:
+                if exc.code == 304:
+                    return 304, {k.lower(): v for k, v in exc.headers.items()}, b"", attempt
+                if exc.code not in RETRY_STATUSES or attempt > self.retries:
+                    raise
+                delay = retry_delay(exc, attempt, self.backoff)
+            except (URLError, TimeoutError):
+                if attempt > self.retries:
+                    raise
+                delay = retry_delay(None, attempt, self.backoff)
+            time.sleep(delay)
+
+    def _served(self, url: str, body: bytes, outcome: str, requests: int) -> CachedResponse:
+        with self._stats_lock:
+            self.stats[outcome] += 1
+            self.stats["requests"] += requests
+        return CachedResponse(url, body, outcome, requests)
+
+    def fetch_response(self, url: str) -> CachedResponse:
+        """Response for ``url``, served from or stored in the cache per mode."""
+        entry = None if self.mode == "refresh" else self.entry(url)
+        if entry is not None and self.mode in ("cache", "offline"):
+            return self._served(url, self._body_path(entry["body_sha256"]).read_bytes(), "hit", 0)
+        if self.mode == "offline":
+            raise CacheMiss(f"No cached response for {url} in {self.cache_dir}")
+
+        conditional: dict[str, str] = {}
+        if entry is not None:
+            if entry.get("etag"):
+                conditional["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                conditional["If-Modified-Since"] = entry["last_modified"]
+        status, headers, body, requests = self._request(url, conditional)
+        if status == 304 and entry is not None:
+            entry["validated_at"] = now_iso()
+            self._save_entry(entry)
+            body = self._body_path(entry["body_sha256"]).read_bytes()
+            return self._served(url, body, "not_modified", requests)
+        self._store(url, status, headers, body)
+        return self._served(url, body, "fetched", requests)
+
+    def fetch(self, url: str) -> bytes:
+        return self.fetch_response(url).body
+
+    def fetch_text(self, url: str, encoding: str = "utf-8") -> str:
+        return self.fetch(url).decode(encoding, errors="replace")
@@ -3,13 +3,18 @@
 
 from __future__ import annotations
 
+import argparse
 import datetime as dt
 import html as html_lib
 import json
 import re
+import time
 from pathlib import Path
-from typing import Iterable
-from urllib.request import Request, urlopen
+from typing import Iterable, Iterator
+
+from cema_stream import DistrictResultsParser, clean_text, decode_chunks, iter_paragraphs
+from http_cache import DEFAULT_CACHE_DIR, DEFAULT_TIMEOUT, FetchCache
+from source_fetcher import DEFAULT_PER_HOST, DEFAULT_WORKERS, SourceRegistry, format_report
 
 UA = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -29,20 +34,17 @@ CEMA_URL = (
     "trung-cu-dai-bieu-quoc-hoi-khoa-xv.htm"
 )
 
-OUT_DIR = Path(__file__).resolve().parent
+CEMA_SOURCE_ID = "cema_bulletin_499_winners"
+VTV_SOURCE_ID = "vtv_report_tran_van_nam_ineligible"
 
+OUT_DIR = Path(__file__).resolve().parent
 
-def fetch_html(url: str) -> str:
-    req = Request(url, headers={"User-Agent": UA})
-    with urlopen(req) as resp:
-        return resp.read().decode("utf-8", errors="replace")
+# Sources in the order they appear in research.json; run concurrently.
+SOURCES = SourceRegistry()
 
 
 def strip_tags(text: str) -> str:
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = html_lib.unescape(text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+    return clean_text(text)
 
 
 def dedupe_keep_order(items: Iterable[str]) -> list[str]:
@@ -93,8 +95,7 @@ def extract_first_date(text: str) -> str | None:
     return match.group(1) if match else None
 
 
-def extract_vtv() -> dict:
-    html = fetch_html(VTV_URL)
+def extract_vtv(html: str) -> dict:
     title = extract_meta(html, "og:title") or extract_title(html)
     description = extract_meta(html, "og:description") or extract_meta_name(
         html, "description"
@@ -109,9 +110,7 @@ def extract_vtv() -> dict:
     )
     paragraphs: list[str] = []
     if block_match:
-        paragraph_html = re.findall(r"<p[^>]*>(.*?)</p>", block_match.group(1), re.S | re.I)
-        paragraphs = [strip_tags(p) for p in paragraph_html]
-        paragraphs = [p for p in paragraphs if p]
+        paragraphs = list(iter_paragraphs((block_match.group(1),)))
 
     keywords = (
         "Trần Văn Nam",
@@ -131,7 +130,7 @@ def extract_vtv() -> dict:
         author_line = strip_tags(author_match.group(1))
 
     return {
-        "id": "vtv_report_tran_van_nam_ineligible",
+        "id": VTV_SOURCE_ID,
         "title": title,
         "url": VTV_URL,
         "published_time": published_time,
@@ -141,158 +140,220 @@ def extract_vtv() -> dict:
     }
 
 
-def extract_cema() -> dict:
-    html = fetch_html(CEMA_URL)
-    title = extract_title(html)
-    text = strip_tags(html)
-    published_date = extract_first_date(text)
-
-    paragraphs_html = re.findall(r"<p[^>]*>(.*?)</p>", html, re.S | re.I)
-    paragraphs = [strip_tags(p) for p in paragraphs_html]
-    paragraphs = [p for p in paragraphs if p]
-
-    # Focus on the results section and overall stats.
-    header_index = None
-    for i, p in enumerate(paragraphs):
-        if "KẾT QUẢ BẦU CỬ ĐẠI BIỂU QUỐC HỘI" in p:
-            header_index = i
-            break
-        if "KẾT QUẢ BẦU CỬ CHUNG" in p:
-            header_index = i
-            break
-
+class FirstMatch:
+    """First match of ``pattern`` in HTML that arrives in chunks.
+
+    Every match starts with ``lead``, so text before the first ``lead`` is
+    dropped and only the possible start of a match is buffered.
+    """
+
+    def __init__(self, pattern: re.Pattern, lead: re.Pattern, lead_length: int) -> None:
+        self.pattern = pattern
+        self.lead = lead
+        self.keep = lead_length - 1
+        self.buffer = ""
+        self.match: re.Match | None = None
+
+    def feed(self, text: str) -> None:
+        if self.match is not None:
+            return
+        self.buffer += text
+        self.match = self.pattern.search(self.buffer)
+        if self.match is not None:
+            self.buffer = ""
+            return
+        lead = self.lead.search(self.buffer)
+        self.buffer = self.buffer[lead.start() :] if lead else self.buffer[-self.keep :]
+
+
+class FirstDate:
+    """``extract_first_date(strip_tags(html))`` for HTML that arrives in chunks.
+
+    Text is cleaned up to the last ``>`` seen: tags never straddle that cut,
+    and a date cannot span it because the cut falls on a tag's space or a
+    ``>``.
+    """
+
+    def __init__(self) -> None:
+        self.pending = ""
+        self.date: str | None = None
+
+    def feed(self, text: str) -> None:
+        if self.date is not None:
+            return
+        self.pending += text
+        cut = self.pending.rfind(">") + 1
+        if cut:
+            self.date = extract_first_date(strip_tags(self.pending[:cut]))
+            self.pending = self.pending[cut:]
+
+    def close(self) -> str | None:
+        if self.date is None and self.pending:
+            self.date = extract_first_date(strip_tags(self.pending))
+        return self.date
+
+
+def extract_cema(chunks: Iterable[bytes]) -> dict:
+    """Summary and district results of the bulletin, read in one streaming pass.
+
+    Paragraphs are cut from the chunks as they arrive and fed to the district
+    results parser and the summary filters; the title and date are found on
+    the way (same rules as ``extract_title`` and ``extract_first_date``).
+    """
+    headings = {
+        tag: FirstMatch(re.compile(rf"<{tag}[^>]*>(.*?)</{tag}>", re.S | re.I), re.compile(rf"<{tag}", re.I), 3)
+        for tag in ("h1", "h2")
+    }
+    headings["title"] = FirstMatch(re.compile(r"<title>(.*?)</title>", re.S | re.I), re.compile(r"<title>", re.I), 7)
+    first_date = FirstDate()
+
+    def observed(text_chunks: Iterable[str]) -> Iterator[str]:
+        for text in text_chunks:
+            for heading in headings.values():
+                heading.feed(text)
+            first_date.feed(text)
+            yield text
+
+    # Focus on the results section (the 30 paragraphs from its header) and
+    # overall stats.
     results_section: list[str] = []
-    if header_index is not None:
-        section = paragraphs[header_index : header_index + 30]
-        results_section = [
-            p
-            for p in section
-            if p.startswith("-")
-            or "Tổng số" in p
-            or "trúng cử" in p
-            or "Không xác nhận" in p
-        ]
-
-    summary_lines = [
-        p
-        for p in paragraphs
-        if "Hội đồng Bầu cử" in p and "trúng cử" in p
-    ]
-    summary_lines = dedupe_keep_order(summary_lines)
+    section_left = None
+    summary_lines: list[str] = []
+    district_parser = DistrictResultsParser()
+    records: list[dict] = []
+    for p in iter_paragraphs(observed(decode_chunks(chunks))):
+        record = district_parser.feed(p)
+        if record is not None:
+            records.append(record)
+        if section_left is None and ("KẾT QUẢ BẦU CỬ ĐẠI BIỂU QUỐC HỘI" in p or "KẾT QUẢ BẦU CỬ CHUNG" in p):
+            section_left = 30
+        if section_left:
+            section_left -= 1
+            if p.startswith("-") or "Tổng số" in p or "trúng cử" in p or "Không xác nhận" in p:
+                results_section.append(p)
+        if "Hội đồng Bầu cử" in p and "trúng cử" in p:
+            summary_lines.append(p)
+    district_parser.close()
+
+    title = None
+    for tag in ("h1", "h2"):
+        match = headings[tag].match
+        if match and strip_tags(match.group(1)):
+            title = strip_tags(match.group(1))
+            break
+    else:
+        match = headings["title"].match
+        title = strip_tags(match.group(1)) if match else None
 
     return {
-        "id": "cema_bulletin_499_winners",
+        "id": CEMA_SOURCE_ID,
         "title": title,
         "url": CEMA_URL,
-        "published_date": published_date,
-        "paragraphs": paragraphs,
-        "summary_lines": summary_lines,
+        "published_date": first_date.close(),
+        "district_results": {"records": records, "skipped": district_parser.skipped},
+        "summary_lines": dedupe_keep_order(summary_lines),
         "results_section": results_section,
     }
 
 
-def parse_cema_district_results(paragraphs: list[str]) -> dict:
-    header_index = None
-    for i, line in enumerate(paragraphs):
-        if "II." in line and "KẾT QUẢ" in line and "TỈNH" in line:
-            header_index = i
-            break
-
-    records = []
-    current_province = None
-    current_unit_number = None
-    current_unit_description = None
-    skipped = []
-
-    if header_index is None:
-        return {
-            "records": records,
-            "skipped": ["Missing II. section header"],
-        }
+SOURCES.register(CEMA_SOURCE_ID, CEMA_URL, extract_cema, chunked=True)
+SOURCES.register(VTV_SOURCE_ID, VTV_URL, extract_vtv)
 
-    for line in paragraphs[header_index + 1 :]:
-        if re.match(r"^[IVXL]+\\.\\s", line):
-            break
-
-        province_match = re.match(r"^(\d+)\s*-\s*(.+)$", line)
-        if province_match:
-            current_province = province_match.group(2).strip()
-            current_unit_number = None
-            current_unit_description = None
-            continue
-
-        unit_match = re.match(
-            r"^Đơn vị bầu cử\s*Số\s*(\d+)\s*:\s*(.*)$",
-            line,
-            re.IGNORECASE,
-        )
-        if unit_match:
-            current_unit_number = int(unit_match.group(1))
-            current_unit_description = unit_match.group(2).strip()
-            continue
 
-        if line.startswith("Số phiếu bầu cho mỗi người ứng cử"):
-            continue
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fetch and summarize NA15-2021 results sources.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--offline",
+        dest="cache_mode",
+        action="store_const",
+        const="offline",
+        help="Replay cached responses only; fail on a cache miss.",
+    )
+    mode.add_argument(
+        "--revalidate",
+        dest="cache_mode",
+        action="store_const",
+        const="revalidate",
+        help="Send conditional requests (ETag / Last-Modified) for cached URLs.",
+    )
+    mode.add_argument(
+        "--refresh",
+        dest="cache_mode",
+        action="store_const",
+        const="refresh",
+        help="Ignore cached responses and fetch everything again.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=str(DEFAULT_CACHE_DIR),
+        help="HTTP cache directory (default: results/http-cache/).",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Per-request timeout in seconds (default: {DEFAULT_TIMEOUT:g}).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Sources fetched at once (default: {DEFAULT_WORKERS}).",
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=DEFAULT_PER_HOST,
+        help=f"Concurrent requests per host (default: {DEFAULT_PER_HOST}).",
+    )
+    parser.add_argument(
+        "--report",
+        help="Write the per-source run report (outcome, bytes, timings) as JSON to this path.",
+    )
+    parser.set_defaults(cache_mode="cache")
+    args = parser.parse_args()
+    cache = FetchCache(args.cache_dir, args.cache_mode, user_agent=UA, timeout=args.timeout)
 
-        candidate_match = re.match(r"^(\d+)\)\s+(.*)$", line)
-        if candidate_match and current_province and current_unit_number is not None:
-            order = int(candidate_match.group(1))
-            remainder = candidate_match.group(2).strip()
-            name = remainder
-            votes = None
-            percent = None
-            votes_raw = None
-            percent_raw = None
-
-            name_match = re.match(r"^(.*?)\s+được\s+([\d\.]+)\s+phiếu", remainder, re.I)
-            if name_match:
-                name = name_match.group(1).strip()
-                votes_raw = name_match.group(2)
-                votes = int(votes_raw.replace(".", "")) if votes_raw else None
-
-            percent_match = re.search(r"tỷ\s+lệ\s+([\d,]+)%", remainder, re.I)
-            if percent_match:
-                percent_raw = percent_match.group(1)
-                try:
-                    percent = float(percent_raw.replace(",", "."))
-                except ValueError:
-                    percent = None
-
-            records.append(
+    extracted_at = dt.datetime.now(dt.timezone.utc).isoformat()
+    start = time.perf_counter()
+    reports = SOURCES.run(cache, workers=args.workers, per_host=args.per_host)
+    elapsed = time.perf_counter() - start
+    for line in format_report(reports):
+        print(line)
+    print(
+        f"Fetched {len(reports)} sources in {elapsed:.3f}s "
+        f"(HTTP cache {args.cache_mode}: {cache.stats['hit']} hits, "
+        f"{cache.stats['fetched']} fetched, {cache.stats['not_modified']} not modified)"
+    )
+    if args.report:
+        Path(args.report).write_text(
+            json.dumps(
                 {
-                    "province": current_province,
-                    "unit_number": current_unit_number,
-                    "unit_description": current_unit_description,
-                    "order": order,
-                    "candidate_name": name,
-                    "votes": votes,
-                    "votes_raw": votes_raw,
-                    "percent": percent,
-                    "percent_raw": percent_raw,
-                }
+                    "extracted_at": extracted_at,
+                    "cache_mode": args.cache_mode,
+                    "elapsed_seconds": round(elapsed, 4),
+                    "cache": cache.stats,
+                    "sources": [report.as_dict() for report in reports],
+                },
+                indent=2,
             )
-            continue
-
-        if candidate_match and not current_province:
-            skipped.append(line)
-            continue
-
-    return {
-        "records": records,
-        "skipped": skipped,
-    }
-
+            + "\n",
+            encoding="utf-8",
+        )
+    failed = [report for report in reports if report.error]
+    if failed:
+        # Outputs are only rewritten from a complete set of sources.
+        raise SystemExit(f"{len(failed)} of {len(reports)} sources failed; outputs left unchanged.")
 
-def main() -> None:
-    extracted_at = dt.datetime.now(dt.timezone.utc).isoformat()
-    cema = extract_cema()
-    paragraphs = cema.pop("paragraphs", [])
-    district_results = parse_cema_district_results(paragraphs)
+    results = {report.source.id: report.result for report in reports}
+    cema = results[CEMA_SOURCE_ID]
+    district_results = cema.pop("district_results")
 
     data = {
         "cycle_id": "na15-2021",
         "extracted_at": extracted_at,
-        "sources": [cema, extract_vtv()],
+        "sources": list(results.values()),
         "district_results_summary": {
             "record_count": len(district_results["records"]),
             "skipped_count": len(district_results["skipped"]),
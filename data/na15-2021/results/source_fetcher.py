@@ -0,0 +1,162 @@
+"""Source registry and concurrent fetcher for the results research scripts.
+
+A source is an ID, a URL and an extractor that turns the page HTML into a
+summary dict; a ``chunked`` extractor gets the body as an iterator of byte
+chunks instead, to parse it in one streaming pass. ``SourceRegistry.run`` fetches every registered source on a
+bounded thread pool through a shared ``FetchCache`` (timeouts, retries with
+backoff), with at most ``per_host`` requests in flight per host; the Wayback
+Machine serves every current source, so the per-host limit is what keeps a
+large refresh polite. Extractors run on the worker that fetched their page.
+
+Every source gets a ``SourceReport`` (outcome, request count, bytes, fetch
+and extract time, error) whether it succeeded or not, so one bad page does
+not hide how the rest of the run went.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+from urllib.parse import urlsplit
+
+from http_cache import FetchCache
+
+DEFAULT_WORKERS = 8
+DEFAULT_PER_HOST = 2
+CHUNK_SIZE = 1 << 16
+
+Extractor = Callable[[str], dict] | Callable[[Iterator[bytes]], dict]
+
+
+def iter_chunks(body: bytes, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    view = memoryview(body)
+    for offset in range(0, len(view), size):
+        yield bytes(view[offset : offset + size])
+
+
+class Source:
+    def __init__(self, source_id: str, url: str, extract: Extractor, chunked: bool = False) -> None:
+        self.id = source_id
+        self.url = url
+        self.extract = extract
+        self.chunked = chunked
+
+    @property
+    def host(self) -> str:
+        return urlsplit(self.url).netloc.lower()
+
+
+class SourceReport:
+    def __init__(self, source: Source) -> None:
+        self.source = source
+        self.outcome: str | None = None
+        self.requests = 0
+        self.bytes = 0
+        self.fetch_seconds = 0.0
+        self.extract_seconds = 0.0
+        self.result: dict | None = None
+        self.error: str | None = None
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.source.id,
+            "url": self.source.url,
+            "host": self.source.host,
+            "outcome": self.outcome,
+            "requests": self.requests,
+            "bytes": self.bytes,
+            "fetch_seconds": round(self.fetch_seconds, 4),
+            "extract_seconds": round(self.extract_seconds, 4),
+            "error": self.error,
+        }
+
+
+class HostLimiter:
+    """One semaphore per host, created on first use."""
+
+    def __init__(self, per_host: int) -> None:
+        self.per_host = per_host
+        self._semaphores: dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return semaphore
+
+
+class SourceRegistry:
+    def __init__(self) -> None:
+        self._sources: dict[str, Source] = {}
+
+    def register(self, source_id: str, url: str, extract: Extractor, chunked: bool = False) -> Source:
+        if source_id in self._sources:
+            raise ValueError(f"Duplicate source id: {source_id}")
+        source = self._sources[source_id] = Source(source_id, url, extract, chunked)
+        return source
+
+    def source(self, source_id: str, url: str) -> Callable[[Extractor], Extractor]:
+        """Decorator form of ``register`` for extractor functions."""
+
+        def decorator(extract: Extractor) -> Extractor:
+            self.register(source_id, url, extract)
+            return extract
+
+        return decorator
+
+    def __iter__(self):
+        return iter(self._sources.values())
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def run(
+        self,
+        cache: FetchCache,
+        workers: int = DEFAULT_WORKERS,
+        per_host: int = DEFAULT_PER_HOST,
+    ) -> list[SourceReport]:
+        """Fetch and extract every source; reports come back in registration order."""
+        limiter = HostLimiter(per_host)
+
+        def run_one(source: Source) -> SourceReport:
+            report = SourceReport(source)
+            try:
+                start = time.perf_counter()
+                with limiter(source.host):
+                    response = cache.fetch_response(source.url)
+                report.fetch_seconds = time.perf_counter() - start
+                report.outcome = response.outcome
+                report.requests = response.requests
+                report.bytes = len(response.body)
+
+                start = time.perf_counter()
+                if source.chunked:
+                    report.result = source.extract(iter_chunks(response.body))
+                else:
+                    report.result = source.extract(response.body.decode("utf-8", errors="replace"))
+                report.extract_seconds = time.perf_counter() - start
+            except Exception as exc:
+                report.error = f"{type(exc).__name__}: {exc}"
+            return report
+
+        sources = list(self)
+        if not sources:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(sources)))) as pool:
+            return list(pool.map(run_one, sources))
+
+
+def format_report(reports: list[SourceReport]) -> list[str]:
+    lines = []
+    for report in reports:
+        status = report.error or report.outcome
+        lines.append(
+            f"{report.source.id}: {status}, {report.bytes} bytes, {report.requests} requests, "
+            f"fetch {report.fetch_seconds:.3f}s, extract {report.extract_seconds:.3f}s"
+        )
+    return lines
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""Builds, checks and exports every configured election cycle.
+
+Cycles are listed in ``data/cycles.json`` (identity, data directory, source
+documents and fetch dates). Each cycle is built from its data directory into
+its own database, ``data/.build/<cycle_id>.db``, by ``build-staging-db.py``
+on a process pool, one cycle per task, so another cycle adds a parallel build
+rather than a longer serial one. The cycle databases are then merged into a
+fresh database through ``ATTACH``, table by table in rowid order (with one
+cycle it has the same content as a direct build), which is saved to
+``data/staging.db`` with the SQLite backup API. QA checks run on the merged
+database and ``export-json.py`` exports every cycle, one process per cycle.
+
+With ``--in-memory`` the whole pipeline runs in this process instead: each
+cycle is built into an in-memory database, merged the same way into a
+``:memory:`` connection, checked and exported from that connection, and only
+then saved to ``data/staging.db``. Nothing touches the disk until the end
+except the exported JSON, and the saved file is byte-identical to an on-disk
+run's.
+
+Options this script does not know are passed to the export, e.g.
+``--compact`` or ``--schema-version 2``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pipeline_profiler import PipelineProfiler
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(DATA_DIR)
+DB_PATH = os.path.join(ROOT, "staging.db")
+BUILD_DIR = os.path.join(ROOT, ".build")
+DEFAULT_BUILD_WORKERS = os.cpu_count() or 1
+# Tables that different cycles may both write the same row to: people who
+# stand again, documents and input files (manual timelines) used by both.
+SHARED_TABLES = {"person", "document", "build_manifest"}
+
+PROFILER = PipelineProfiler.from_env("run-pipeline")
+
+
+def load_script(name: str):
+    """Import a hyphenated pipeline script, e.g. ``build-staging-db``, as a module."""
+    module_name = name.replace("-", "_")
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(DATA_DIR, f"{name}.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def cycle_db_path(cycle_id: str) -> str:
+    return os.path.join(BUILD_DIR, f"{cycle_id}.db")
+
+
+def build_cycle_task(cycle: dict, incremental: bool) -> float:
+    """Build one cycle into its own database (a build pool task); returns seconds."""
+    start = time.perf_counter()
+    builder = load_script("build-staging-db")
+    builder.configure_cycle(cycle, cycle_db_path(cycle["id"]))
+    builder.build(incremental)
+    return time.perf_counter() - start
+
+
+def export_cycle_task(db_path: str, cycle_id: str, args: argparse.Namespace) -> dict:
+    return load_script("export-json").export_cycle_in_process(db_path, cycle_id, args)
+
+
+def build_cycles(cycles: list[dict], incremental: bool, workers: int) -> None:
+    if len(cycles) == 1 or workers == 1:
+        for cycle in cycles:
+            PROFILER.add_stage(f"build {cycle['id']}", build_cycle_task(cycle, incremental))
+        # Pooled builds profile only their wall time; in-process ones keep
+        # the builder's own stage and SQL report.
+        load_script("build-staging-db").PROFILER.finish()
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(cycles))) as pool:
+        futures = [pool.submit(build_cycle_task, cycle, incremental) for cycle in cycles]
+        for cycle, future in zip(cycles, futures):
+            PROFILER.add_stage(f"build {cycle['id']}", future.result())
+
+
+def merge_into(conn: sqlite3.Connection, sources: list[str]) -> None:
+    """Create the schema in an empty ``conn`` and copy every source database into it."""
+    builder = load_script("build-staging-db")
+    builder.apply_bulk_pragmas(conn)
+    builder.init_db(conn)
+    # Creation order in init_db already respects foreign keys.
+    tables = [
+        row[0]
+        for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY rowid"
+        )
+    ]
+    for source in sources:
+        conn.execute("ATTACH DATABASE ? AS cycle", (source,))
+        for table in tables:
+            verb = "INSERT OR IGNORE" if table in SHARED_TABLES else "INSERT"
+            conn.execute(f'{verb} INTO main."{table}" SELECT * FROM cycle."{table}" ORDER BY rowid')
+        conn.commit()
+        conn.execute("DETACH DATABASE cycle")
+
+
+def merge_cycles(cycle_ids: list[str], db_path: str = DB_PATH) -> None:
+    """Copy every cycle database into a fresh database and save it to ``db_path``."""
+    merge_path = f"{db_path}.merge"
+    if os.path.exists(merge_path):
+        os.remove(merge_path)
+    conn = sqlite3.connect(merge_path)
+    try:
+        merge_into(conn, [cycle_db_path(cycle_id) for cycle_id in cycle_ids])
+        # Saved with the backup API, as --in-memory saves, so both write the
+        # same header counters and produce byte-identical files.
+        save_database(conn, db_path)
+    finally:
+        conn.close()
+        os.remove(merge_path)
+
+
+def build_cycles_in_memory(cycles: list[dict]) -> sqlite3.Connection:
+    """Build every cycle in this process; returns a ``:memory:`` connection holding them all."""
+    builder = load_script("build-staging-db")
+    cycle_conns = []
+    try:
+        for cycle in cycles:
+            start = time.perf_counter()
+            builder.configure_cycle(cycle)
+            cycle_conns.append(builder.build_in_memory(cycle["id"]))
+            PROFILER.add_stage(f"build {cycle['id']}", time.perf_counter() - start)
+        builder.PROFILER.finish()
+        # Even one cycle is copied through merge_into, as merge_cycles does
+        # on disk, so the saved file has the same page layout.
+        # uri=True lets ATTACH open the cycles' shared in-memory databases.
+        conn = sqlite3.connect(":memory:", uri=True)
+        merge_into(conn, [builder.memory_db_uri(cycle["id"]) for cycle in cycles])
+        return conn
+    finally:
+        for cycle_conn in cycle_conns:
+            cycle_conn.close()
+
+
+def save_database(conn: sqlite3.Connection, db_path: str = DB_PATH) -> None:
+    """Write ``conn`` to ``db_path`` with the backup API, replacing it at the end."""
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    target = sqlite3.connect(tmp_path)
+    try:
+        conn.backup(target)
+    except BaseException:
+        target.close()
+        os.remove(tmp_path)
+        raise
+    target.close()
+    os.replace(tmp_path, db_path)
+
+
+def run_in_memory(cycles: list[dict], export_args: argparse.Namespace) -> None:
+    """Build, check and export on one in-memory connection, then save staging.db."""
+    export_json = load_script("export-json")
+    qa_checks = load_script("qa-checks")
+    cycle_ids = [cycle["id"] for cycle in cycles]
+
+    with PROFILER.stage("build_cycles"):
+        conn = build_cycles_in_memory(cycles)
+    try:
+        with PROFILER.stage("qa"):
+            status = qa_checks.run_checks(conn)
+        qa_checks.PROFILER.finish()
+        if status == 0:
+            with PROFILER.stage("export"):
+                writer = export_json.export_cycles_on(conn, cycle_ids, export_args)
+            export_json.PROFILER.finish()
+        # A failed QA run still leaves staging.db behind for inspection.
+        with PROFILER.stage("save"):
+            save_database(conn)
+    finally:
+        conn.close()
+    print(f"Saved {', '.join(cycle_ids)} to {DB_PATH}")
+    PROFILER.finish()
+    if status:
+        sys.exit(status)
+    print(
+        f"Exported {', '.join(cycle_ids)} to {export_json.OUTPUT_ROOT} "
+        f"({writer.written} written, {writer.unchanged} unchanged)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Build every configured cycle in parallel, merge them into staging.db, run QA and export.",
+        epilog="Other options are passed to export-json.py.",
+    )
+    parser.add_argument(
+        "--cycle",
+        action="append",
+        dest="cycles",
+        metavar="ID",
+        help="Cycle from data/cycles.json; repeat for several (default: all of them).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Rebuild only the loader stages whose inputs changed, per cycle database.",
+    )
+    parser.add_argument(
+        "--build-workers",
+        type=int,
+        default=DEFAULT_BUILD_WORKERS,
+        help=f"Processes building cycles in parallel (default: {DEFAULT_BUILD_WORKERS}).",
+    )
+    parser.add_argument(
+        "--in-memory",
+        action="store_true",
+        help=(
+            "Build, check and export in this process on an in-memory database and "
+            "write staging.db once at the end (cycles are built and exported one by one)."
+        ),
+    )
+    args, export_argv = parser.parse_known_args()
+    if args.in_memory and args.incremental:
+        parser.error("--incremental updates the on-disk cycle databases; it cannot be used with --in-memory")
+
+    builder = load_script("build-staging-db")
+    export_json = load_script("export-json")
+    export_args = export_json.build_parser().parse_args(export_argv)
+    if export_args.cycles:
+        parser.error("use --cycle before any export options to choose cycles")
+
+    configs = builder.load_cycle_configs()
+    cycle_ids = args.cycles or list(configs)
+    unknown = [cycle_id for cycle_id in cycle_ids if cycle_id not in configs]
+    if unknown:
+        parser.error(f"unknown cycles {', '.join(unknown)}; configured: {', '.join(configs)}")
+
+    if args.in_memory:
+        run_in_memory([configs[cycle_id] for cycle_id in cycle_ids], export_args)
+        return
+
+    with PROFILER.stage("build_cycles"):
+        build_cycles([configs[cycle_id] for cycle_id in cycle_ids], args.incremental, args.build_workers)
+    with PROFILER.stage("merge_cycles"):
+        merge_cycles(cycle_ids)
+    print(f"Merged {', '.join(cycle_ids)} into {DB_PATH}")
+
+    with PROFILER.stage("qa"):
+        status = load_script("qa-checks").main()
+    if status:
+        PROFILER.finish()
+        sys.exit(status)
+
+    with PROFILER.stage("export"):
+        writer = export_json.export_cycles(DB_PATH, cycle_ids, export_args, task=export_cycle_task)
+    export_json.PROFILER.finish()
+    PROFILER.finish()
+    print(
+        f"Exported {', '.join(cycle_ids)} to {export_json.OUTPUT_ROOT} "
+        f"({writer.written} written, {writer.unchanged} unchanged)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import fs from "node:fs/promises";
+import path from "node:path";
+
+// Each record is [bundle index, byte offset, byte length] of the entry's
+// detail payload inside its bundle file.
+export type CandidateDetailLookup = {
+  bundle_by: string;
+  bundles: string[];
+  records: Record<string, [number, number, number]>;
+};
+
+export async function readJson<T>(filePath: string): Promise<T> {
+  const raw = await fs.readFile(filePath, "utf-8");
+  return JSON.parse(raw) as T;
+}
+
+export function cycleBaseDir(cycle: string): string {
+  return path.join(process.cwd(), "public", "data", "elections", cycle);
+}
+
+const detailLookups = new Map<string, Promise<CandidateDetailLookup | null>>();
+
+// Present only when the export bundles candidate details (--bundle-details).
+export function readDetailLookup(cycle: string): Promise<CandidateDetailLookup | null> {
+  let lookup = detailLookups.get(cycle);
+  if (!lookup) {
+    lookup = readJson<CandidateDetailLookup>(
+      path.join(cycleBaseDir(cycle), "candidates_detail_lookup.json")
+    ).catch(() => null);
+    detailLookups.set(cycle, lookup);
+  }
+  return lookup;
+}
+
+// Reads an entry's detail payload from its own file or its bundle slice;
+// null when the export has no detail for the entry.
+export async function readCandidateDetail<T>(cycle: string, entryId: string): Promise<T | null> {
+  const lookup = await readDetailLookup(cycle);
+  if (!lookup) {
+    const detailPath = path.join(cycleBaseDir(cycle), "candidates_detail", `${entryId}.json`);
+    try {
+      await fs.access(detailPath);
+    } catch {
+      return null;
+    }
+    return readJson<T>(detailPath);
+  }
+  const slot = lookup.records[entryId];
+  if (!slot) {
+    return null;
+  }
+  const [bundle, offset, length] = slot;
+  const handle = await fs.open(path.join(cycleBaseDir(cycle), lookup.bundles[bundle]), "r");
+  try {
+    const buffer = Buffer.alloc(length);
+    await handle.read(buffer, 0, length, offset);
+    return JSON.parse(buffer.toString("utf-8")) as T;
+  } finally {
+    await handle.close();
+  }
+}